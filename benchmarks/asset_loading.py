@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from client.src.asset.asset_cache import AssetCache
+from client.src.asset.font.font_loader import FontLoader
+from client.src.asset.tile.tile_loader import TileLoader
+from common.level.tile_type import TileTypeRegistry
+
+# Compares serial and threaded PNG decoding at startup, on the default tileset
+# and on a generated pack with many tiles, plus lazy loading and warm starts
+# from the asset cache.
+#
+#   python3 -m benchmarks.asset_loading --tiles 2000 --workers 1 4 8
+
+DEFAULT_TILESET = os.path.join("client", "assets", "textures", "tiles", "default")
+DEFAULT_FONT = os.path.join("client", "assets", "font")
+
+
+def generate_pack(directory: str, count: int, size: int, seed: int = 0):
+    # Noisy tiles so the PNGs do not compress to almost nothing
+    rng = np.random.default_rng(seed)
+    tiles_dir = os.path.join(directory, "tiles")
+    os.makedirs(tiles_dir)
+
+    tiles = {}
+    for index in range(count):
+        name = f"tile_synthetic_{index}"
+        pixels = rng.integers(0, 256, size=(size, size, 4), dtype=np.uint8)
+        Image.fromarray(pixels, "RGBA").save(os.path.join(tiles_dir, f"{name}.png"))
+        tiles[name] = {"solid": True}
+
+    with open(os.path.join(directory, "tileset.json"), "w", encoding="utf-8") as f:
+        json.dump({"tiles": tiles}, f)
+
+
+def time_tiles(
+    directory: str, workers: int, repeat: int, cache: Optional[AssetCache] = None
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        TileLoader.load_tiles_from_directory(
+            directory, TileTypeRegistry(), workers, cache
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_lazy_tiles(directory: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        TileLoader.load_lazy_tiles_from_directory(directory, TileTypeRegistry())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_font(workers: int, repeat: int, cache: Optional[AssetCache] = None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        FontLoader.load_font_from_directory(DEFAULT_FONT, workers, cache)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, timings: dict[int, float]):
+    serial = timings.get(1)
+    for workers, seconds in timings.items():
+        speedup = f" ({serial / seconds:.2f}x)" if serial else ""
+        print(f"  {name}: workers={workers:<2} {seconds * 1000:8.1f}ms{speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tiles", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}")
+    report(
+        "default tileset",
+        {w: time_tiles(DEFAULT_TILESET, w, args.repeat) for w in args.workers},
+    )
+    report("font", {w: time_font(w, args.repeat) for w in args.workers})
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pack_dir = os.path.join(temp_dir, "pack")
+        generate_pack(pack_dir, args.tiles, args.size)
+        report(
+            f"{args.tiles} tile pack",
+            {w: time_tiles(pack_dir, w, args.repeat) for w in args.workers},
+        )
+
+        # Lazy loading only reads tileset.json and the file listing
+        for name, directory in (
+            ("default tileset", DEFAULT_TILESET),
+            (f"{args.tiles} tile pack", pack_dir),
+        ):
+            seconds = time_lazy_tiles(directory, args.repeat)
+            print(f"  {name}: lazy          {seconds * 1000:8.1f}ms")
+
+        # The first load of each fills the cache, the timed loads are warm
+        cache = AssetCache(os.path.join(temp_dir, "cache"))
+        for name, directory in (
+            ("default tileset", DEFAULT_TILESET),
+            (f"{args.tiles} tile pack", pack_dir),
+        ):
+            time_tiles(directory, 1, 1, cache)
+            seconds = time_tiles(directory, 1, args.repeat, cache)
+            print(f"  {name}: warm cache    {seconds * 1000:8.1f}ms")
+        time_font(1, 1, cache)
+        print(f"  font: warm cache    {time_font(1, args.repeat, cache) * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
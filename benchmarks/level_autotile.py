@@ -0,0 +1,57 @@
+import argparse
+import random
+import time
+
+from benchmarks.levels import generate_level
+from common.level.autotile import Autotiler
+from common.level.tile import Tile
+
+# Times whole-level autotiling and single tile edits that retile their
+# neighbourhood through a level listener.
+#
+#   python3 -m benchmarks.level_autotile --width 500 --height 500
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=500)
+    parser.add_argument("--height", type=int, default=500)
+    parser.add_argument("--edits", type=int, default=5000)
+    args = parser.parse_args()
+
+    level = generate_level(args.width, args.height)
+    autotiler = Autotiler(level.registry)
+
+    start = time.perf_counter()
+    changed = autotiler.autotile_level(level)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Level {args.width}x{args.height}: {level.tile_count} tiles, "
+        f"{changed} retiled in {elapsed * 1000:.1f}ms"
+    )
+
+    start = time.perf_counter()
+    autotiler.autotile_grid(level.get_type_grid())
+    elapsed = time.perf_counter() - start
+    print(f"  grid only (no level writes): {elapsed * 1000:.1f}ms")
+
+    autotiler.attach(level)
+    tile_type = level.registry.get_by_name("tile_blue_center")
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    for _ in range(args.edits):
+        position = (rng.randrange(args.width), rng.randrange(args.height))
+        if rng.random() < 0.5:
+            level.remove_tile(position)
+        else:
+            level.set_tile(Tile.from_type(tile_type, position))  # type: ignore
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {args.edits} edits with 3x3 retiling: "
+        f"{elapsed / args.edits * 1e6:.1f}us per edit"
+    )
+
+
+if __name__ == "__main__":
+    main()
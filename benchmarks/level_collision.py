@@ -0,0 +1,126 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.levels import generate_level
+from common.level.collision_rects import CollisionRects
+from common.level.level import Level
+from common.level.tile_type import FLAG_SOLID
+
+# Compares broad-phase collision against every solid tile with collision
+# against greedy-merged solid rects on large generated levels.
+#
+#   python3 -m benchmarks.level_collision --sizes 1000x200 4000x400
+
+
+def _overlaps(x, y, w, h, rect_x, rect_y, rect_w, rect_h) -> bool:
+    return (
+        rect_x < x + w
+        and x < rect_x + rect_w
+        and rect_y < y + h
+        and y < rect_y + rect_h
+    )
+
+
+def query_tiles(level: Level, boxes: np.ndarray) -> tuple[list[bool], int]:
+    # Tile-by-tile: fetch the tiles around each box and test every solid one
+    results = []
+    tested = 0
+    for x, y, w, h in boxes.tolist():
+        hit = False
+        for tile in level.get_tiles_in_rect(
+            int(np.floor(x)), int(np.floor(y)), int(np.ceil(x + w)), int(np.ceil(y + h))
+        ):
+            if not tile.is_solid:
+                continue
+            tested += 1
+            if _overlaps(x, y, w, h, tile.position[0], tile.position[1], 1, 1):
+                hit = True
+        results.append(hit)
+    return results, tested
+
+
+def query_rects(rects: CollisionRects, boxes: np.ndarray) -> tuple[list[bool], int]:
+    results = []
+    tested = 0
+    for x, y, w, h in boxes.tolist():
+        # Count the candidates from the bucket index, not just the hits
+        tested += len(rects._get_candidates(x, y, w, h))
+        found = rects.get_rects_in_box(x, y, w, h)
+        results.append(bool(found))
+    return results, tested
+
+
+# Box size ranges (min, max) in tiles: a player AABB, and the swept box
+# covering a fast-moving player over one tick
+BOX_PROFILES = {
+    "player": ((0.6, 1.8), (0.8, 2.5)),
+    "swept": ((4.0, 10.0), (4.0, 10.0)),
+}
+
+
+def run(width: int, height: int, queries: int, seed: int):
+    level = generate_level(width, height, seed=seed)
+    solid_tiles = level.collision.count_in_rect(
+        FLAG_SOLID, 0, 0, level.width - 1, level.height - 1
+    )
+
+    start = time.perf_counter()
+    rects = CollisionRects.from_grid(level.collision.get_grid(FLAG_SOLID))
+    build_time = time.perf_counter() - start
+
+    print(
+        f"{width}x{height}: {solid_tiles} solid tiles -> {len(rects)} rects "
+        f"(built in {build_time * 1000:.1f}ms)"
+    )
+
+    rng = np.random.default_rng(seed)
+    for profile, (box_width, box_height) in BOX_PROFILES.items():
+        # Boxes spread over the whole level
+        boxes = np.column_stack(
+            [
+                rng.random(queries) * width,
+                rng.random(queries) * height,
+                rng.uniform(*box_width, queries),
+                rng.uniform(*box_height, queries),
+            ]
+        )
+
+        start = time.perf_counter()
+        tile_results, tile_tested = query_tiles(level, boxes)
+        tile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rect_results, rect_tested = query_rects(rects, boxes)
+        rect_time = time.perf_counter() - start
+
+        if tile_results != rect_results:
+            raise AssertionError("Merged rects disagree with tile-by-tile collision")
+
+        print(f"  {profile} boxes, {queries} queries")
+        print(
+            f"    tiles:  {tile_time * 1000:8.1f}ms, "
+            f"{tile_tested / queries:6.2f} shapes tested per query"
+        )
+        print(
+            f"    merged: {rect_time * 1000:8.1f}ms, "
+            f"{rect_tested / queries:6.2f} shapes tested per query "
+            f"({tile_time / rect_time:.1f}x faster)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=["1000x200", "4000x400"])
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        width, height = (int(value) for value in size.split("x"))
+        run(width, height, args.queries, args.seed)
+
+
+if __name__ == "__main__":
+    main()
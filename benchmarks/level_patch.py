@@ -0,0 +1,108 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from benchmarks.levels import generate_level
+from common.level.level_file import LevelReader, encode_level
+from common.level.patch import LevelPatch, PatchRecorder
+
+# Records a batch of editor-style edits on a generated level and compares
+# storing them as a patch against re-serializing the whole level.
+#
+#   python3 -m benchmarks.level_patch --width 4000 --height 200 --edits 1000
+
+
+def edit_level(level, edits: int, fills: int, seed: int):
+    # Single tile edits plus a few rectangular fills, like brush and box tools
+    rng = random.Random(seed)
+    type_ids = [tile_type.type_id for tile_type in level.registry.types[1:]]
+
+    for _ in range(edits):
+        position = (rng.randrange(level.width), rng.randrange(level.height))
+        if rng.random() < 0.3:
+            level.remove_tile(position)
+        else:
+            level.set_type_id_at(position, rng.choice(type_ids))
+
+    for _ in range(fills):
+        width = rng.randrange(4, 64)
+        height = rng.randrange(2, 16)
+        x = rng.randrange(max(1, level.width - width))
+        y = rng.randrange(max(1, level.height - height))
+        level.set_region(
+            x, y, np.full((height, width), rng.choice(type_ids), dtype=np.uint16)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=200)
+    parser.add_argument("--edits", type=int, default=1000)
+    parser.add_argument("--fills", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    level = generate_level(args.width, args.height)
+    original = encode_level(level)
+
+    with PatchRecorder(level) as recorder:
+        edit_level(level, args.edits, args.fills, seed=0)
+        patch = recorder.take()
+
+    print(
+        f"Level {args.width}x{args.height}: {args.edits} edits, {args.fills} fills, "
+        f"{patch.get_cell_count()} cells changed in {len(patch)} runs"
+    )
+
+    # Size on the wire or on disk
+    patch_data = patch.to_bytes()
+    level_data = encode_level(level)
+    print(
+        f"  size:  patch {len(patch_data)} bytes, "
+        f"full level {len(level_data)} bytes "
+        f"({len(level_data) / max(1, len(patch_data)):.1f}x smaller)"
+    )
+
+    # Encode cost for autosave / upload
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        patch.to_bytes()
+    patch_encode = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        encode_level(level)
+    level_encode = (time.perf_counter() - start) / args.repeat
+    print(
+        f"  encode: patch {patch_encode * 1000:.2f}ms, "
+        f"full level {level_encode * 1000:.2f}ms"
+    )
+
+    # Applying the patch to a copy of the original vs loading the edited level
+    reader = LevelReader(original, level.registry)
+    patch_apply = 0.0
+    for _ in range(args.repeat):
+        target = reader.load_level()
+        start = time.perf_counter()
+        LevelPatch.from_bytes(patch_data, level.registry).apply(target)
+        patch_apply += time.perf_counter() - start
+    patch_apply /= args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        LevelReader(level_data, level.registry).load_level()
+    level_load = (time.perf_counter() - start) / args.repeat
+    print(
+        f"  apply: patch {patch_apply * 1000:.2f}ms, "
+        f"full level load {level_load * 1000:.2f}ms"
+    )
+
+    if not LevelPatch.from_levels(target, level).is_empty():
+        raise ValueError("Patched level does not match the edited level.")
+
+
+if __name__ == "__main__":
+    main()
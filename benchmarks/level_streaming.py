@@ -0,0 +1,78 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.levels import generate_level
+from common.level.level_file import LevelReader, save_level
+from common.level.streaming import StreamingLevel
+
+
+# Moves a synthetic focus point across a generated level and reports how well
+# each streaming radius keeps the chunks around the player resident.
+#
+#   python3 -m benchmarks.level_streaming --width 4000 --height 200
+
+
+def sweep(reader: LevelReader, radius: int, speed: int, background: bool) -> dict:
+    with StreamingLevel(reader, radius=radius, background=background) as streaming:
+        start = time.perf_counter()
+        max_resident = 0
+
+        y = reader.height // 2
+        for x in range(0, reader.width, speed):
+            streaming.set_focus((x, y))
+
+            # Let the loader catch up roughly as much as a frame would
+            if background:
+                streaming.wait_for_pending(timeout=0.001)
+
+            # Simulate the physics and renderer touching the area around the player
+            streaming.get_tiles_in_rect(x - 20, y - 12, x + 20, y + 12)
+            max_resident = max(max_resident, len(streaming.get_resident_chunk_keys()))
+
+        elapsed = time.perf_counter() - start
+
+        result = streaming.stats.as_dict()
+        result["hit_rate"] = streaming.stats.get_hit_rate()
+        result["max_resident"] = max_resident
+        result["seconds"] = elapsed
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=200)
+    parser.add_argument("--speed", type=int, default=2, help="tiles per frame")
+    parser.add_argument("--radii", type=int, nargs="+", default=[0, 1, 2, 3])
+    args = parser.parse_args()
+
+    level = generate_level(args.width, args.height)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "streaming.dlvl")
+        save_level(level, path)
+        print(
+            f"Level {args.width}x{args.height}: {len(level.chunks)} chunks, "
+            f"{os.path.getsize(path)} bytes on disk"
+        )
+
+        with LevelReader.open(path) as reader:
+            for radius in args.radii:
+                for background in (False, True):
+                    result = sweep(reader, radius, args.speed, background)
+                    mode = "background" if background else "inline"
+                    print(
+                        f"radius={radius} {mode:10} "
+                        f"hits={result['hits']} misses={result['misses']} "
+                        f"evictions={result['evictions']} "
+                        f"prefetched={result['prefetched']} "
+                        f"hit_rate={result['hit_rate']:.3f} "
+                        f"max_resident={result['max_resident']} "
+                        f"time={result['seconds'] * 1000:.1f}ms"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+
+from common.level.chunk import CHUNK_SIZE
+from common.level.level import Level
+from common.level.tile_type import TileTypeRegistry, TILE_TYPES
+
+
+TILESET_PATH = os.path.join(
+    "client", "assets", "textures", "tiles", "default", "tileset.json"
+)
+
+
+def _type_id(registry: TileTypeRegistry, name: str) -> int:
+    tile_type = registry.get_by_name(name)
+    if tile_type is None:
+        raise ValueError(f"Tile type not found in tileset: {name}")
+    return tile_type.type_id
+
+
+def generate_type_grid(
+    width: int,
+    height: int,
+    seed: int = 0,
+    registry: TileTypeRegistry = TILE_TYPES,
+) -> np.ndarray:
+    # Generates a platformer-like [y, x] grid of type ids: rolling ground made of
+    # large solid blocks, floating platforms, spikes, boosts and checkpoints
+    if registry.get_by_name("tile_green_center") is None:
+        registry.load_tileset_file(TILESET_PATH)
+
+    rng = np.random.default_rng(seed)
+    grid = np.zeros((height, width), dtype=np.uint16)
+
+    solid = _type_id(registry, "tile_green_center")
+    platform = _type_id(registry, "tile_blue_center")
+    spike = _type_id(registry, "tile_spike")
+    boost = _type_id(registry, "tile_boost_red")
+    checkpoint = _type_id(registry, "tile_checkpoint")
+    finish = _type_id(registry, "tile_flag")
+    spawn = _type_id(registry, "tile_player_spawn")
+
+    # Ground surface as a clamped random walk, flat for a few columns at a time
+    steps = rng.integers(-1, 2, size=width // 4 + 1).repeat(4)[:width]
+    surface = np.clip(height * 3 // 4 + np.cumsum(steps), height // 2, height - 2)
+    rows = np.arange(height)[:, None]
+    grid[rows >= surface[None, :]] = solid
+
+    # Floating platforms
+    for _ in range(max(1, width * height // 400)):
+        platform_width = int(rng.integers(3, 12))
+        platform_height = int(rng.integers(1, 4))
+        x = int(rng.integers(0, max(1, width - platform_width)))
+        y = int(rng.integers(1, max(2, height // 2)))
+        grid[y : y + platform_height, x : x + platform_width] = platform
+
+    # Hazards and pickups sitting on the ground
+    columns = np.arange(1, width - 1)
+    for tile_id, chance in ((spike, 0.05), (boost, 0.02)):
+        picked = columns[rng.random(len(columns)) < chance]
+        grid[surface[picked] - 1, picked] = tile_id
+
+    for x in range(64, width - 1, 128):
+        grid[surface[x] - 1, x] = checkpoint
+
+    grid[surface[1] - 1, 1] = spawn
+    grid[surface[width - 2] - 1, width - 2] = finish
+
+    return grid
+
+
+def generate_level(
+    width: int,
+    height: int,
+    seed: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+    registry: TileTypeRegistry = TILE_TYPES,
+) -> Level:
+    grid = generate_type_grid(width, height, seed, registry)
+    return Level.from_type_grid(grid, chunk_size, registry)
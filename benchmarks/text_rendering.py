@@ -0,0 +1,59 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+import pygame
+
+from client.src.asset.font.font_loader import FontLoader
+from client.src.renderer.glyph_cache import GlyphCache
+from client.src.renderer.text import render_text
+
+# Times render_text on a cold and a warm glyph cache, including an animated
+# scale like the title splash text.
+#
+#   python3 -m benchmarks.text_rendering --repeat 500
+
+FONT_DIR = os.path.join("client", "assets", "font")
+TEXT = "<icon:logo> Press F9 to open credits | Press ESC to quit"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((800, 480))
+    screen = pygame.display.get_surface()
+    font = FontLoader.load_font_from_directory(FONT_DIR)
+
+    cache = GlyphCache()
+    start = time.perf_counter()
+    render_text(screen, TEXT, font, (10, 10), 2, (255, 255, 255), cache)
+    print(f"  cold: {(time.perf_counter() - start) * 1000:8.3f}ms")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        render_text(screen, TEXT, font, (10, 10), 2, (255, 255, 255), cache)
+    seconds = (time.perf_counter() - start) / args.repeat
+    print(f"  warm: {seconds * 1000:8.3f}ms")
+
+    # Scales between 2.0 and 2.5 like the splash animation
+    start = time.perf_counter()
+    for index in range(args.repeat):
+        scale = 2.0 + 0.5 * (index % 30) / 30
+        render_text(screen, TEXT, font, (10, 60), scale, (255, 215, 0), cache)
+    seconds = (time.perf_counter() - start) / args.repeat
+    print(f"  animated scale: {seconds * 1000:8.3f}ms")
+
+    stats = cache.get_stats()
+    print(
+        f"  cache: {stats['size']} glyphs, {stats['hits']} hits, "
+        f"{stats['misses']} misses, {stats['hit_rate']:.1%} hit rate"
+    )
+
+
+if __name__ == "__main__":
+    main()
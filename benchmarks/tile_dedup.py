@@ -0,0 +1,76 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from PIL import Image
+
+from client.src.asset.tile.content_store import TileContentStore
+from client.src.asset.tile.tile import AssetTile
+from client.src.asset.tile.tile_atlas import TileAtlas
+from client.src.asset.tile.tile_loader import TileLoader
+from common.level.tile_type import TileTypeRegistry
+
+# Reports how many bytes identical tile images share across tilesets. Without
+# directories it loads the default tileset next to a copy of it with a few
+# tiles changed, like a typical resource pack.
+#
+#   python3 -m benchmarks.tile_dedup
+#   python3 -m benchmarks.tile_dedup client/assets/textures/tiles/default ~/my-pack
+
+DEFAULT_TILESET = os.path.join("client", "assets", "textures", "tiles", "default")
+
+
+def copy_pack(directory: str, changed: int):
+    # Copies the default tileset and recolours the first few tiles
+    shutil.copytree(DEFAULT_TILESET, directory)
+    tiles_dir = os.path.join(directory, "tiles")
+    for filename in sorted(os.listdir(tiles_dir))[:changed]:
+        path = os.path.join(tiles_dir, filename)
+        with Image.open(path) as image:
+            red, green, blue, alpha = image.convert("RGBA").split()
+        Image.merge("RGBA", (blue, green, red, alpha)).save(path)
+
+
+def report(directories: list[str]):
+    store = TileContentStore()
+    tiles = {}
+    start = time.perf_counter()
+    for index, directory in enumerate(directories):
+        loaded = TileLoader.load_tiles_from_directory(
+            directory, TileTypeRegistry(), store=store
+        )
+        # Tilesets share ids, so they are prefixed for the combined atlas
+        for tile_id, tile in loaded.items():
+            tiles[f"{index}:{tile_id}"] = AssetTile(
+                f"{index}:{tile_id}", tile.image, tile.compute_hash()
+            )
+    seconds = time.perf_counter() - start
+
+    atlas = TileAtlas(tiles)
+    print(f"  loaded {len(directories)} tilesets in {seconds * 1000:.1f}ms")
+    print(f"  {store.get_report()}")
+    print(
+        f"  atlas: {atlas.slot_count} slots for {len(atlas)} tiles, {atlas.image.size}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directories", nargs="*")
+    parser.add_argument("--changed", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.directories:
+        report(args.directories)
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pack_dir = os.path.join(temp_dir, "pack")
+        copy_pack(pack_dir, args.changed)
+        report([DEFAULT_TILESET, pack_dir])
+
+
+if __name__ == "__main__":
+    main()
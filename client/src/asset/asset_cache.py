@@ -0,0 +1,202 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Any, Optional
+
+from PIL import Image
+
+from client.src.asset.tile.tile import AssetTile
+
+# Decoded asset layout (all values little-endian):
+#   header    magic, version, source fingerprint, metadata length
+#   metadata  JSON with one entry per image (id, size, data offset, hash) plus
+#             loader specific data such as trimmed glyph widths
+#   pixels    raw RGBA buffers, each starting on a 16 byte boundary
+ASSET_CACHE_MAGIC = b"DASHRAC\0"
+ASSET_CACHE_VERSION = 1
+
+_HEADER = struct.Struct("<8sHH16sI")
+_ALIGNMENT = 16
+
+
+def get_user_data_dir() -> str:
+    return os.environ.get("DASHR_USER_DATA_DIR", os.path.expanduser("~/dashr-data"))
+
+
+def fingerprint_sources(paths: list[str]) -> bytes:
+    # Cheap staleness check: any added, removed, resized or touched source
+    # file changes the fingerprint
+    digest = hashlib.md5()
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.digest()
+
+
+class CachedAssets:
+    def __init__(
+        self,
+        images: dict[str, Image.Image],
+        hashes: dict[str, str],
+        metadata: dict[str, Any],
+    ):
+        self.images = images
+        self.hashes = hashes
+        self.metadata = metadata
+
+
+class AssetCache:
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = (
+            directory
+            if directory is not None
+            else os.path.join(get_user_data_dir(), "cache", "assets")
+        )
+
+    def _get_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.dcache")
+
+    def load(self, name: str, sources: list[str]) -> Optional[CachedAssets]:
+        # Returns None when there is no cache entry or the sources changed.
+        # The mapping stays open for as long as the returned images use it.
+        path = self._get_path(name)
+        try:
+            fingerprint = fingerprint_sources(sources)
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            cached = self._read(buffer, fingerprint)
+        except (ValueError, KeyError, struct.error, UnicodeDecodeError):
+            cached = None
+
+        if cached is None:
+            try:
+                buffer.close()
+            except BufferError:
+                pass
+        return cached
+
+    def _read(self, buffer: mmap.mmap, fingerprint: bytes) -> Optional[CachedAssets]:
+        if len(buffer) < _HEADER.size:
+            return None
+
+        magic, version, _, cached_fingerprint, metadata_length = _HEADER.unpack_from(
+            buffer, 0
+        )
+        if magic != ASSET_CACHE_MAGIC or version != ASSET_CACHE_VERSION:
+            return None
+        if cached_fingerprint != fingerprint:
+            return None
+
+        metadata_end = _HEADER.size + metadata_length
+        if metadata_end > len(buffer):
+            return None
+        metadata = json.loads(bytes(buffer[_HEADER.size : metadata_end]))
+
+        # Images share memory with the mapping instead of being copied
+        pixels_start = metadata_end + (-metadata_end % _ALIGNMENT)
+        view = memoryview(buffer)
+        images = {}
+        hashes = {}
+        for entry in metadata["images"]:
+            width, height = entry["size"]
+            offset = pixels_start + entry["offset"]
+            length = width * height * 4
+            if offset + length > len(buffer):
+                return None
+            if length == 0:
+                # Fully trimmed glyphs have no pixels to map
+                images[entry["id"]] = Image.new("RGBA", (width, height))
+                hashes[entry["id"]] = entry["hash"]
+                continue
+            images[entry["id"]] = Image.frombuffer(
+                "RGBA",
+                (width, height),
+                view[offset : offset + length],
+                "raw",
+                "RGBA",
+                0,
+                1,
+            )
+            hashes[entry["id"]] = entry["hash"]
+
+        return CachedAssets(images, hashes, metadata.get("data", {}))
+
+    def store(
+        self,
+        name: str,
+        sources: list[str],
+        images: dict[str, Image.Image],
+        data: Optional[dict[str, Any]] = None,
+        hashes: Optional[dict[str, str]] = None,
+    ) -> bool:
+        # Writes a new blob for the given sources. Failing to write the cache
+        # is not an error, the assets are simply decoded again next time.
+        hashes = hashes if hashes is not None else {}
+        entries = []
+        buffers = []
+        for image_id, image in images.items():
+            if image.mode != "RGBA":
+                image = image.convert("RGBA")
+            entries.append(
+                {
+                    "id": image_id,
+                    "size": list(image.size),
+                    "offset": 0,
+                    # Hashed like tiles, so loaders can reuse cached hashes
+                    "hash": hashes.get(image_id)
+                    or AssetTile(image_id, image).compute_hash(),
+                }
+            )
+            buffers.append(image.tobytes())
+
+        # Offsets are relative to the aligned start of the pixel data
+        offset = 0
+        for entry, pixels in zip(entries, buffers):
+            offset += -offset % _ALIGNMENT
+            entry["offset"] = offset
+            offset += len(pixels)
+
+        try:
+            fingerprint = fingerprint_sources(sources)
+        except OSError:
+            return False
+
+        metadata = json.dumps({"images": entries, "data": data or {}}).encode("utf-8")
+        metadata_end = _HEADER.size + len(metadata)
+        parts = [
+            _HEADER.pack(
+                ASSET_CACHE_MAGIC, ASSET_CACHE_VERSION, 0, fingerprint, len(metadata)
+            ),
+            metadata,
+            b"\0" * (-metadata_end % _ALIGNMENT),
+        ]
+        position = 0
+        for entry, pixels in zip(entries, buffers):
+            parts.append(b"\0" * (entry["offset"] - position))
+            parts.append(pixels)
+            position = entry["offset"] + len(pixels)
+
+        path = self._get_path(name)
+        temp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(b"".join(parts))
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Failed to write asset cache {path}: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def get_name(kind: str, *directories: str) -> str:
+        # Cache entries are per source directory, or per stack of resource packs
+        paths = "\0".join(os.path.abspath(directory) for directory in directories)
+        digest = hashlib.md5(paths.encode("utf-8"))
+        return f"{kind}-{digest.hexdigest()[:16]}"
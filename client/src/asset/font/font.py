@@ -1,8 +1,14 @@
+import itertools
+
 from PIL import Image
 
 from client.src.asset.font.character import FontCharacter
 from client.src.asset.font.icon import IconCharacter
 
+# Distinguishes fonts in render caches, unlike id() which is reused after a
+# reloaded font is freed
+_font_ids = itertools.count()
+
 
 class Font:
     def __init__(
@@ -15,6 +21,7 @@ class Font:
         self.characters = characters  # Mapping from character to its FontCharacter
         self.icons = icons  # Mapping from icon ID to its IconCharacter
         self._text_width_cache = {}  # Cache for text width calculations
+        self.cache_id = next(_font_ids)
 
     def get_character_image(self, char: str) -> Image.Image | None:
         font_char = self.characters.get(char)
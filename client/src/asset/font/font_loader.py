@@ -1,7 +1,10 @@
 from PIL import Image
 import os
 import json
+from typing import Optional
 
+from client.src.asset.asset_cache import AssetCache, CachedAssets
+from client.src.asset.image_loader import load_images
 from client.src.asset.font.character import FontCharacter
 from client.src.asset.font.font import Font
 from client.src.asset.font.icon import IconCharacter
@@ -9,12 +12,91 @@ from client.src.asset.font.icon import IconCharacter
 
 class FontLoader:
     @staticmethod
-    def load_font_from_directory(directory: str) -> Font:
-        # Find font.json
-        font_json_path = os.path.join(directory, "font.json")
-        if not os.path.isfile(font_json_path):
-            raise FileNotFoundError(f"font.json not found in directory: {directory}")
+    def load_font_from_directory(
+        directory: str,
+        max_workers: Optional[int] = None,
+        cache: Optional[AssetCache] = None,
+    ) -> Font:
+        return FontLoader.load_font_from_directories([directory], max_workers, cache)
 
+    @staticmethod
+    def load_font_from_directories(
+        directories: list[str],
+        max_workers: Optional[int] = None,
+        cache: Optional[AssetCache] = None,
+    ) -> Font:
+        # The first directory is the base font, later ones are resource packs.
+        # A pack's font.json and font.png replace the glyphs it lists, and its
+        # icons replace icons with the same name.
+        if not directories:
+            raise ValueError("At least one font directory is required.")
+
+        sheets: list[tuple[str, str]] = []  # (chars, font.png path) per layer
+        sources = []
+        icon_paths = {}
+        size = None
+        for index, directory in enumerate(directories):
+            # Find font.json
+            font_json_path = os.path.join(directory, "font.json")
+            if os.path.isfile(font_json_path):
+                layer_size, chars, font_image_path = FontLoader._read_font_json(
+                    directory, font_json_path
+                )
+                if size is not None and layer_size != size:
+                    raise ValueError(
+                        f"font.json in {directory} has size {layer_size}, "
+                        f"but the base font has size {size}."
+                    )
+                size = layer_size
+                sheets.append((chars, font_image_path))
+                sources.extend((font_json_path, font_image_path))
+            elif index == 0:
+                raise FileNotFoundError(
+                    f"font.json not found in directory: {directory}"
+                )
+
+            # Find icons (icons/*.png images)
+            icons_dir = os.path.join(directory, "icons")
+            if os.path.isdir(icons_dir):
+                for filename in os.listdir(icons_dir):
+                    if filename.lower().endswith(".png"):
+                        icon_id = os.path.splitext(filename)[0]
+                        icon_paths[icon_id] = os.path.join(icons_dir, filename)
+        sources.extend(icon_paths.values())
+
+        # Every character any layer defines, in order of first appearance
+        all_chars = "".join(dict.fromkeys("".join(chars for chars, _ in sheets)))
+
+        # Warm starts reuse the trimmed glyphs and their widths from the cache
+        cache_name = AssetCache.get_name("font", *directories)
+        cached = cache.load(cache_name, sources) if cache is not None else None
+        if cached is not None:
+            font = FontLoader._load_cached_font(size, all_chars, icon_paths, cached)
+            if font is not None:
+                return font
+
+        # Later sheets replace the glyphs of earlier ones
+        characters: dict[str, FontCharacter] = {}
+        for chars, font_image_path in sheets:
+            characters.update(FontLoader._load_characters(size, chars, font_image_path))
+
+        # Icons are decoded in parallel like tiles
+        icons: dict[str, IconCharacter] = {}
+        for icon_id, icon_image in load_images(icon_paths, max_workers).items():
+            icons[icon_id] = IconCharacter(icon_id, icon_image)
+
+        font = Font(size=size, characters=characters, icons=icons)
+
+        if cache is not None:
+            images = {f"char:{char}": c.image for char, c in characters.items()}
+            images.update({f"icon:{id}": icon.image for id, icon in icons.items()})
+            widths = {char: c.get_width(1) for char, c in characters.items()}
+            cache.store(cache_name, sources, images, data={"widths": widths})
+
+        return font
+
+    @staticmethod
+    def _read_font_json(directory: str, font_json_path: str) -> tuple[int, str, str]:
         with open(font_json_path, "r", encoding="utf-8") as f:
             font_data = json.load(f)
 
@@ -33,6 +115,12 @@ class FontLoader:
         if not os.path.isfile(font_image_path):
             raise FileNotFoundError(f"font.png not found in directory: {directory}")
 
+        return size, chars, font_image_path
+
+    @staticmethod
+    def _load_characters(
+        size: int, chars: str, font_image_path: str
+    ) -> dict[str, FontCharacter]:
         font_image = Image.open(font_image_path).convert("RGBA")
         img_width, img_height = font_image.size
 
@@ -81,17 +169,27 @@ class FontLoader:
             char_image = font_image.crop((left, upper, right, lower))
             characters[char] = FontCharacter(char, char_image)
 
-        # Load icons (icons/*.png images)
-        icons_dir = os.path.join(directory, "icons")
-        icons: dict[str, IconCharacter] = {}
-        if os.path.isdir(icons_dir):
-            for filename in os.listdir(icons_dir):
-                if filename.lower().endswith(".png"):
-                    icon_id = os.path.splitext(filename)[0]
-                    icon_path = os.path.join(icons_dir, filename)
-                    icon_image = Image.open(icon_path).convert("RGBA")
-                    icons[icon_id] = IconCharacter(icon_id, icon_image)
+        return characters
 
-        font = Font(size=size, characters=characters, icons=icons)
+    @staticmethod
+    def _load_cached_font(
+        size: int, chars: str, icon_paths: dict[str, str], cached: CachedAssets
+    ) -> Optional[Font]:
+        widths = cached.metadata.get("widths", {})
+        characters: dict[str, FontCharacter] = {}
+        for char in chars:
+            image = cached.images.get(f"char:{char}")
+            if image is None or char not in widths:
+                return None  # Stale entry, decode everything again
+            character = FontCharacter(char, image)
+            character._cached_actual_width = widths[char]
+            characters[char] = character
 
-        return font
+        icons: dict[str, IconCharacter] = {}
+        for icon_id in icon_paths:
+            image = cached.images.get(f"icon:{icon_id}")
+            if image is None:
+                return None  # Stale entry, decode everything again
+            icons[icon_id] = IconCharacter(icon_id, image)
+
+        return Font(size=size, characters=characters, icons=icons)
@@ -0,0 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from PIL import Image
+
+from client.src.constants import ASSET_LOAD_WORKERS
+
+
+def load_image(path: str) -> Image.Image:
+    # convert() forces the decode, which is when PIL releases the GIL
+    return Image.open(path).convert("RGBA")
+
+
+def load_images(
+    paths: dict[str, str], max_workers: Optional[int] = None
+) -> dict[str, Image.Image]:
+    # Decodes {id: path} into {id: RGBA image} on a thread pool, keeping the
+    # order of the input mapping
+    workers = ASSET_LOAD_WORKERS if max_workers is None else max_workers
+    if workers <= 1 or len(paths) <= 1:
+        return {image_id: load_image(path) for image_id, path in paths.items()}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        images = executor.map(load_image, paths.values())
+        return dict(zip(paths.keys(), images))
@@ -0,0 +1,123 @@
+import os
+import time
+from typing import Optional
+
+from client.src.asset.asset_cache import get_user_data_dir
+from client.src.constants import RESOURCE_PACKS, RESOURCE_PACK_POLL_INTERVAL
+
+# A resource pack mirrors client/assets and only needs the files it replaces,
+# e.g. <pack>/textures/tiles/default/tiles/tile_spike.png or <pack>/font/icons
+BASE_ASSETS_DIR = os.path.join("client", "assets")
+TILES_SUBDIR = os.path.join("textures", "tiles", "default")
+FONT_SUBDIR = "font"
+
+
+def get_resource_packs_dir() -> str:
+    return os.path.join(get_user_data_dir(), "resourcepacks")
+
+
+def get_enabled_resource_packs() -> list[str]:
+    # DASHR_RESOURCE_PACKS overrides the config, as a os.pathsep separated list
+    packs = os.environ.get("DASHR_RESOURCE_PACKS")
+    if packs is None:
+        return list(RESOURCE_PACKS)
+    return [pack for pack in packs.split(os.pathsep) if pack]
+
+
+class ResourcePacks:
+    def __init__(
+        self,
+        packs: Optional[list[str]] = None,
+        base_dir: str = BASE_ASSETS_DIR,
+        packs_dir: Optional[str] = None,
+    ):
+        # Packs are given lowest priority first, by path or by name inside the
+        # resource packs directory. Missing packs are skipped with a warning.
+        self.base_dir = base_dir
+        self.packs_dir = (
+            packs_dir if packs_dir is not None else get_resource_packs_dir()
+        )
+
+        self.pack_dirs: list[str] = []
+        for pack in packs if packs is not None else get_enabled_resource_packs():
+            pack_dir = (
+                pack if os.path.isabs(pack) else os.path.join(self.packs_dir, pack)
+            )
+            if os.path.isdir(pack_dir):
+                self.pack_dirs.append(os.path.normpath(pack_dir))
+            else:
+                print(f"Resource pack not found: {pack_dir}")
+
+    def _get_layers(self, subdir: str) -> list[str]:
+        # The base assets first, then every pack that has this kind of asset
+        layers = [os.path.join(self.base_dir, subdir)]
+        for pack_dir in self.pack_dirs:
+            layer = os.path.join(pack_dir, subdir)
+            if os.path.isdir(layer):
+                layers.append(layer)
+        return layers
+
+    def get_tile_dirs(self) -> list[str]:
+        return self._get_layers(TILES_SUBDIR)
+
+    def get_font_dirs(self) -> list[str]:
+        return self._get_layers(FONT_SUBDIR)
+
+    def get_watch_dirs(self) -> list[str]:
+        # Whole packs are watched so newly added asset folders are noticed too
+        return [
+            os.path.join(self.base_dir, TILES_SUBDIR),
+            os.path.join(self.base_dir, FONT_SUBDIR),
+            *self.pack_dirs,
+        ]
+
+
+def is_in_directories(path: str, directories: list[str]) -> bool:
+    path = os.path.abspath(path)
+    for directory in directories:
+        directory = os.path.abspath(directory)
+        if path == directory or path.startswith(directory + os.sep):
+            return True
+    return False
+
+
+class AssetWatcher:
+    def __init__(
+        self, directories: list[str], interval: float = RESOURCE_PACK_POLL_INTERVAL
+    ):
+        # Hot reload by polling (mtime, size) of every file, which works the
+        # same on every platform and costs a directory walk per interval
+        self.directories = directories
+        self.interval = interval
+        self._files = self._scan()
+        self._last_poll = time.monotonic()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        files = {}
+        for directory in self.directories:
+            for root, _, filenames in os.walk(directory):
+                for filename in filenames:
+                    path = os.path.join(root, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue  # Removed while walking
+                    files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def poll(self, force: bool = False) -> set[str]:
+        # Returns the files added, removed or modified since the last poll, or
+        # nothing when called again within the interval
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.interval:
+            return set()
+        self._last_poll = now
+
+        files = self._scan()
+        changed = {
+            path
+            for path in files.keys() | self._files.keys()
+            if files.get(path) != self._files.get(path)
+        }
+        self._files = files
+        return changed
@@ -0,0 +1,53 @@
+import threading
+
+from client.src.asset.tile.tile import AssetTile
+
+# Pixel hash plus size, as the same bytes can form differently shaped images
+ContentKey = tuple[str, tuple[int, int]]
+
+
+def get_content_key(tile: AssetTile) -> ContentKey:
+    return (tile.compute_hash(), tile.size)
+
+
+class TileContentStore:
+    def __init__(self):
+        # One canonical tile per distinct image, shared by every tileset and
+        # resource pack loaded through this store
+        self._tiles: dict[ContentKey, AssetTile] = {}
+        self._lock = threading.Lock()
+
+        self.tile_count = 0
+        self.deduplicated_tiles = 0
+        self.deduplicated_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def intern(self, tile: AssetTile) -> AssetTile:
+        # The first tile seen with given pixels becomes the canonical one.
+        # Later copies keep their id but reuse its image and surfaces.
+        key = get_content_key(tile)
+        with self._lock:
+            canonical = self._tiles.get(key)
+            if canonical is tile:
+                return tile
+
+            self.tile_count += 1
+            if canonical is None:
+                self._tiles[key] = tile
+                return tile
+
+            self.deduplicated_tiles += 1
+            self.deduplicated_bytes += len(tile.image.getbands()) * (
+                tile.size[0] * tile.size[1]
+            )
+        tile.share_with(canonical)
+        return tile
+
+    def get_report(self) -> str:
+        return (
+            f"{self.tile_count} tiles, {len(self._tiles)} unique images, "
+            f"{self.deduplicated_tiles} duplicates sharing "
+            f"{self.deduplicated_bytes / 1024:.1f} KiB"
+        )
@@ -0,0 +1,197 @@
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from typing import Optional
+
+from PIL import Image
+
+from client.src.asset.asset_cache import AssetCache, CachedAssets
+from client.src.asset.image_loader import load_image
+from client.src.asset.tile.content_store import TileContentStore
+from client.src.asset.tile.tile import AssetTile
+
+
+class LazyTileRegistry(Mapping[str, AssetTile]):
+    def __init__(
+        self,
+        tile_paths: dict[str, str],
+        cached: Optional[CachedAssets] = None,
+        cache: Optional[AssetCache] = None,
+        cache_name: Optional[str] = None,
+        cache_sources: Optional[list[str]] = None,
+        store: Optional[TileContentStore] = None,
+    ):
+        # Behaves like the {tile id: AssetTile} dict from the eager loader, but
+        # only the file listing is known up front. Each tile is decoded the
+        # first time it is looked up, or earlier by a background prefetch.
+        self.tile_paths = tile_paths
+        self._cached = cached
+        self._store = store
+        self._tiles: dict[str, AssetTile] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Tiles decoded from PNGs are written back to the asset cache, next to
+        # the ones it already had, once every tile is loaded or when the
+        # registry is saved or closed. Set while there is something to write.
+        self._cache = cache
+        self._cache_name = cache_name
+        self._cache_sources = cache_sources
+        self._cache_dirty = False
+
+    def __getitem__(self, tile_id: str) -> AssetTile:
+        tile = self._tiles.get(tile_id)
+        if tile is not None:
+            return tile
+        if tile_id not in self.tile_paths:
+            raise KeyError(tile_id)
+        return self._load(tile_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tile_paths)
+
+    def __len__(self) -> int:
+        return len(self.tile_paths)
+
+    def __contains__(self, tile_id: object) -> bool:
+        # Membership must not decode anything
+        return tile_id in self.tile_paths
+
+    def is_loaded(self, tile_id: str) -> bool:
+        return tile_id in self._tiles
+
+    def get_loaded_count(self) -> int:
+        return len(self._tiles)
+
+    def _decode(self, tile_id: str) -> Image.Image:
+        if self._cached is not None:
+            image = self._cached.images.get(tile_id)
+            if image is not None:
+                return image
+        return load_image(self.tile_paths[tile_id])
+
+    def _load(self, tile_id: str) -> AssetTile:
+        # Decoding and hashing happen outside the lock so a prefetch thread and
+        # the main thread can work on different tiles at once. If both decode
+        # the same tile, the first one stored wins.
+        image_hash = self._cached.hashes.get(tile_id) if self._cached else None
+        loaded = AssetTile(
+            id=tile_id, image=self._decode(tile_id), image_hash=image_hash
+        )
+        if self._store is not None:
+            loaded.compute_hash()
+
+        with self._lock:
+            tile = self._tiles.get(tile_id)
+            if tile is None:
+                tile = loaded
+                if self._store is not None:
+                    self._store.intern(tile)
+                self._tiles[tile_id] = tile
+                if self._cached is None or tile_id not in self._cached.images:
+                    self._cache_dirty = True
+            complete = len(self._tiles) == len(self.tile_paths)
+
+        if complete:
+            self.save_cache()
+        return tile
+
+    def save_cache(self):
+        # Writes every decoded tile, plus the cached ones not decoded this run,
+        # if any tile was decoded from its PNG since the last write
+        with self._lock:
+            if self._cache is None or self._cache_name is None or not self._cache_dirty:
+                return
+            images = {}
+            hashes = {}
+            if self._cached is not None:
+                images.update(self._cached.images)
+                hashes.update(self._cached.hashes)
+            for tile_id, tile in self._tiles.items():
+                images[tile_id] = tile.image
+                hashes[tile_id] = tile.compute_hash()
+            self._cache_dirty = False
+
+        if not self._cache.store(
+            self._cache_name, self._cache_sources or [], images, hashes=hashes
+        ):
+            with self._lock:
+                self._cache_dirty = True
+
+    def reload(self, tile_paths: dict[str, str], changed_paths: set[str]) -> set[str]:
+        # Swaps in a new file listing after resource pack files changed and
+        # returns the ids whose image changed. Tiles that were already decoded
+        # are decoded again right away; if the new file cannot be read yet (e.g.
+        # still being written) the old image stays until the next change.
+        changed = {
+            tile_id
+            for tile_id in self.tile_paths.keys() | tile_paths.keys()
+            if self.tile_paths.get(tile_id) != tile_paths.get(tile_id)
+            or tile_paths[tile_id] in changed_paths
+        }
+        if not changed:
+            return changed
+
+        reloaded = {}
+        for tile_id in changed:
+            if tile_id not in self._tiles or tile_id not in tile_paths:
+                continue
+            try:
+                image = load_image(tile_paths[tile_id])
+            except OSError as e:
+                print(f"Failed to reload tile {tile_id}: {e}")
+                continue
+            reloaded[tile_id] = AssetTile(id=tile_id, image=image)
+
+        with self._lock:
+            self.tile_paths = tile_paths
+
+            # The asset cache no longer matches the files
+            self._cache = None
+            if self._cached is not None:
+                for tile_id in changed:
+                    self._cached.images.pop(tile_id, None)
+                    self._cached.hashes.pop(tile_id, None)
+
+            for tile_id in changed:
+                if tile_id not in tile_paths:
+                    self._tiles.pop(tile_id, None)
+            for tile_id, tile in reloaded.items():
+                if self._store is not None:
+                    self._store.intern(tile)
+                self._tiles[tile_id] = tile
+
+        return changed
+
+    def prefetch(self, tile_ids: Iterable[str]) -> Optional[Future]:
+        # Decodes the given tiles on a background thread, e.g. the tiles of a
+        # level while its menu entry is selected. Unknown and already loaded
+        # ids are skipped. Returns None when there is nothing to do.
+        pending = [
+            tile_id
+            for tile_id in dict.fromkeys(tile_ids)
+            if tile_id in self.tile_paths and tile_id not in self._tiles
+        ]
+        if not pending:
+            return None
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tile-prefetch"
+            )
+        return self._executor.submit(self._prefetch, pending)
+
+    def _prefetch(self, tile_ids: list[str]):
+        for tile_id in tile_ids:
+            if tile_id not in self._tiles:
+                self._load(tile_id)
+
+    def load_all(self) -> dict[str, AssetTile]:
+        # Forces every tile, for tools that need the whole tileset
+        return {tile_id: self[tile_id] for tile_id in self.tile_paths}
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self.save_cache()
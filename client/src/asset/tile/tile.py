@@ -1,21 +1,97 @@
+from collections import OrderedDict
+from typing import Optional
+
 from PIL import Image
 import hashlib
+import pygame
+
+from client.src.constants import TILE_SCALE_CACHE_SIZE
 
 
 class AssetTile:
-    def __init__(self, id: str, image: Image.Image):
+    def __init__(self, id: str, image: Image.Image, image_hash: Optional[str] = None):
         self.id = id
         self.image = image
 
+        # Content hash, computed on first use unless already known (e.g. from
+        # the asset cache)
+        self._hash = image_hash
+
+        # Tile with identical pixels whose image and surfaces this one reuses
+        self._shared: Optional["AssetTile"] = None
+
         self.size = self.image.size  # (width, height)
 
+        # Pygame surfaces built from the image on first use
+        self._surface: Optional[pygame.Surface] = None
+        self._surface_converted = False
+        self._scaled_surfaces: OrderedDict[float, pygame.Surface] = OrderedDict()
+
     def get_image(self) -> Image.Image:
         return self.image
 
     def get_size(self) -> tuple[int, int]:
         return self.size
 
+    def share_with(self, other: "AssetTile"):
+        # Called by the content store when other has the same pixels
+        self.image = other.image
+        self._hash = other._hash
+        self._shared = other
+        self.clear_surface_cache()
+
+    def get_surface(self) -> pygame.Surface:
+        if self._shared is not None:
+            return self._shared.get_surface()
+
+        if self._surface is None or (
+            not self._surface_converted and pygame.display.get_surface() is not None
+        ):
+            surface = pygame.image.fromstring(
+                self.image.tobytes(), self.image.size, "RGBA"
+            )
+
+            # Converting to the display format needs a window, so tiles loaded
+            # before one exists are converted on a later call
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+                self._surface_converted = True
+
+            self._surface = surface
+            self._scaled_surfaces.clear()
+        return self._surface
+
+    def get_scaled_surface(self, scale: float) -> pygame.Surface:
+        if self._shared is not None:
+            return self._shared.get_scaled_surface(scale)
+
+        surface = self.get_surface()
+        if scale == 1.0:
+            return surface
+
+        scaled = self._scaled_surfaces.get(scale)
+        if scaled is not None:
+            self._scaled_surfaces.move_to_end(scale)
+            return scaled
+
+        new_size = (int(self.size[0] * scale), int(self.size[1] * scale))
+        scaled = pygame.transform.scale(surface, new_size)
+        self._scaled_surfaces[scale] = scaled
+
+        # Only the most recently used scales are kept around
+        while len(self._scaled_surfaces) > TILE_SCALE_CACHE_SIZE:
+            self._scaled_surfaces.popitem(last=False)
+        return scaled
+
+    def clear_surface_cache(self):
+        self._surface = None
+        self._surface_converted = False
+        self._scaled_surfaces.clear()
+
     def compute_hash(self) -> str:
-        # Compute a hash of the image data for unique identification
-        img_bytes = self.image.tobytes()
-        return hashlib.md5(img_bytes).hexdigest()
+        # Compute a hash of the image data for unique identification. The
+        # image never changes, so it is only hashed once.
+        if self._hash is None:
+            img_bytes = self.image.tobytes()
+            self._hash = hashlib.md5(img_bytes).hexdigest()
+        return self._hash
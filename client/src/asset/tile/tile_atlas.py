@@ -0,0 +1,183 @@
+from collections import OrderedDict
+import math
+from typing import Optional
+
+from PIL import Image
+import pygame
+
+from client.src.asset.tile.content_store import ContentKey, get_content_key
+from client.src.asset.tile.tile import AssetTile
+from client.src.constants import TILE_SCALE_CACHE_SIZE, TILE_ATLAS_PADDING
+
+
+class TileAtlas:
+    def __init__(self, tiles: dict[str, AssetTile], padding: int = TILE_ATLAS_PADDING):
+        self.padding = padding
+
+        # Rects of every tile inside the unscaled atlas image, keyed by tile id
+        self.rects: dict[str, pygame.Rect] = {}
+        self.slot_count = 0
+        self._tiles = {tile.id: tile for tile in tiles.values()}
+        self._slots: dict[ContentKey, pygame.Rect] = {}
+        self.image = self._pack(self._tiles)
+
+        # Atlas surface and rect table per scale, most recently used last
+        self._surfaces: OrderedDict[float, pygame.Surface] = OrderedDict()
+        self._scaled_rects: dict[float, dict[str, pygame.Rect]] = {}
+        self._surface_converted = False
+
+    def _pack(self, tiles: dict[str, AssetTile]) -> Image.Image:
+        # Shelf packing: tiles sorted by height are laid out left to right in
+        # rows about as wide as the atlas is tall. Tiles are separated by a
+        # transparent border so scaled neighbours never bleed into each other.
+        # Tiles with identical pixels share one slot.
+        padding = self.padding
+        self.rects = {}
+        self._slots = {}
+        ordered = sorted(
+            tiles.values(), key=lambda tile: (-tile.size[1], -tile.size[0], tile.id)
+        )
+        if not ordered:
+            return Image.new("RGBA", (1, 1))
+
+        unique: dict[ContentKey, AssetTile] = {}
+        for tile in ordered:
+            unique.setdefault(get_content_key(tile), tile)
+        self.slot_count = len(unique)
+
+        area = sum(
+            (tile.size[0] + padding) * (tile.size[1] + padding)
+            for tile in unique.values()
+        )
+        row_width = max(
+            math.ceil(math.sqrt(area)), max(tile.size[0] for tile in ordered) + padding
+        )
+
+        x = padding
+        y = padding
+        row_height = 0
+        slots = self._slots
+        for key, tile in unique.items():
+            width, height = tile.size
+            if x + width > row_width and x > padding:
+                x = padding
+                y += row_height + padding
+                row_height = 0
+            slots[key] = pygame.Rect(x, y, width, height)
+            x += width + padding
+            row_height = max(row_height, height)
+
+        for tile in ordered:
+            self.rects[tile.id] = slots[get_content_key(tile)].copy()
+
+        atlas_width = max(rect.right for rect in slots.values()) + padding
+        atlas_height = y + row_height + padding
+        image = Image.new("RGBA", (atlas_width, atlas_height))
+        for key, tile in unique.items():
+            rect = slots[key]
+            image.paste(tile.image, (rect.x, rect.y))
+        return image
+
+    def update_tiles(self, tiles: dict[str, AssetTile]) -> bool:
+        # Puts new images for some tiles into the atlas, e.g. after a hot
+        # reload. A changed tile is pasted over its old slot when it has the
+        # same size and no other tile uses that slot, or pointed at the slot of
+        # an identical image. Anything else repacks the whole atlas. Returns
+        # whether it was repacked.
+        changed = [
+            tile for tile in tiles.values() if self._tiles.get(tile.id) is not tile
+        ]
+        if not changed:
+            return False
+        for tile in changed:
+            self._tiles[tile.id] = tile
+
+        users: dict[tuple[int, int, int, int], int] = {}
+        for rect in self.rects.values():
+            users[tuple(rect)] = users.get(tuple(rect), 0) + 1
+
+        repack = False
+        for tile in changed:
+            key = get_content_key(tile)
+            rect = self.rects.get(tile.id)
+            slot = self._slots.get(key)
+            if slot is not None:
+                if rect is not None:
+                    users[tuple(rect)] -= 1
+                self.rects[tile.id] = slot.copy()
+                users[tuple(slot)] = users.get(tuple(slot), 0) + 1
+            elif (
+                rect is not None and rect.size == tile.size and users[tuple(rect)] == 1
+            ):
+                self._slots = {
+                    slot_key: slot_rect
+                    for slot_key, slot_rect in self._slots.items()
+                    if slot_rect != rect
+                }
+                self._slots[key] = rect.copy()
+                self.image.paste(tile.image, (rect.x, rect.y))
+            else:
+                repack = True
+                break
+
+        if repack:
+            self.image = self._pack(self._tiles)
+        else:
+            # Slots no tile points at anymore are left empty until a repack
+            self.slot_count = len(self._slots)
+
+        self._surfaces.clear()
+        self._scaled_rects.clear()
+        self._surface_converted = False
+        return repack
+
+    def __contains__(self, tile_id: str) -> bool:
+        return tile_id in self.rects
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def get_surface(self, scale: float = 1.0) -> pygame.Surface:
+        # Surfaces built before a window existed are rebuilt once they can be
+        # converted to the display format
+        if not self._surface_converted and pygame.display.get_surface() is not None:
+            self._surfaces.clear()
+
+        surface = self._surfaces.get(scale)
+        if surface is not None:
+            self._surfaces.move_to_end(scale)
+            return surface
+
+        surface = pygame.image.fromstring(self.image.tobytes(), self.image.size, "RGBA")
+        if scale != 1.0:
+            surface = pygame.transform.scale(
+                surface,
+                (int(self.image.width * scale), int(self.image.height * scale)),
+            )
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+            self._surface_converted = True
+
+        self._surfaces[scale] = surface
+        while len(self._surfaces) > TILE_SCALE_CACHE_SIZE:
+            evicted, _ = self._surfaces.popitem(last=False)
+            self._scaled_rects.pop(evicted, None)
+        return surface
+
+    def get_rects(self, scale: float = 1.0) -> dict[str, pygame.Rect]:
+        rects = self._scaled_rects.get(scale)
+        if rects is None:
+            rects = {
+                tile_id: pygame.Rect(
+                    int(rect.x * scale),
+                    int(rect.y * scale),
+                    int(rect.width * scale),
+                    int(rect.height * scale),
+                )
+                for tile_id, rect in self.rects.items()
+            }
+            self._scaled_rects[scale] = rects
+        return rects
+
+    def get_rect(self, tile_id: str, scale: float = 1.0) -> Optional[pygame.Rect]:
+        return self.get_rects(scale).get(tile_id)
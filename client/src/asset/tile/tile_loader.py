@@ -1,41 +1,168 @@
-from PIL import Image
 import os
 import json
+from typing import Optional
 
+from client.src.asset.asset_cache import AssetCache
+from client.src.asset.image_loader import load_images
+from client.src.asset.tile.content_store import TileContentStore
+from client.src.asset.tile.lazy_tiles import LazyTileRegistry
 from client.src.asset.tile.tile import AssetTile
+from common.level.tile_type import TileTypeRegistry, TILE_TYPES
 
 
 class TileLoader:
     @staticmethod
-    def load_tiles_from_directory(directory: str) -> dict[str, AssetTile]:
-        tiles = {}
+    def _read_tilesets(
+        directories: list[str], registry: Optional[TileTypeRegistry] = None
+    ) -> tuple[list[str], dict[str, str]]:
+        # Registers every tileset.json and lists the tile images without
+        # decoding them. The first directory is the base tileset, later ones are
+        # resource packs: their images replace tiles with the same name, and
+        # their tileset.json (optional) can only add new tiles.
+        if not directories:
+            raise ValueError("At least one tile directory is required.")
 
-        # Find tileset.json
-        tileset_json_path = os.path.join(directory, "tileset.json")
-        if not os.path.isfile(tileset_json_path):
-            raise FileNotFoundError(f"tileset.json not found in directory: {directory}")
+        tileset_json_paths = []
+        tile_paths = {}
+        for index, directory in enumerate(directories):
+            tileset_json_path = os.path.join(directory, "tileset.json")
+            if os.path.isfile(tileset_json_path):
+                with open(tileset_json_path, "r", encoding="utf-8") as f:
+                    tileset_data = json.load(f)
 
-        with open(tileset_json_path, "r", encoding="utf-8") as f:
-            tileset_data = json.load(f)
+                # Register the per-tile properties (solid, kill, boost, ...) as
+                # shared types. The first registration of a name wins.
+                (registry if registry is not None else TILE_TYPES).load_tileset_data(
+                    tileset_data
+                )
+                tileset_json_paths.append(tileset_json_path)
+            elif index == 0:
+                raise FileNotFoundError(
+                    f"tileset.json not found in directory: {directory}"
+                )
 
-        # Make sure tiles folder exists
-        tiles_folder = os.path.join(directory, "tiles")
-        if not os.path.isdir(tiles_folder):
-            raise FileNotFoundError(
-                f"'tiles' folder not found in directory: {directory}"
-            )
+            # Make sure tiles folder exists
+            tiles_folder = os.path.join(directory, "tiles")
+            if not os.path.isdir(tiles_folder):
+                if index == 0:
+                    raise FileNotFoundError(
+                        f"'tiles' folder not found in directory: {directory}"
+                    )
+                continue
+
+            # Find every tile image in the tiles folder
+            for tile_filename in os.listdir(tiles_folder):
+                if tile_filename.endswith(".png"):
+                    tile_name = os.path.splitext(tile_filename)[0]
+                    tile_paths[tile_name] = os.path.join(tiles_folder, tile_filename)
 
-        # Load each tile from the tiles folder
-        for tile_filename in os.listdir(tiles_folder):
-            if tile_filename.endswith(".png"):
-                tile_name = os.path.splitext(tile_filename)[0]
-                tile_path = os.path.join(tiles_folder, tile_filename)
+        return tileset_json_paths, tile_paths
 
-                # Load image
-                image = Image.open(tile_path).convert("RGBA")
+    @staticmethod
+    def load_lazy_tiles_from_directory(
+        directory: str,
+        registry: Optional[TileTypeRegistry] = None,
+        cache: Optional[AssetCache] = None,
+        store: Optional[TileContentStore] = None,
+    ) -> LazyTileRegistry:
+        return TileLoader.load_lazy_tiles_from_directories(
+            [directory], registry, cache, store
+        )
+
+    @staticmethod
+    def load_lazy_tiles_from_directories(
+        directories: list[str],
+        registry: Optional[TileTypeRegistry] = None,
+        cache: Optional[AssetCache] = None,
+        store: Optional[TileContentStore] = None,
+    ) -> LazyTileRegistry:
+        # Same tiles as load_tiles_from_directories, decoded on first access
+        tileset_json_paths, tile_paths = TileLoader._read_tilesets(
+            directories, registry
+        )
 
-                # Create AssetTile
-                tile = AssetTile(id=tile_name, image=image)
-                tiles[tile_name] = tile
+        sources = [*tileset_json_paths, *tile_paths.values()]
+        cache_name = AssetCache.get_name("tiles", *directories)
+        cached = cache.load(cache_name, sources) if cache is not None else None
 
+        # The cache may only hold the tiles decoded in earlier runs, the rest
+        # are decoded from their PNGs
+        if cached is not None and not set(cached.images) <= set(tile_paths):
+            cached = None
+
+        return LazyTileRegistry(tile_paths, cached, cache, cache_name, sources, store)
+
+    @staticmethod
+    def reload_lazy_tiles(
+        tiles: LazyTileRegistry,
+        directories: list[str],
+        changed_paths: set[str],
+        registry: Optional[TileTypeRegistry] = None,
+    ) -> set[str]:
+        # Hot reload: lists the directories again and reloads only the tiles
+        # whose image changed or now comes from another pack. Returns their ids.
+        _, tile_paths = TileLoader._read_tilesets(directories, registry)
+        return tiles.reload(tile_paths, changed_paths)
+
+    @staticmethod
+    def load_tiles_from_directory(
+        directory: str,
+        registry: Optional[TileTypeRegistry] = None,
+        max_workers: Optional[int] = None,
+        cache: Optional[AssetCache] = None,
+        store: Optional[TileContentStore] = None,
+    ) -> dict[str, AssetTile]:
+        return TileLoader.load_tiles_from_directories(
+            [directory], registry, max_workers, cache, store
+        )
+
+    @staticmethod
+    def load_tiles_from_directories(
+        directories: list[str],
+        registry: Optional[TileTypeRegistry] = None,
+        max_workers: Optional[int] = None,
+        cache: Optional[AssetCache] = None,
+        store: Optional[TileContentStore] = None,
+    ) -> dict[str, AssetTile]:
+        tiles = {}
+        tileset_json_paths, tile_paths = TileLoader._read_tilesets(
+            directories, registry
+        )
+
+        # Warm starts map the decoded pixels from the cache instead of decoding
+        sources = [*tileset_json_paths, *tile_paths.values()]
+        cache_name = AssetCache.get_name("tiles", *directories)
+        cached = cache.load(cache_name, sources) if cache is not None else None
+        if cached is not None and set(cached.images) == set(tile_paths):
+            for tile_name in tile_paths:
+                tiles[tile_name] = AssetTile(
+                    id=tile_name,
+                    image=cached.images[tile_name],
+                    image_hash=cached.hashes.get(tile_name),
+                )
+            return TileLoader._intern_tiles(tiles, store)
+
+        # Decode all images in parallel, then create the AssetTiles
+        images = load_images(tile_paths, max_workers)
+        for tile_name, image in images.items():
+            tiles[tile_name] = AssetTile(id=tile_name, image=image)
+
+        if cache is not None:
+            cache.store(
+                cache_name,
+                sources,
+                images,
+                hashes={name: tile.compute_hash() for name, tile in tiles.items()},
+            )
+
+        return TileLoader._intern_tiles(tiles, store)
+
+    @staticmethod
+    def _intern_tiles(
+        tiles: dict[str, AssetTile], store: Optional[TileContentStore]
+    ) -> dict[str, AssetTile]:
+        # Tiles with the same pixels as an already loaded one share its surfaces
+        if store is not None:
+            for tile in tiles.values():
+                store.intern(tile)
         return tiles
@@ -1,5 +1,6 @@
-import pygame
+import os
 
+import pygame
 
 # Repo config
 UPSTREAM_REPO_URL = "https://github.com/dashrgame/dashr.git"
@@ -12,12 +13,46 @@ UI_SCALE = 1
 DEFAULT_UI_SCALE = 1
 DEFAULT_FULLSCREEN_UI_SCALE = 2
 BACKGROUND_COLOR = (255, 255, 255)
+DIRTY_RECT_RENDERING = True  # only push changed screen regions on static pages
+
+# Simulation config
+MAX_SIMULATION_TICKS_PER_FRAME = 8  # drop time instead of spiralling on slow frames
+LOCAL_PLAYER_ID = "local"
+PLAYER_LEFT_KEYS = (pygame.K_LEFT, pygame.K_a)
+PLAYER_RIGHT_KEYS = (pygame.K_RIGHT, pygame.K_d)
+PLAYER_JUMP_KEYS = (pygame.K_SPACE, pygame.K_UP, pygame.K_w)
+
+# Asset loading config
+ASSET_LOAD_WORKERS = min(8, os.cpu_count() or 1)  # threads decoding PNGs
+
+# Resource pack config
+RESOURCE_PACKS: list[str] = []  # pack names or paths, lowest priority first
+RESOURCE_PACK_HOT_RELOAD = False  # poll pack files and reload changed assets
+RESOURCE_PACK_POLL_INTERVAL = 0.5  # seconds between hot reload polls
+
+# Tile rendering config
+TILE_SIZE = 16  # tile size in pixels at 1x
+TILE_SCALE_CACHE_SIZE = 4  # pre-scaled surfaces kept per tile
+TILE_ATLAS_PADDING = 1  # transparent pixels between tiles in the atlas
+TILEMAP_CHUNK_CACHE_SIZE = 64  # baked chunk surfaces kept, and as many scaled ones
+
+# Text rendering config
+GLYPH_CACHE_SIZE = 2048  # ready-to-blit glyph surfaces kept
+
+# Camera config
+CAMERA_MIN_ZOOM = 0.25
+CAMERA_MAX_ZOOM = 8.0
 
 # Debug overlay config
 DEBUG_BOX_COLOR = (255, 255, 255)
 DEBUG_TEXT_COLOR = (0, 0, 0)
 
+# Background config
+PARALLAX_RESIZE_DEBOUNCE = 0.25  # seconds a new window size must hold before rescaling
+
 # Title screen config
+TITLE_BACKGROUND_LAYERS = [("title_bg.png", 0.0)]  # (file, scroll factor) back to front
+TITLE_BACKGROUND_SCROLL_SPEED = 20  # pixels per second for a scroll factor of 1
 TITLE_EXTRA_SCALE = 10
 SUBTITLE_EXTRA_SCALE = 3
 SPLASH_EXTRA_SCALE = 2
@@ -2,16 +2,29 @@ import os
 import sys
 import time
 import threading
+from typing import Optional
 
 from client.src.ui.components import button
 
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
 import pygame
 
+from client.src.asset.asset_cache import AssetCache, get_user_data_dir
 from client.src.asset.font.font_loader import FontLoader
+from client.src.asset.resource_pack import (
+    AssetWatcher,
+    ResourcePacks,
+    is_in_directories,
+)
+from client.src.asset.tile.content_store import TileContentStore
 from client.src.asset.tile.tile_loader import TileLoader
+from client.src.asset.tile.tile_atlas import TileAtlas
 from client.src.input.manager import InputManager
+from client.src.renderer.camera import Camera
+from client.src.renderer.render_target import RenderTarget
+from client.src.renderer.tilemap import TilemapRenderer
 from client.src.renderer.text import render_text
+from client.src.ui.components.parallax import ParallaxBackground
 from client.src.ui.page_manager import PageManager
 from client.src.ui.overlay_manager import OverlayManager
 from client.src.ui.overlays.debug_overlay import DebugOverlay
@@ -26,6 +39,10 @@ from client.src.update.version import (
 )
 from client.src.update import autoupdate
 from client.src.constants import *
+from common.level.level import Level
+from common.level.level_file import LEVEL_FILE_EXTENSION, load_level
+from common.simulation.player import PlayerInput
+from common.simulation.simulation import Simulation
 
 
 class DashrGame:
@@ -44,6 +61,25 @@ class DashrGame:
         # Game clock
         self.clock = pygame.time.Clock()
 
+        # Fixed-timestep simulation, only present while a level is being played
+        self.simulation: Optional[Simulation] = None
+        self._tick_accumulator = 0.0
+        self.interpolation_alpha = 0.0
+
+        # Atlas of the tiles used by the current level
+        self.tile_atlas: Optional[TileAtlas] = None
+
+        # The world is drawn at 1x into a small target and upscaled once per frame
+        self.world_target = RenderTarget(self.ui_scale)
+        self.camera = Camera((DEFAULT_WIDTH, DEFAULT_HEIGHT))
+        self.tilemap_renderer: Optional[TilemapRenderer] = None
+
+        # Dirty-rect rendering state: what was shown last frame and where the
+        # overlays were drawn over the page (None when unknown)
+        self._last_rendered_page = None
+        self._last_screen_size = (0, 0)
+        self._overlay_rects: Optional[list[pygame.Rect]] = None
+
         # Get version number
         def get_versions():
             try:
@@ -104,15 +140,88 @@ class DashrGame:
             pygame.display.set_icon(icon)
 
     def _load_assets(self):
+        # Decoded assets are cached under the user data directory between runs
+        self.asset_cache = AssetCache()
+
+        # Resource packs are layered over the base assets, later packs win
+        self.resource_packs = ResourcePacks()
+
         # Load font
-        font_dir = os.path.join("client", "assets", "font")
-        self.font = FontLoader.load_font_from_directory(font_dir)
+        self.font = FontLoader.load_font_from_directories(
+            self.resource_packs.get_font_dirs(), cache=self.asset_cache
+        )
+
+        # Load tiles. Only tileset.json and the file listing are read here, the
+        # images are decoded when a page or level first needs them.
+        # Tiles with identical pixels share one surface and atlas slot.
+        self.tile_store = TileContentStore()
+        self.loaded_tiles = TileLoader.load_lazy_tiles_from_directories(
+            self.resource_packs.get_tile_dirs(),
+            cache=self.asset_cache,
+            store=self.tile_store,
+        )
 
-        # Load tiles
-        tiles_dir = os.path.join("client", "assets", "textures", "tiles", "default")
-        self.loaded_tiles = TileLoader.load_tiles_from_directory(tiles_dir)
+        # Artists can edit pack files while the game runs
+        self.asset_watcher: Optional[AssetWatcher] = None
+        if (
+            RESOURCE_PACK_HOT_RELOAD
+            or os.environ.get("DASHR_HOT_RELOAD", "false") == "true"
+        ):
+            self.asset_watcher = AssetWatcher(self.resource_packs.get_watch_dirs())
+
+    def _reload_changed_assets(self):
+        changed = self.asset_watcher.poll() if self.asset_watcher else None
+        if not changed:
+            return
+
+        font_dirs = self.resource_packs.get_font_dirs()
+        if any(is_in_directories(path, font_dirs) for path in changed):
+            try:
+                self.font = FontLoader.load_font_from_directories(
+                    font_dirs, cache=self.asset_cache
+                )
+                print("Reloaded font")
+
+                # Static pages only redraw in full when asked to
+                self._overlay_rects = None
+            except (OSError, ValueError) as e:
+                print(f"Failed to reload font: {e}")
+
+        tile_dirs = self.resource_packs.get_tile_dirs()
+        if not any(is_in_directories(path, tile_dirs) for path in changed):
+            return
+        try:
+            tile_ids = TileLoader.reload_lazy_tiles(
+                self.loaded_tiles, tile_dirs, changed
+            )
+        except (OSError, ValueError) as e:
+            print(f"Failed to reload tiles: {e}")
+            return
+        if not tile_ids:
+            return
+        print(f"Reloaded {len(tile_ids)} tiles")
+        self._overlay_rects = None
+
+        # Only the changed tiles go back into the atlas, and only the chunks
+        # using them are baked again
+        if self.tile_atlas is not None:
+            self.tile_atlas.update_tiles(
+                {
+                    tile_id: self.loaded_tiles[tile_id]
+                    for tile_id in tile_ids
+                    if tile_id in self.tile_atlas and tile_id in self.loaded_tiles
+                }
+            )
+        if self.tilemap_renderer is not None:
+            self.tilemap_renderer.mark_tiles_dirty(tile_ids)
 
     def _setup_ui(self):
+        # Background shared by the pages that use it, so it is scaled only once
+        self.background = ParallaxBackground.from_files(
+            TITLE_BACKGROUND_LAYERS,
+            os.path.join("client", "assets", "ui", "backgrounds"),
+        )
+
         # Initialize page manager
         self.page_manager = PageManager()
 
@@ -120,7 +229,7 @@ class DashrGame:
         self.overlay_manager = OverlayManager()
 
         # Setup pages
-        self.play_page = PlayPage()
+        self.play_page = PlayPage(on_quick_play=self.quick_play)
         self.create_page = CreatePage()
         self.settings_page = SettingsPage()
         self.credits_page = Credits(self.current_version)
@@ -131,7 +240,9 @@ class DashrGame:
             "create": lambda: self.page_manager.set_page(self.create_page),
             "settings": lambda: self.page_manager.set_page(self.settings_page),
         }
-        self.title_page = Title(button_callbacks=button_callbacks)
+        self.title_page = Title(
+            button_callbacks=button_callbacks, background=self.background
+        )
 
         # Set the initial page
         self.page_manager.set_page(self.title_page)
@@ -174,6 +285,11 @@ class DashrGame:
         self.title_page.refresh_splash()
 
     def _handle_escape_key(self, key):
+        # Leaving a level goes back to the page it was started from
+        if self.simulation is not None:
+            self.stop_simulation()
+            return
+
         current_page = self.page_manager.get_current_page()
         if current_page and current_page.id != "title":
             self.page_manager.go_back()
@@ -263,21 +379,147 @@ class DashrGame:
 
             self._handle_event(event)
 
+    def prefetch_level_tiles(self, level: Level):
+        # Starts decoding a level's tiles in the background, e.g. while it is
+        # selected in a menu, so starting it does not wait on the decode
+        self.loaded_tiles.prefetch(level.get_used_tile_ids())
+
+    def quick_play(self):
+        # Plays the most recently saved level in the user's levels directory
+        levels_dir = os.path.join(get_user_data_dir(), "levels")
+        paths = (
+            [
+                os.path.join(levels_dir, name)
+                for name in os.listdir(levels_dir)
+                if name.endswith(LEVEL_FILE_EXTENSION)
+            ]
+            if os.path.isdir(levels_dir)
+            else []
+        )
+        if not paths:
+            print(f"No levels found in {levels_dir}")
+            return
+
+        path = max(paths, key=os.path.getmtime)
+        try:
+            level = load_level(path)
+        except (OSError, ValueError) as e:
+            print(f"Failed to load level {path}: {e}")
+            return
+
+        self.start_simulation(level).add_player(LOCAL_PLAYER_ID)
+
+    def start_simulation(self, level: Level) -> Simulation:
+        self.stop_simulation()
+        self.simulation = Simulation(level)
+        self._tick_accumulator = 0.0
+        self.interpolation_alpha = 0.0
+
+        # Pack the level's tiles into one texture so rendering uses a single
+        # source, without decoding the rest of the tileset
+        self.tile_atlas = self._build_tile_atlas(level)
+        self.tilemap_renderer = TilemapRenderer(level, self.tile_atlas)
+        return self.simulation
+
+    def _build_tile_atlas(self, level: Level) -> TileAtlas:
+        tile_ids = [
+            tile_id
+            for tile_id in level.get_used_tile_ids()
+            if tile_id in self.loaded_tiles
+        ]
+        return TileAtlas({tile_id: self.loaded_tiles[tile_id] for tile_id in tile_ids})
+
+    def stop_simulation(self):
+        self.simulation = None
+
+        # Tiles decoded for the level start warm next launch
+        self.loaded_tiles.save_cache()
+        if self.tilemap_renderer is not None:
+            self.tilemap_renderer.close()
+            self.tilemap_renderer = None
+
+    def _update_simulation(self):
+        if self.simulation is None:
+            return
+
+        # Advance the simulation in fixed ticks using the last frame's duration, so
+        # physics is independent of the frame rate
+        self.simulation.set_input(
+            LOCAL_PLAYER_ID,
+            PlayerInput(
+                left=any(map(self.input_manager.is_key_pressed, PLAYER_LEFT_KEYS)),
+                right=any(map(self.input_manager.is_key_pressed, PLAYER_RIGHT_KEYS)),
+                jump=any(map(self.input_manager.is_key_pressed, PLAYER_JUMP_KEYS)),
+            ),
+        )
+
+        self._tick_accumulator += self.clock.get_time() / 1000.0
+        tick_duration = self.simulation.tick_duration
+
+        ticks = 0
+        while self._tick_accumulator >= tick_duration:
+            if ticks >= MAX_SIMULATION_TICKS_PER_FRAME:
+                self._tick_accumulator = 0.0
+                break
+            self.simulation.step()
+            self._tick_accumulator -= tick_duration
+            ticks += 1
+
+        # Renderers blend the previous and current tick with this factor
+        self.interpolation_alpha = self._tick_accumulator / tick_duration
+
     def _update(self):
+        # Pick up edited resource pack files
+        self._reload_changed_assets()
+
+        # Run the simulation ticks due this frame
+        self._update_simulation()
+
         # Update FPS tracking for FPS overlay
         self.debug_overlay.update_fps_tracking()
 
         # Update overlay versions in case they changed
         self.debug_overlay.set_versions(self.current_version, self.upstream_version)
 
+    def _render_world(self):
+        if self.simulation is None or self.tilemap_renderer is None:
+            return
+
+        world = self.world_target.begin(self.screen.get_size(), self.ui_scale)
+        world.fill(BACKGROUND_COLOR)
+
+        # Follow the first player, between ticks for smooth scrolling
+        self.camera.set_viewport_size(self.world_target.get_size())
+        self.camera.set_zoom(1.0)
+        if self.simulation.players:
+            player = self.simulation.players[min(self.simulation.players)]
+            x, y = player.get_interpolated_position(self.interpolation_alpha)
+            self.camera.set_position((x + player.width / 2, y + player.height / 2))
+
+        self.tilemap_renderer.render(world, self.camera)
+        self.world_target.present(self.screen)
+
     def _render(self):
+        # Static pages only push the regions that changed
+        if DIRTY_RECT_RENDERING and self.simulation is None:
+            self._render_dirty()
+            return
+
         # Clear screen
         self.screen.fill(BACKGROUND_COLOR)
 
-        # Render current page
-        self.page_manager.render_current_page(
-            self.screen, self.font, self.loaded_tiles, self.cursor_pos, self.ui_scale
-        )
+        # The level being played replaces the page, whose background would
+        # otherwise cover it
+        if self.simulation is not None:
+            self._render_world()
+        else:
+            self.page_manager.render_current_page(
+                self.screen,
+                self.font,
+                self.loaded_tiles,
+                self.cursor_pos,
+                self.ui_scale,
+            )
 
         # Render overlays
         self.overlay_manager.render_all(
@@ -286,6 +528,44 @@ class DashrGame:
 
         # Update display
         pygame.display.flip()
+        self._overlay_rects = None
+
+    def _render_dirty(self):
+        # A new page or window size redraws and flips everything
+        page = self.page_manager.get_current_page()
+        screen_size = self.screen.get_size()
+        full = (
+            page is not self._last_rendered_page
+            or screen_size != self._last_screen_size
+            or self._overlay_rects is None
+        )
+        self._last_rendered_page = page
+        self._last_screen_size = screen_size
+
+        # The page restores what the overlays covered last frame
+        damaged = [] if full else self._overlay_rects
+        if page is None:
+            self.screen.fill(BACKGROUND_COLOR)
+            page_rects = [self.screen.get_rect()]
+        else:
+            page_rects = self.page_manager.render_current_page_dirty(
+                self.screen,
+                self.font,
+                self.loaded_tiles,
+                self.cursor_pos,
+                self.ui_scale,
+                damaged,
+                full,
+            )
+        self._overlay_rects = self.overlay_manager.render_all(
+            self.screen, self.font, self.loaded_tiles, self.cursor_pos, self.ui_scale
+        )
+
+        screen_rect = self.screen.get_rect()
+        if full or self._overlay_rects is None or screen_rect in page_rects:
+            pygame.display.flip()
+        else:
+            pygame.display.update(page_rects + self._overlay_rects)
 
     def run(self):
         self.running = True
@@ -306,6 +586,7 @@ class DashrGame:
 
     def _cleanup(self):
         self.input_manager.stop()
+        self.loaded_tiles.close()
         pygame.quit()
 
 
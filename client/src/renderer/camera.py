@@ -0,0 +1,89 @@
+import math
+
+from client.src.constants import TILE_SIZE, CAMERA_MIN_ZOOM, CAMERA_MAX_ZOOM
+
+
+class Camera:
+    def __init__(
+        self,
+        viewport_size: tuple[int, int],
+        position: tuple[float, float] = (0.0, 0.0),
+        zoom: float = 1.0,
+        tile_size: int = TILE_SIZE,
+    ):
+        # Position is the world point, in tiles, shown at the viewport center.
+        # Zoom is screen pixels per world pixel, a tile is tile_size world pixels.
+        self.x, self.y = float(position[0]), float(position[1])
+        self.viewport_width, self.viewport_height = viewport_size
+        self.tile_size = tile_size
+        self.zoom = 1.0
+        self.set_zoom(zoom)
+
+    def set_viewport_size(self, size: tuple[int, int]):
+        self.viewport_width, self.viewport_height = size
+
+    def set_position(self, position: tuple[float, float]):
+        self.x, self.y = float(position[0]), float(position[1])
+
+    def move(self, dx: float, dy: float):
+        self.x += dx
+        self.y += dy
+
+    def set_zoom(self, zoom: float):
+        self.zoom = max(CAMERA_MIN_ZOOM, min(CAMERA_MAX_ZOOM, zoom))
+
+    def get_origin(self) -> tuple[float, float]:
+        # World position in pixels at 1x shown at the viewport's top-left corner.
+        # It is snapped to whole screen pixels so tiles do not shimmer while
+        # scrolling by fractions of a pixel.
+        scale = self.zoom
+        left = self.x * self.tile_size - self.viewport_width / (2 * scale)
+        top = self.y * self.tile_size - self.viewport_height / (2 * scale)
+        return (round(left * scale) / scale, round(top * scale) / scale)
+
+    def world_to_screen(self, position: tuple[float, float]) -> tuple[int, int]:
+        # Tile coordinates to viewport pixels
+        scale = self.zoom
+        origin_x, origin_y = self.get_origin()
+        return (
+            round((position[0] * self.tile_size - origin_x) * scale),
+            round((position[1] * self.tile_size - origin_y) * scale),
+        )
+
+    def screen_to_world(self, position: tuple[float, float]) -> tuple[float, float]:
+        # Viewport pixels to tile coordinates, e.g. for the cursor in the editor
+        scale = self.zoom
+        origin_x, origin_y = self.get_origin()
+        return (
+            (position[0] / scale + origin_x) / self.tile_size,
+            (position[1] / scale + origin_y) / self.tile_size,
+        )
+
+    def get_view_rect(self) -> tuple[float, float, float, float]:
+        # Visible area as (x, y, width, height) in tiles
+        scale = self.zoom
+        origin_x, origin_y = self.get_origin()
+        return (
+            origin_x / self.tile_size,
+            origin_y / self.tile_size,
+            self.viewport_width / scale / self.tile_size,
+            self.viewport_height / scale / self.tile_size,
+        )
+
+    def get_visible_tile_rect(self) -> tuple[int, int, int, int]:
+        # Inclusive (x0, y0, x1, y1) bounds of every tile at least partly visible
+        x, y, width, height = self.get_view_rect()
+        return (
+            math.floor(x),
+            math.floor(y),
+            math.ceil(x + width) - 1,
+            math.ceil(y + height) - 1,
+        )
+
+    def get_visible_chunk_keys(self, chunk_size: int) -> list[tuple[int, int]]:
+        x0, y0, x1, y1 = self.get_visible_tile_rect()
+        return [
+            (chunk_x, chunk_y)
+            for chunk_y in range(y0 // chunk_size, y1 // chunk_size + 1)
+            for chunk_x in range(x0 // chunk_size, x1 // chunk_size + 1)
+        ]
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from PIL import Image
+import pygame
+
+from client.src.asset.font.font import Font
+from client.src.constants import GLYPH_CACHE_SIZE
+
+# (kind, font cache id, glyph, size in pixels, color)
+GlyphKey = tuple
+
+
+def _to_surface(image: Image.Image) -> pygame.Surface:
+    # Only valid format literals for pygame.image.fromstring
+    if image.mode == "RGB":
+        return pygame.image.fromstring(image.tobytes(), image.size, "RGB")
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    return pygame.image.fromstring(image.tobytes(), image.size, "RGBA")
+
+
+class GlyphCache:
+    def __init__(self, max_size: int = GLYPH_CACHE_SIZE):
+        # Scaled, recoloured and converted glyph surfaces, most recently used
+        # last. Scales are quantized to the glyph's size in whole pixels, so
+        # animated text whose scale changes every frame still hits the cache
+        # while drawing exactly what an uncached scale would.
+        self.max_size = max_size
+        self._surfaces: OrderedDict[GlyphKey, pygame.Surface] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def _get(
+        self, key: GlyphKey, build: Callable[[], pygame.Surface]
+    ) -> pygame.Surface:
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = build()
+
+        # Surfaces built before a window exists stay unconverted
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        self._surfaces[key] = surface
+        while len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def get_character(
+        self, font: Font, char: str, scale: float, color: tuple[int, int, int]
+    ) -> Optional[pygame.Surface]:
+        # None when the font has no glyph for the character
+        character = font.characters.get(char)
+        if character is None:
+            return None
+
+        w, h = character.size
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        color = tuple(color[:3])
+
+        def build() -> pygame.Surface:
+            surface = _to_surface(character.image)
+            if size != surface.get_size():
+                surface = pygame.transform.scale(surface, size)
+
+            # Recolor every pixel to the specified color, preserving alpha
+            pixels = pygame.surfarray.pixels3d(surface)
+            pixels[:, :, :] = color
+            del pixels
+            return surface
+
+        return self._get(("char", font.cache_id, char, size, color), build)
+
+    def get_icon(
+        self, font: Font, icon_id: str, scale: float
+    ) -> Optional[pygame.Surface]:
+        # Icons keep their own colors and are scaled to the font size
+        icon = font.get_icon(icon_id)
+        if icon is None:
+            return None
+
+        size = max(1, round(font.size * scale))
+
+        def build() -> pygame.Surface:
+            return pygame.transform.scale(_to_surface(icon.image), (size, size))
+
+        return self._get(("icon", font.cache_id, icon_id, size), build)
+
+    def get_tofu(
+        self, size: float, scale: float, color: tuple[int, int, int]
+    ) -> pygame.Surface:
+        # Outlined box drawn in place of missing glyphs and icons
+        box_size = max(1, round(size * scale))
+        border = max(1, round(scale))
+        color = tuple(color[:3])
+
+        def build() -> pygame.Surface:
+            surface = pygame.Surface((box_size, box_size), pygame.SRCALPHA)
+            pygame.draw.rect(surface, color, surface.get_rect(), width=border)
+            return surface
+
+        return self._get(("tofu", box_size, border, color), build)
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def get_stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by every render_text call that does not pass its own cache
+GLYPH_CACHE = GlyphCache()
@@ -0,0 +1,70 @@
+from typing import Optional
+
+import pygame
+
+
+class RenderTarget:
+    def __init__(self, scale: int = 1):
+        # The world is drawn at 1x into a surface of window size / scale, then
+        # upscaled by a whole number so every sprite gets the same pixel grid
+        self.scale = max(1, int(scale))
+        self.surface: Optional[pygame.Surface] = None
+        self._upscaled: Optional[pygame.Surface] = None
+        self._window_size = (0, 0)
+
+    def begin(
+        self, window_size: tuple[int, int], scale: Optional[int] = None
+    ) -> pygame.Surface:
+        # Returns the low resolution surface to draw this frame's world into
+        if scale is not None:
+            scale = max(1, int(scale))
+            if scale != self.scale:
+                self.scale = scale
+                self.surface = None
+
+        if self.surface is None or window_size != self._window_size:
+            self._window_size = window_size
+
+            # Round up so the upscaled image always covers the whole window
+            size = (
+                -(-window_size[0] // self.scale),
+                -(-window_size[1] // self.scale),
+            )
+            self.surface = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                self.surface = self.surface.convert()
+            self._upscaled = None
+
+        return self.surface
+
+    def get_size(self) -> tuple[int, int]:
+        if self.surface is None:
+            return (0, 0)
+        return self.surface.get_size()
+
+    def present(self, screen: pygame.Surface, position: tuple[int, int] = (0, 0)):
+        # The single scale operation of the frame
+        if self.surface is None:
+            return
+
+        if self.scale == 1:
+            screen.blit(self.surface, position)
+            return
+
+        size = (
+            self.surface.get_width() * self.scale,
+            self.surface.get_height() * self.scale,
+        )
+        if position == (0, 0) and screen.get_size() == size:
+            pygame.transform.scale(self.surface, size, screen)
+            return
+
+        # Window sizes that are not a multiple of the scale need a cropped blit
+        if self._upscaled is None or self._upscaled.get_size() != size:
+            self._upscaled = pygame.Surface(size, 0, self.surface)
+        pygame.transform.scale(self.surface, size, self._upscaled)
+        screen.blit(self._upscaled, position)
+
+    def to_world_pixels(self, position: tuple[int, int]) -> tuple[int, int]:
+        # Window pixels to pixels on the low resolution surface, e.g. for cursors
+        return (position[0] // self.scale, position[1] // self.scale)
@@ -1,6 +1,9 @@
 import pygame
 
 from client.src.asset.tile.tile import AssetTile
+from client.src.asset.tile.tile_atlas import TileAtlas
+from client.src.renderer.camera import Camera
+from common.level.level import Level
 
 
 def render_tile(
@@ -9,11 +12,7 @@ def render_tile(
     position: tuple[int, int],
     scale: float = 1.0,
 ):
-    image = pygame.image.fromstring(tile.image.tobytes(), tile.image.size, "RGBA")
-    if scale != 1.0:
-        new_size = (int(image.get_width() * scale), int(image.get_height() * scale))
-        image = pygame.transform.scale(image, new_size)
-    surface.blit(image, position)
+    surface.blit(tile.get_scaled_surface(scale), position)
 
 
 def render_tiles(
@@ -22,5 +21,47 @@ def render_tiles(
     positions: list[tuple[int, int]],
     scale: float = 1.0,
 ):
-    for tile, position in zip(tiles, positions):
-        render_tile(surface, tile, position, scale)
+    surface.blits(
+        [
+            (tile.get_scaled_surface(scale), position)
+            for tile, position in zip(tiles, positions)
+        ],
+        doreturn=False,
+    )
+
+
+def render_atlas_tiles(
+    surface: pygame.Surface,
+    atlas: TileAtlas,
+    tile_ids: list[str],
+    positions: list[tuple[int, int]],
+    scale: float = 1.0,
+):
+    # Every tile is cut from the same atlas surface in a single blits call
+    source = atlas.get_surface(scale)
+    rects = atlas.get_rects(scale)
+    surface.blits(
+        [
+            (source, position, rects[tile_id])
+            for tile_id, position in zip(tile_ids, positions)
+            if tile_id in rects
+        ],
+        doreturn=False,
+    )
+
+
+def render_level_tiles(
+    surface: pygame.Surface,
+    atlas: TileAtlas,
+    level: Level,
+    camera: Camera,
+):
+    # Draws tile by tile, but only the tiles the camera can see
+    tiles = level.get_tiles_in_rect(*camera.get_visible_tile_rect())
+    render_atlas_tiles(
+        surface,
+        atlas,
+        [tile.id for tile in tiles],
+        [camera.world_to_screen(tile.position) for tile in tiles],
+        camera.zoom,
+    )
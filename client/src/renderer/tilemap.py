@@ -0,0 +1,202 @@
+from collections import OrderedDict
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+import pygame
+
+from client.src.asset.tile.tile_atlas import TileAtlas
+from client.src.renderer.camera import Camera
+from client.src.constants import TILE_SIZE, TILEMAP_CHUNK_CACHE_SIZE
+from common.level.level import Level
+
+
+class TilemapRenderer:
+    def __init__(
+        self,
+        level: Level,
+        atlas: TileAtlas,
+        tile_size: int = TILE_SIZE,
+        cache_size: int = TILEMAP_CHUNK_CACHE_SIZE,
+    ):
+        self.level = level
+        self.atlas = atlas
+        self.tile_size = tile_size
+        self.cache_size = cache_size
+
+        # Chunks are baked into a surface at 1x the first time they are visible,
+        # keyed by chunk key, least recently drawn first. A chunk without a
+        # surface is dirty and is baked again when it next comes into view.
+        self._chunk_surfaces: OrderedDict[tuple[int, int], pygame.Surface] = (
+            OrderedDict()
+        )
+
+        # Chunk surfaces scaled for the current scale only
+        self._scaled_surfaces: OrderedDict[tuple[int, int], pygame.Surface] = (
+            OrderedDict()
+        )
+        self._scaled_for = 1.0
+
+        # Atlas rect per registry type id, rebuilt when new types appear
+        self._type_rects: list[Optional[pygame.Rect]] = []
+
+        # Stats from the last render call
+        self.drawn_chunks = 0
+        self.baked_chunks = 0
+
+        level.add_listener(self._on_edit)
+
+    def _on_edit(self, position: tuple[int, int], old_type_id: int, new_type_id: int):
+        size = self.level.chunk_size
+        self.mark_dirty((position[0] // size, position[1] // size))
+
+    def mark_dirty(self, chunk_key: Optional[tuple[int, int]] = None):
+        # Without a key every chunk is re-baked, e.g. after the atlas changed.
+        # Nothing is baked here, only once the chunk is visible.
+        if chunk_key is None:
+            self._type_rects = []
+            self._chunk_surfaces.clear()
+            self._scaled_surfaces.clear()
+        else:
+            self._chunk_surfaces.pop(chunk_key, None)
+            self._scaled_surfaces.pop(chunk_key, None)
+
+    def mark_tiles_dirty(self, tile_ids: Iterable[str]):
+        # Re-bakes only the chunks that use the given tiles, e.g. after their
+        # images changed in the atlas
+        names = set(tile_ids)
+        type_ids = [
+            tile_type.type_id
+            for tile_type in self.level.registry.types
+            if tile_type is not None and tile_type.id in names
+        ]
+        if not type_ids:
+            return
+
+        self._type_rects = []
+        for chunk_key in self._chunk_surfaces.keys() | self._scaled_surfaces.keys():
+            chunk = self.level.chunks.get(chunk_key)
+            if chunk is None or np.isin(chunk.tiles, type_ids).any():
+                self.mark_dirty(chunk_key)
+
+    def close(self):
+        self.level.remove_listener(self._on_edit)
+
+    def _get_type_rects(self) -> list[Optional[pygame.Rect]]:
+        types = self.level.registry.types
+        if len(self._type_rects) != len(types):
+            rects = self.atlas.get_rects()
+            self._type_rects = [
+                rects.get(tile_type.id) if tile_type is not None else None
+                for tile_type in types
+            ]
+        return self._type_rects
+
+    def _bake_chunk(self, chunk_key: tuple[int, int]) -> Optional[pygame.Surface]:
+        chunk = self.level.chunks.get(chunk_key)
+        if chunk is None:
+            return None
+
+        size = chunk.size * self.tile_size
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        source = self.atlas.get_surface()
+        type_rects = self._get_type_rects()
+        local_ys, local_xs = np.nonzero(chunk.tiles)
+        blits = []
+        for local_x, local_y, type_id in zip(
+            local_xs.tolist(),
+            local_ys.tolist(),
+            chunk.tiles[local_ys, local_xs].tolist(),
+        ):
+            rect = type_rects[type_id]
+            if rect is not None:
+                blits.append(
+                    (
+                        source,
+                        (local_x * self.tile_size, local_y * self.tile_size),
+                        rect,
+                    )
+                )
+        surface.blits(blits, doreturn=False)
+
+        # Baked chunks are never drawn into again, and run-length encoding makes
+        # the mostly transparent ones much cheaper to blit
+        surface.set_alpha(255, pygame.RLEACCEL)
+        return surface
+
+    def _get_chunk_surface(
+        self, chunk_key: tuple[int, int]
+    ) -> Optional[pygame.Surface]:
+        surface = self._chunk_surfaces.get(chunk_key)
+        if surface is not None:
+            self._chunk_surfaces.move_to_end(chunk_key)
+            return surface
+
+        surface = self._bake_chunk(chunk_key)
+        if surface is not None:
+            self.baked_chunks += 1
+            self._chunk_surfaces[chunk_key] = surface
+        return surface
+
+    def _get_scaled_surface(
+        self, chunk_key: tuple[int, int], scale: float
+    ) -> Optional[pygame.Surface]:
+        if scale == 1.0:
+            return self._get_chunk_surface(chunk_key)
+
+        scaled = self._scaled_surfaces.get(chunk_key)
+        if scaled is not None:
+            self._scaled_surfaces.move_to_end(chunk_key)
+            return scaled
+
+        surface = self._get_chunk_surface(chunk_key)
+        if surface is None:
+            return None
+
+        # Chunk positions are rounded to whole screen pixels, so neighbours are
+        # floor or ceil of the exact size apart. Rounding the size up makes
+        # chunks overlap by at most a pixel instead of leaving seams.
+        size = math.ceil(surface.get_width() * scale)
+        scaled = pygame.transform.scale(surface, (size, size))
+        scaled.set_alpha(255, pygame.RLEACCEL)
+        self._scaled_surfaces[chunk_key] = scaled
+        return scaled
+
+    def _evict(self, cache: OrderedDict, keep: int):
+        # Drops the chunks drawn least recently, never the ones on screen
+        while len(cache) > max(self.cache_size, keep):
+            cache.popitem(last=False)
+
+    def render(self, target: pygame.Surface, camera: Camera):
+        # Only chunks inside the camera view are baked and blitted, so the cost
+        # does not depend on how much of the level is off-screen
+        scale = camera.zoom
+        if scale != self._scaled_for:
+            self._scaled_surfaces.clear()
+            self._scaled_for = scale
+
+        chunk_size = self.level.chunk_size
+        visible = camera.get_visible_chunk_keys(chunk_size)
+        self.baked_chunks = 0
+        blits = []
+        for chunk_key in visible:
+            surface = self._get_scaled_surface(chunk_key, scale)
+            if surface is None:
+                continue
+            blits.append(
+                (
+                    surface,
+                    camera.world_to_screen(
+                        (chunk_key[0] * chunk_size, chunk_key[1] * chunk_size)
+                    ),
+                )
+            )
+
+        self._evict(self._chunk_surfaces, len(visible))
+        self._evict(self._scaled_surfaces, len(visible))
+
+        self.drawn_chunks = len(blits)
+        target.blits(blits, doreturn=False)
@@ -0,0 +1,157 @@
+import os
+import time
+from typing import Optional
+
+import pygame
+
+from client.src.constants import PARALLAX_RESIZE_DEBOUNCE
+
+
+class ParallaxLayer:
+    def __init__(self, image: pygame.Surface, scroll_factor: float = 0.0):
+        # scroll_factor is how far the layer moves per pixel of background
+        # scroll: 0 stays put, 1 moves with the scroll, values between lag behind
+        self.image = image
+        self.scroll_factor = scroll_factor
+
+        # The image scaled to the window height and tiled wide enough that any
+        # scroll offset is a single blit
+        self._strip: Optional[pygame.Surface] = None
+        self._tile_width = 1
+        self._prepared_size: Optional[tuple[int, int]] = None
+        self._prepared_smooth = False
+
+    @classmethod
+    def from_file(
+        cls, path: str, scroll_factor: float = 0.0
+    ) -> Optional["ParallaxLayer"]:
+        if not os.path.isfile(path):
+            print(f"Background layer not found: {path}")
+            return None
+        return cls(pygame.image.load(path), scroll_factor)
+
+    def prepare(self, size: tuple[int, int], smooth: bool = True):
+        # Smooth scaling is the slow path, done once per window size. While a
+        # resize is still in progress the last smooth tile is scaled instead.
+        if self._prepared_size == size and (self._prepared_smooth or not smooth):
+            return
+
+        # Mid-resize, a strip that still covers the window is kept as it is
+        if (
+            not smooth
+            and self._strip is not None
+            and self._strip.get_width() - self._tile_width >= size[0]
+            and self._strip.get_height() >= size[1]
+        ):
+            return
+
+        width, height = self.image.get_size()
+        tile_size = (max(1, round(width * size[1] / height)), max(1, size[1]))
+        if smooth or self._strip is None:
+            source = self.image
+            if source.get_bitsize() not in (24, 32):
+                source = source.convert_alpha()
+            tile = pygame.transform.smoothscale(source, tile_size)
+        else:
+            last = self._strip.subsurface(
+                (0, 0, self._tile_width, self._strip.get_height())
+            )
+            tile = pygame.transform.scale(last, tile_size)
+
+        # Match the display format so every frame is a plain copy. The strip
+        # is created in the tile's format, so only the small tile is converted.
+        if pygame.display.get_surface() is not None:
+            if tile.get_flags() & pygame.SRCALPHA:
+                tile = tile.convert_alpha()
+            else:
+                tile = tile.convert()
+
+        columns = -(-size[0] // tile_size[0]) + 1
+        strip = pygame.Surface(
+            (columns * tile_size[0], tile_size[1]),
+            tile.get_flags() & pygame.SRCALPHA,
+            tile,
+        )
+        strip.blits(
+            [(tile, (column * tile_size[0], 0)) for column in range(columns)],
+            doreturn=False,
+        )
+
+        self._strip = strip
+        self._tile_width = tile_size[0]
+        self._prepared_size = size
+        self._prepared_smooth = smooth
+
+    def render(self, screen: pygame.Surface, scroll: float = 0.0):
+        if self._strip is None:
+            return
+        offset = int(scroll * self.scroll_factor) % self._tile_width
+        screen.blit(
+            self._strip,
+            (0, 0),
+            pygame.Rect(offset, 0, screen.get_width(), screen.get_height()),
+        )
+
+
+class ParallaxBackground:
+    def __init__(
+        self,
+        layers: list[ParallaxLayer],
+        color: tuple[int, int, int] = (0, 0, 0),
+        resize_debounce: float = PARALLAX_RESIZE_DEBOUNCE,
+    ):
+        # Layers are drawn back to front. One instance can be shared by every
+        # page that uses the same background, so it is only scaled once.
+        self.layers = layers
+        self.color = color
+        self.resize_debounce = resize_debounce
+
+        self._size: Optional[tuple[int, int]] = None
+        self._pending_size: Optional[tuple[int, int]] = None
+        self._resize_time = 0.0
+
+    @classmethod
+    def from_files(
+        cls,
+        layers: list[tuple[str, float]],
+        directory: str = "",
+        color: tuple[int, int, int] = (0, 0, 0),
+    ) -> "ParallaxBackground":
+        # (file name, scroll factor) pairs. Missing files are skipped, so the
+        # background degrades to a plain color instead of failing to start.
+        loaded = []
+        for filename, scroll_factor in layers:
+            layer = ParallaxLayer.from_file(
+                os.path.join(directory, filename), scroll_factor
+            )
+            if layer is not None:
+                loaded.append(layer)
+        return cls(loaded, color)
+
+    def _update_size(self, size: tuple[int, int]):
+        if size == self._size:
+            return
+
+        # Dragging a window edge changes the size every frame, so the smooth
+        # scale waits until the size has settled
+        now = time.monotonic()
+        if size != self._pending_size:
+            self._pending_size = size
+            self._resize_time = now
+        smooth = self._size is None or now - self._resize_time >= self.resize_debounce
+        if smooth:
+            self._size = size
+
+        for layer in self.layers:
+            layer.prepare(size, smooth)
+
+    def render(self, screen: pygame.Surface, scroll: float = 0.0):
+        if screen.get_width() <= 0 or screen.get_height() <= 0:
+            return
+        self._update_size(screen.get_size())
+
+        # The back layer covers the screen unless it is transparent
+        if not self.layers or self.layers[0].image.get_flags() & pygame.SRCALPHA:
+            screen.fill(self.color)
+        for layer in self.layers:
+            layer.render(screen, scroll)
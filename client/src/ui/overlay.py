@@ -32,9 +32,13 @@ class Overlay:
         loaded_tiles: dict[str, AssetTile],
         cursor_pos: tuple[int, int],
         ui_scale: int,
-    ):
+    ) -> Optional[pygame.Rect]:
+        # Returns the area drawn, or None when the overlay does not know it
         if self.enabled:
-            self._render_content(screen, font, loaded_tiles, cursor_pos, ui_scale)
+            return self._render_content(
+                screen, font, loaded_tiles, cursor_pos, ui_scale
+            )
+        return None
 
     def _render_content(
         self,
@@ -43,5 +47,5 @@ class Overlay:
         loaded_tiles: dict[str, AssetTile],
         cursor_pos: tuple[int, int],
         ui_scale: int,
-    ):
+    ) -> Optional[pygame.Rect]:
         pass
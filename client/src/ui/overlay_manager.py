@@ -60,11 +60,19 @@ class OverlayManager:
         loaded_tiles: dict[str, AssetTile],
         cursor_pos: tuple[int, int],
         ui_scale: int,
-    ):
+    ) -> Optional[list[pygame.Rect]]:
+        # Returns the areas drawn by enabled overlays, or None if any of them
+        # could not tell, in which case the whole screen has to be updated
+        rects: Optional[list[pygame.Rect]] = []
         for overlay_id in self.render_order:
             overlay = self.overlays.get(overlay_id)
             if overlay:
-                overlay.render(screen, font, loaded_tiles, cursor_pos, ui_scale)
+                rect = overlay.render(screen, font, loaded_tiles, cursor_pos, ui_scale)
+                if rect is not None and rects is not None:
+                    rects.append(rect)
+                elif overlay.enabled:
+                    rects = None
+        return rects
 
     def get_enabled_overlays(self) -> list[Overlay]:
         return [overlay for overlay in self.overlays.values() if overlay.enabled]
@@ -48,7 +48,7 @@ class DebugOverlay(Overlay):
         loaded_tiles,
         cursor_pos: tuple[int, int],
         ui_scale: int,
-    ):
+    ) -> Optional[pygame.Rect]:
         current_fps = self.clock.get_fps()
         fps_values = [fps for _, fps in self.fps_history if fps > 0]
 
@@ -160,4 +160,5 @@ class DebugOverlay(Overlay):
 
         # Blit cached surface to screen at calculated position
         if self._cached_surface:
-            screen.blit(self._cached_surface, (box_x, box_y))
+            return screen.blit(self._cached_surface, (box_x, box_y))
+        return None
@@ -11,11 +11,19 @@ class Page:
         id: str,
         always_reinitialize: bool = False,
         reinit_callback: Optional[Callable] = None,
+        static: bool = False,
     ):
         self.id = id
         self.always_reinitialize = always_reinitialize
         self.reinit_callback = reinit_callback
 
+        # Static pages look the same every frame until the window, UI scale or
+        # font changes, so dirty-rect rendering draws them once and afterwards
+        # only restores the areas other things were drawn over
+        self.static = static
+        self._static_surface: Optional[pygame.Surface] = None
+        self._static_key: Optional[tuple] = None
+
     def handle_click(self, click_pos: tuple[int, int], button_no: int):
         pass
 
@@ -28,3 +36,33 @@ class Page:
         ui_scale: int,
     ):
         pass
+
+    def render_dirty(
+        self,
+        screen: pygame.Surface,
+        font: Font,
+        loaded_tiles: dict[str, AssetTile],
+        cursor_pos: tuple[int, int],
+        ui_scale: int,
+        damaged: list[pygame.Rect],
+        full: bool = False,
+    ) -> list[pygame.Rect]:
+        # Redraws what changed since the last call, plus the damaged areas, and
+        # returns the regions of the screen that were drawn. Pages that are not
+        # static are drawn in full every frame.
+        key = (screen.get_size(), ui_scale, id(font))
+        if (
+            full
+            or not self.static
+            or self._static_surface is None
+            or self._static_key != key
+        ):
+            self.render(screen, font, loaded_tiles, cursor_pos, ui_scale)
+            if self.static:
+                self._static_surface = screen.copy()
+                self._static_key = key
+            return [screen.get_rect()]
+
+        for rect in damaged:
+            screen.blit(self._static_surface, rect, rect)
+        return list(damaged)
@@ -49,3 +49,19 @@ class PageManager:
     ):
         if self.current_page:
             self.current_page.render(screen, font, loaded_tiles, cursor_pos, ui_scale)
+
+    def render_current_page_dirty(
+        self,
+        screen: pygame.Surface,
+        font: Font,
+        loaded_tiles: dict[str, AssetTile],
+        cursor_pos: tuple[int, int],
+        ui_scale: int,
+        damaged: list[pygame.Rect],
+        full: bool = False,
+    ) -> list[pygame.Rect]:
+        if self.current_page:
+            return self.current_page.render_dirty(
+                screen, font, loaded_tiles, cursor_pos, ui_scale, damaged, full
+            )
+        return []
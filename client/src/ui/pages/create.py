@@ -7,7 +7,7 @@ from client.src.asset.tile.tile import AssetTile
 
 class CreatePage(Page):
     def __init__(self):
-        super().__init__("create")
+        super().__init__("create", static=True)
 
     def render(
         self,
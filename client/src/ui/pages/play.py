@@ -1,4 +1,6 @@
 import pygame
+from typing import Callable, Optional
+
 from client.src.ui.page import Page
 from client.src.renderer.text import render_text
 from client.src.asset.font.font import Font
@@ -6,8 +8,21 @@ from client.src.asset.tile.tile import AssetTile
 
 
 class PlayPage(Page):
-    def __init__(self):
-        super().__init__("play")
+    def __init__(self, on_quick_play: Optional[Callable] = None):
+        super().__init__("play", static=True)
+        self.on_quick_play = on_quick_play
+
+        # Screen area of the Quick Play entry, set while rendering
+        self._quick_play_rect: Optional[pygame.Rect] = None
+
+    def handle_click(self, click_pos: tuple[int, int], button_no: int):
+        if (
+            button_no == 1
+            and self.on_quick_play is not None
+            and self._quick_play_rect is not None
+            and self._quick_play_rect.collidepoint(click_pos)
+        ):
+            self.on_quick_play()
 
     def render(
         self,
@@ -56,6 +71,10 @@ class PlayPage(Page):
             render_text(
                 screen, line, font, (line_x, line_y), content_scale, content_color
             )
+            if line == "- Quick Play":
+                self._quick_play_rect = pygame.Rect(
+                    line_x, line_y, line_width, line_height
+                )
 
         # Render back instruction
         instruction_text = "Press ESC to go back"
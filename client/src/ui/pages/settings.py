@@ -7,7 +7,7 @@ from client.src.asset.tile.tile import AssetTile
 
 class SettingsPage(Page):
     def __init__(self):
-        super().__init__("settings")
+        super().__init__("settings", static=True)
 
     def render(
         self,
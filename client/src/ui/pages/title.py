@@ -10,6 +10,7 @@ from client.src.asset.font.font import Font
 from client.src.asset.tile.tile import AssetTile
 from client.src.ui.page import Page
 from client.src.ui.components.button import Button
+from client.src.ui.components.parallax import ParallaxBackground
 from client.src.constants import *
 
 
@@ -18,6 +19,7 @@ class Title(Page):
         self,
         no_splash_effect: bool = False,
         button_callbacks: Optional[dict[str, Callable]] = None,
+        background: Optional[ParallaxBackground] = None,
     ):
         super().__init__("title")
 
@@ -25,20 +27,21 @@ class Title(Page):
         self.no_splash_effect = no_splash_effect
         self.animation_start_time = time.time()
 
-        # Load the parallax background image
-        self.background_image = pygame.image.load(
-            os.path.join("client", "assets", "ui", "backgrounds", "title_bg.png")
-        ).convert()
+        # Parallax background, possibly shared with other pages
+        self.background = (
+            background
+            if background is not None
+            else ParallaxBackground.from_files(
+                TITLE_BACKGROUND_LAYERS,
+                os.path.join("client", "assets", "ui", "backgrounds"),
+            )
+        )
 
         # Cache for rendered text surfaces to avoid recalculating every frame
         self._cached_title_surface = None
         self._cached_subtitle_surface = None
         self._last_ui_scale = None
 
-        # Cache for scaled background image
-        self._cached_background_surface = None
-        self._last_screen_dimensions = None
-
         # Cache for instruction text
         self._cached_instruction_surface = None
 
@@ -85,10 +88,6 @@ class Title(Page):
         self._cached_subtitle_surface = None
         self._cached_instruction_surface = None
 
-    def _clear_background_cache(self):
-        self._cached_background_surface = None
-        self._last_screen_dimensions = None
-
     def update_buttons(self, cursor_pos: tuple[int, int], ui_scale: int):
         for button in self.buttons:
             button.update(cursor_pos, ui_scale)
@@ -156,23 +155,14 @@ class Title(Page):
         cursor_pos: tuple[int, int],
         ui_scale: int,
     ):
-        screen.fill((0, 0, 0))
-
         screen_width = screen.get_width()
         screen_height = screen.get_height()
-        current_screen_dimensions = (screen_width, screen_height)
-
-        # Cache scaled background if screen dimensions changed
-        if (
-            self._last_screen_dimensions != current_screen_dimensions
-            or self._cached_background_surface is None
-        ):
-            self._last_screen_dimensions = current_screen_dimensions
-            self._cached_background_surface = pygame.transform.smoothscale(
-                self.background_image, current_screen_dimensions
-            )
 
-        screen.blit(self._cached_background_surface, (0, 0))
+        # Background layers drift at their own speeds
+        scroll = (time.time() - self.animation_start_time) * (
+            TITLE_BACKGROUND_SCROLL_SPEED * ui_scale
+        )
+        self.background.render(screen, scroll)
 
         # Cache title and subtitle surfaces if UI scale changed
         if self._last_ui_scale != ui_scale:
@@ -0,0 +1,175 @@
+import re
+import weakref
+from typing import Optional
+
+import numpy as np
+
+from common.level.chunk import EMPTY_TILE
+from common.level.level import Level
+from common.level.tile_type import TileTypeRegistry, TILE_TYPES
+
+# Sides of a tile, set in the mask when the side is exposed, i.e. the
+# neighbour on that side is not part of the same autotile group
+EDGE_TOP = 1
+EDGE_LEFT = 2
+EDGE_RIGHT = 4
+EDGE_BOTTOM = 8
+
+# Exposed sides mask -> variant suffix used by the tileset names, e.g.
+# tile_blue_top_left_bottom has a border on its top, left and bottom edges
+AUTOTILE_VARIANTS: dict[int, str] = {
+    0: "center",
+    EDGE_TOP: "top",
+    EDGE_LEFT: "left",
+    EDGE_RIGHT: "right",
+    EDGE_BOTTOM: "bottom",
+    EDGE_TOP | EDGE_LEFT: "top_left",
+    EDGE_TOP | EDGE_RIGHT: "top_right",
+    EDGE_BOTTOM | EDGE_LEFT: "bottom_left",
+    EDGE_BOTTOM | EDGE_RIGHT: "bottom_right",
+    EDGE_TOP | EDGE_BOTTOM: "top_bottom",
+    EDGE_LEFT | EDGE_RIGHT: "left_right",
+    EDGE_TOP | EDGE_LEFT | EDGE_BOTTOM: "top_left_bottom",
+    EDGE_TOP | EDGE_RIGHT | EDGE_BOTTOM: "top_right_bottom",
+    EDGE_TOP | EDGE_LEFT | EDGE_RIGHT: "top_left_right",
+    EDGE_BOTTOM | EDGE_LEFT | EDGE_RIGHT: "bottom_left_right",
+    EDGE_TOP | EDGE_LEFT | EDGE_RIGHT | EDGE_BOTTOM: "full",
+}
+
+_VARIANT_PATTERN = re.compile(
+    "^(.+?)_(" + "|".join(sorted(AUTOTILE_VARIANTS.values(), key=len)[::-1]) + ")$"
+)
+
+
+class Autotiler:
+    def __init__(self, registry: Optional[TileTypeRegistry] = None):
+        self.registry = registry if registry is not None else TILE_TYPES
+
+        # Group names, e.g. "tile_blue", indexed by group id (0 is no group)
+        self.groups: list[Optional[str]] = [None]
+
+        # type id -> group id, and [group id, exposed mask] -> type id
+        self._group_table = np.zeros(1, dtype=np.uint16)
+        self._variant_table = np.zeros((1, len(AUTOTILE_VARIANTS)), dtype=np.uint16)
+        self._registry_size = 0
+
+        # Set while the autotiler edits a level, so its own edits are not
+        # retiled again by the listener
+        self._editing = False
+        # Level -> its edit listener. Weak, so a level that is dropped without
+        # detaching (e.g. a closed editor session) is not kept alive by this.
+        self._attached: weakref.WeakKeyDictionary[Level, object] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _refresh(self):
+        # Tables are rebuilt whenever new types were interned into the registry
+        if self._registry_size == len(self.registry):
+            return
+        self._registry_size = len(self.registry)
+
+        variants: dict[str, dict[str, int]] = {}
+        for tile_type in self.registry.types[1:]:
+            match = _VARIANT_PATTERN.match(tile_type.id)  # type: ignore
+            if match is not None:
+                variants.setdefault(match.group(1), {})[
+                    match.group(2)
+                ] = tile_type.type_id  # type: ignore
+
+        # Only groups that provide every variant can be autotiled
+        groups = [
+            name
+            for name, found in variants.items()
+            if len(found) == len(AUTOTILE_VARIANTS)
+        ]
+
+        self.groups = [None] + groups
+        self._group_table = np.zeros(len(self.registry.types), dtype=np.uint16)
+        self._variant_table = np.zeros(
+            (len(self.groups), len(AUTOTILE_VARIANTS)), dtype=np.uint16
+        )
+        for group_id, name in enumerate(groups, start=1):
+            for mask, variant in AUTOTILE_VARIANTS.items():
+                type_id = variants[name][variant]
+                self._group_table[type_id] = group_id
+                self._variant_table[group_id, mask] = type_id
+
+    def get_group(self, type_id: int) -> Optional[str]:
+        self._refresh()
+        if not 0 <= type_id < len(self._group_table):
+            return None
+        return self.groups[int(self._group_table[type_id])]
+
+    def get_variant(self, group: str, mask: int) -> int:
+        # Type id of a group's variant for a mask of exposed sides
+        self._refresh()
+        if group not in self.groups:
+            raise ValueError(f"Unknown autotile group: {group}")
+        return int(self._variant_table[self.groups.index(group), mask])
+
+    def compute_masks(self, padded_grid: np.ndarray) -> np.ndarray:
+        # Exposed sides of every cell inside a [y, x] type grid that carries a
+        # one tile border of neighbours on each side
+        self._refresh()
+        groups = self._group_table[padded_grid]
+        center = groups[1:-1, 1:-1]
+
+        masks = np.zeros(center.shape, dtype=np.uint8)
+        masks |= (groups[:-2, 1:-1] != center).astype(np.uint8) * EDGE_TOP
+        masks |= (groups[1:-1, :-2] != center).astype(np.uint8) * EDGE_LEFT
+        masks |= (groups[1:-1, 2:] != center).astype(np.uint8) * EDGE_RIGHT
+        masks |= (groups[2:, 1:-1] != center).astype(np.uint8) * EDGE_BOTTOM
+        return masks
+
+    def autotile_padded(self, padded_grid: np.ndarray) -> np.ndarray:
+        # Retiles the inside of a padded grid; tiles outside any group are kept
+        masks = self.compute_masks(padded_grid)
+        inner = padded_grid[1:-1, 1:-1]
+        groups = self._group_table[inner]
+        return np.where(groups != 0, self._variant_table[groups, masks], inner).astype(
+            np.uint16
+        )
+
+    def autotile_grid(self, grid: np.ndarray) -> np.ndarray:
+        # Cells outside the grid count as empty, so borders are exposed
+        return self.autotile_padded(np.pad(grid, 1, constant_values=EMPTY_TILE))
+
+    def autotile_level(self, level: Level) -> int:
+        # Retiles the whole level, returns the number of tiles that changed
+        grid = level.get_type_grid()
+        return self._apply(level, 0, 0, self.autotile_grid(grid))
+
+    def autotile_around(self, level: Level, position: tuple[int, int]) -> int:
+        # A single edit can only change the variants of the tile itself and its
+        # direct neighbours, so only that 3x3 block is recomputed
+        x, y = position
+        padded = level.get_region(x - 2, y - 2, 5, 5)
+        return self._apply(level, x - 1, y - 1, self.autotile_padded(padded))
+
+    def _apply(self, level: Level, x0: int, y0: int, grid: np.ndarray) -> int:
+        self._editing = True
+        try:
+            return level.set_region(x0, y0, grid)
+        finally:
+            self._editing = False
+
+    def attach(self, level: Level):
+        # Keeps the level autotiled as tiles are placed and removed
+        if level in self._attached:
+            return
+
+        # The listener must not hold the level, or the weak key never expires
+        level_ref = weakref.ref(level)
+
+        def on_edit(position: tuple[int, int], old_type_id: int, new_type_id: int):
+            edited = level_ref()
+            if edited is not None and not self._editing:
+                self.autotile_around(edited, position)
+
+        self._attached[level] = on_edit
+        level.add_listener(on_edit)
+
+    def detach(self, level: Level):
+        listener = self._attached.pop(level, None)
+        if listener is not None:
+            level.remove_listener(listener)  # type: ignore
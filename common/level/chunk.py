@@ -0,0 +1,45 @@
+import numpy as np
+
+
+# Chunks are square blocks of tiles, stored as a compact grid of tile type ids
+CHUNK_SIZE = 32
+
+# Type id used for cells that have no tile in them
+EMPTY_TILE = 0
+
+
+class Chunk:
+    def __init__(self, chunk_x: int, chunk_y: int, size: int = CHUNK_SIZE):
+        self.chunk_x = chunk_x
+        self.chunk_y = chunk_y
+        self.size = size
+
+        # Grid of tile type ids, indexed as [local_y, local_x]
+        self.tiles = np.zeros((size, size), dtype=np.uint16)
+
+        # Number of non-empty cells, so empty chunks can be dropped cheaply
+        self.count = 0
+
+    def get_origin(self) -> tuple[int, int]:
+        return (self.chunk_x * self.size, self.chunk_y * self.size)
+
+    def get(self, local_x: int, local_y: int) -> int:
+        return int(self.tiles[local_y, local_x])
+
+    def set(self, local_x: int, local_y: int, type_id: int) -> int:
+        # Returns the type id that was previously stored in the cell
+        old_type_id = int(self.tiles[local_y, local_x])
+        if old_type_id == type_id:
+            return old_type_id
+
+        self.tiles[local_y, local_x] = type_id
+
+        if old_type_id == EMPTY_TILE:
+            self.count += 1
+        elif type_id == EMPTY_TILE:
+            self.count -= 1
+
+        return old_type_id
+
+    def is_empty(self) -> bool:
+        return self.count == 0
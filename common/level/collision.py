@@ -0,0 +1,190 @@
+import numpy as np
+
+from common.level.tile_type import (
+    TileTypeRegistry,
+    FLAG_SOLID,
+    FLAG_KILL,
+    FLAG_BOOST,
+    FLAG_FINISH,
+    FLAG_CHECKPOINT,
+)
+
+# Tile flags that get their own precomputed boolean grid
+COLLISION_FLAGS = (FLAG_SOLID, FLAG_KILL, FLAG_BOOST, FLAG_FINISH, FLAG_CHECKPOINT)
+
+
+class CollisionGrids:
+    def __init__(self, type_grid: np.ndarray, registry: TileTypeRegistry):
+        # All grids are indexed as [y, x] in tile coordinates starting at (0, 0).
+        # The arrays may be larger than width x height so edits that grow the
+        # level do not have to reallocate them every time.
+        self.registry = registry
+        self.height, self.width = type_grid.shape
+
+        self.flags = registry.get_flags_table()[type_grid]
+        self.boost = registry.get_boost_table()[type_grid]
+
+        self.grids: dict[int, np.ndarray] = {
+            flag: (self.flags & flag) != 0 for flag in COLLISION_FLAGS
+        }
+        self._summed_area_tables: dict[int, np.ndarray] = {}
+
+    def get_grid(self, flag: int) -> np.ndarray:
+        grid = self.grids.get(flag)
+        if grid is None:
+            # Combined or uncommon flags are computed on demand
+            grid = (self.flags & flag) != 0
+            self.grids[flag] = grid
+        return grid[: self.height, : self.width]
+
+    def resize(self, width: int, height: int):
+        capacity_height, capacity_width = self.flags.shape
+        if width > capacity_width or height > capacity_height:
+            # Grow geometrically so repeated edits at the edge stay cheap
+            shape = (
+                (
+                    max(height, capacity_height * 2)
+                    if height > capacity_height
+                    else capacity_height
+                ),
+                (
+                    max(width, capacity_width * 2)
+                    if width > capacity_width
+                    else capacity_width
+                ),
+            )
+            self.flags = self._grow(self.flags, shape)
+            self.boost = self._grow(self.boost, shape)
+            self.grids = {
+                flag: self._grow(grid, shape) for flag, grid in self.grids.items()
+            }
+
+        self.width = width
+        self.height = height
+        self._summed_area_tables.clear()
+
+    def _grow(self, array: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+        grown = np.zeros(shape, dtype=array.dtype)
+        grown[: array.shape[0], : array.shape[1]] = array
+        return grown
+
+    def set_cell(self, x: int, y: int, type_id: int):
+        # Cells past width x height are still written so a level that shrinks
+        # and grows again never exposes stale data
+        capacity_height, capacity_width = self.flags.shape
+        if not (0 <= x < capacity_width and 0 <= y < capacity_height):
+            return
+
+        flags = self.registry.get_flags_table()[type_id]
+        self.flags[y, x] = flags
+        self.boost[y, x] = self.registry.get_boost_table()[type_id]
+        for flag, grid in self.grids.items():
+            grid[y, x] = (flags & flag) != 0
+        self._summed_area_tables.clear()
+
+    def set_cells(self, xs: np.ndarray, ys: np.ndarray, type_ids: np.ndarray):
+        # Vectorized set_cell for many cells at once
+        capacity_height, capacity_width = self.flags.shape
+        inside = (xs >= 0) & (xs < capacity_width) & (ys >= 0) & (ys < capacity_height)
+        xs, ys, type_ids = xs[inside], ys[inside], type_ids[inside]
+
+        flags = self.registry.get_flags_table()[type_ids]
+        self.flags[ys, xs] = flags
+        self.boost[ys, xs] = self.registry.get_boost_table()[type_ids]
+        for flag, grid in self.grids.items():
+            grid[ys, xs] = (flags & flag) != 0
+        self._summed_area_tables.clear()
+
+    def _to_cells(self, positions) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Converts N (x, y) world positions into the tile indices of the ones
+        # inside the grid, plus the in-bounds mask over all N
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        cells = np.floor(positions).astype(np.int64)
+        xs = cells[:, 0]
+        ys = cells[:, 1]
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        return xs[inside], ys[inside], inside
+
+    def test_points(self, flag: int, positions) -> np.ndarray:
+        # Only cells inside the grid are indexed, so empty levels never throw
+        xs, ys, inside = self._to_cells(positions)
+        result = np.zeros(len(inside), dtype=bool)
+        result[inside] = self.get_grid(flag)[ys, xs]
+        return result
+
+    def get_flags_at_points(self, positions) -> np.ndarray:
+        xs, ys, inside = self._to_cells(positions)
+        result = np.zeros(len(inside), dtype=np.uint8)
+        result[inside] = self.flags[ys, xs]
+        return result
+
+    def get_boost_at_points(self, positions) -> np.ndarray:
+        xs, ys, inside = self._to_cells(positions)
+        result = np.zeros(len(inside), dtype=np.float32)
+        result[inside] = self.boost[ys, xs]
+        return result
+
+    def _clip_rect(
+        self, x0: int, y0: int, x1: int, y1: int
+    ) -> tuple[int, int, int, int]:
+        # Converts inclusive tile bounds into clipped half-open slice bounds
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        return (
+            max(x0, 0),
+            max(y0, 0),
+            min(x1 + 1, self.width),
+            min(y1 + 1, self.height),
+        )
+
+    def any_in_rect(self, flag: int, x0: int, y0: int, x1: int, y1: int) -> bool:
+        left, top, right, bottom = self._clip_rect(x0, y0, x1, y1)
+        if left >= right or top >= bottom:
+            return False
+        return bool(self.get_grid(flag)[top:bottom, left:right].any())
+
+    def count_in_rect(self, flag: int, x0: int, y0: int, x1: int, y1: int) -> int:
+        left, top, right, bottom = self._clip_rect(x0, y0, x1, y1)
+        if left >= right or top >= bottom:
+            return 0
+        return int(np.count_nonzero(self.get_grid(flag)[top:bottom, left:right]))
+
+    def any_in_box(
+        self, flag: int, x: float, y: float, width: float, height: float
+    ) -> bool:
+        # Tests a world-space box (e.g. an entity AABB) against every tile it overlaps
+        x0 = int(np.floor(x))
+        y0 = int(np.floor(y))
+        x1 = int(np.ceil(x + width)) - 1
+        y1 = int(np.ceil(y + height)) - 1
+        if x1 < x0 or y1 < y0:
+            return False
+        return self.any_in_rect(flag, x0, y0, x1, y1)
+
+    def any_in_boxes(self, flag: int, boxes) -> np.ndarray:
+        # Tests N (x, y, width, height) boxes at once using a summed-area table,
+        # so every box costs four lookups regardless of its size
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        table = self._get_summed_area_table(flag)
+
+        x0 = np.clip(np.floor(boxes[:, 0]).astype(np.int64), 0, self.width)
+        y0 = np.clip(np.floor(boxes[:, 1]).astype(np.int64), 0, self.height)
+        x1 = np.clip(np.ceil(boxes[:, 0] + boxes[:, 2]).astype(np.int64), 0, self.width)
+        y1 = np.clip(
+            np.ceil(boxes[:, 1] + boxes[:, 3]).astype(np.int64), 0, self.height
+        )
+
+        x1 = np.maximum(x1, x0)
+        y1 = np.maximum(y1, y0)
+        counts = table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+        return counts > 0
+
+    def _get_summed_area_table(self, flag: int) -> np.ndarray:
+        table = self._summed_area_tables.get(flag)
+        if table is None:
+            table = np.zeros((self.height + 1, self.width + 1), dtype=np.int32)
+            table[1:, 1:] = self.get_grid(flag).cumsum(axis=0).cumsum(axis=1)
+            self._summed_area_tables[flag] = table
+        return table
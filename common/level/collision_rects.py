@@ -0,0 +1,219 @@
+from typing import Optional
+
+import numpy as np
+
+# Size in tiles of the buckets used to index merged rects
+RECT_BUCKET_SIZE = 8
+
+# Rects are (x, y, width, height) in tile coordinates
+Rect = tuple[int, int, int, int]
+
+
+def _row_runs(row: np.ndarray) -> list[tuple[int, int]]:
+    # Returns half-open (start, end) runs of True cells in a boolean row
+    padded = np.concatenate(([False], row, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+
+def merge_rects(grid: np.ndarray) -> list[Rect]:
+    # Greedy meshing: every row is split into horizontal runs, and a run is
+    # merged into the rect above it when that rect spans exactly the same
+    # columns. Large solid blocks collapse into a handful of rects.
+    rects: list[list[int]] = []
+    open_rects: dict[tuple[int, int], int] = {}
+
+    for y in range(grid.shape[0]):
+        next_open: dict[tuple[int, int], int] = {}
+        for run in _row_runs(grid[y]):
+            index = open_rects.get(run)
+            if index is not None:
+                rects[index][3] += 1
+            else:
+                index = len(rects)
+                rects.append([run[0], y, run[1] - run[0], 1])
+            next_open[run] = index
+        open_rects = next_open
+
+    return [(x, y, w, h) for x, y, w, h in rects]
+
+
+def merge_cells(xs: np.ndarray, ys: np.ndarray) -> list[Rect]:
+    # Same greedy meshing as merge_rects, but over a sparse set of (x, y)
+    # cells, so cells far apart do not need a dense grid between them
+    order = np.lexsort((xs, ys))
+    xs = xs[order]
+    ys = ys[order]
+
+    # Split the sorted cells into horizontal runs of consecutive x
+    breaks = np.flatnonzero((np.diff(xs) != 1) | (np.diff(ys) != 0)) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(xs)]))
+
+    rects: list[list[int]] = []
+    open_rects: dict[tuple[int, int], int] = {}
+    next_open: dict[tuple[int, int], int] = {}
+    row = None
+
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        y = int(ys[start])
+        if y != row:
+            # Rects only continue into the row directly below them
+            open_rects = next_open if row is not None and y == row + 1 else {}
+            next_open = {}
+            row = y
+
+        run = (int(xs[start]), int(xs[end - 1]) + 1)
+        index = open_rects.get(run)
+        if index is not None:
+            rects[index][3] += 1
+        else:
+            index = len(rects)
+            rects.append([run[0], y, run[1] - run[0], 1])
+        next_open[run] = index
+
+    return [(x, y, w, h) for x, y, w, h in rects]
+
+
+class CollisionRects:
+    def __init__(self, rects: list[Rect], bucket_size: int = RECT_BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self._reset(rects)
+
+    def _reset(self, rects: list[Rect]):
+        # Removed rects leave a None behind so the indices in the buckets stay
+        # valid. Each rect is listed in every bucket it overlaps, and in a row
+        # index per bucket row so edits can find the rects crossing a row.
+        self._rects: list[Optional[Rect]] = []
+        self._buckets: dict[tuple[int, int], list[int]] = {}
+        self._rows: dict[int, set[int]] = {}
+        self._count = 0
+        for rect in rects:
+            self._add(rect)
+
+    @property
+    def rects(self) -> list[Rect]:
+        return [rect for rect in self._rects if rect is not None]
+
+    def _get_bucket_range(self, rect: Rect) -> tuple[range, range]:
+        x, y, w, h = rect
+        size = self.bucket_size
+        return (
+            range(x // size, (x + w - 1) // size + 1),
+            range(y // size, (y + h - 1) // size + 1),
+        )
+
+    def _add(self, rect: Rect):
+        index = len(self._rects)
+        self._rects.append(rect)
+        self._count += 1
+        bucket_xs, bucket_ys = self._get_bucket_range(rect)
+        for bucket_y in bucket_ys:
+            self._rows.setdefault(bucket_y, set()).add(index)
+            for bucket_x in bucket_xs:
+                self._buckets.setdefault((bucket_x, bucket_y), []).append(index)
+
+    def _remove(self, index: int):
+        rect = self._rects[index]
+        if rect is None:
+            return
+        self._rects[index] = None
+        self._count -= 1
+        bucket_xs, bucket_ys = self._get_bucket_range(rect)
+        for bucket_y in bucket_ys:
+            self._rows[bucket_y].discard(index)
+            for bucket_x in bucket_xs:
+                self._buckets[(bucket_x, bucket_y)].remove(index)
+
+    def update_rows(self, grid: np.ndarray, y0: int, y1: int):
+        # Re-meshes rows y0..y1 (inclusive) after the cells in them changed.
+        # Rects reaching outside the rows are cut at their edges, so the rest
+        # of the level keeps its rects and only these rows are merged again.
+        size = self.bucket_size
+        affected = set()
+        for bucket_y in range(y0 // size, y1 // size + 1):
+            for index in self._rows.get(bucket_y, ()):
+                _, y, _, h = self._rects[index]  # type: ignore
+                if y <= y1 and y0 < y + h:
+                    affected.add(index)
+
+        for index in sorted(affected):
+            x, y, w, h = self._rects[index]  # type: ignore
+            self._remove(index)
+            if y < y0:
+                self._add((x, y, w, y0 - y))
+            if y + h - 1 > y1:
+                self._add((x, y1 + 1, w, y + h - 1 - y1))
+
+        top = max(y0, 0)
+        bottom = min(y1 + 1, grid.shape[0])
+        if top < bottom:
+            for x, y, w, h in merge_rects(grid[top:bottom]):
+                self._add((x, y + top, w, h))
+
+        # Drop the tombstones once they outnumber the live rects
+        if len(self._rects) > 2 * self._count + 64:
+            self._reset(self.rects)
+
+    @classmethod
+    def from_grid(
+        cls, grid: np.ndarray, bucket_size: int = RECT_BUCKET_SIZE
+    ) -> "CollisionRects":
+        return cls(merge_rects(grid), bucket_size)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _get_candidates(self, x: float, y: float, width: float, height: float):
+        size = self.bucket_size
+        bucket_x0 = int(np.floor(x)) // size
+        bucket_y0 = int(np.floor(y)) // size
+        bucket_x1 = int(np.floor(x + width)) // size
+        bucket_y1 = int(np.floor(y + height)) // size
+
+        if bucket_x0 == bucket_x1 and bucket_y0 == bucket_y1:
+            return self._buckets.get((bucket_x0, bucket_y0), ())
+
+        # A rect spanning several buckets must only be reported once
+        candidates: set[int] = set()
+        for bucket_y in range(bucket_y0, bucket_y1 + 1):
+            for bucket_x in range(bucket_x0, bucket_x1 + 1):
+                candidates.update(self._buckets.get((bucket_x, bucket_y), ()))
+        return candidates
+
+    def get_rects_in_box(
+        self, x: float, y: float, width: float, height: float
+    ) -> list[Rect]:
+        # Returns the merged rects overlapping an (x, y, width, height) box
+        found = []
+        right = x + width
+        bottom = y + height
+        for index in self._get_candidates(x, y, width, height):
+            rect_x, rect_y, rect_w, rect_h = self._rects[index]  # type: ignore
+            if (
+                rect_x < right
+                and x < rect_x + rect_w
+                and rect_y < bottom
+                and y < rect_y + rect_h
+            ):
+                found.append(self._rects[index])
+        return found
+
+    def first_in_box(
+        self, x: float, y: float, width: float, height: float
+    ) -> Optional[Rect]:
+        right = x + width
+        bottom = y + height
+        for index in self._get_candidates(x, y, width, height):
+            rect_x, rect_y, rect_w, rect_h = self._rects[index]  # type: ignore
+            if (
+                rect_x < right
+                and x < rect_x + rect_w
+                and rect_y < bottom
+                and y < rect_y + rect_h
+            ):
+                return self._rects[index]
+        return None
+
+    def any_in_box(self, x: float, y: float, width: float, height: float) -> bool:
+        return self.first_in_box(x, y, width, height) is not None
@@ -1,20 +1,613 @@
 from common.level.tile import Tile
+from common.level.tile_type import TileType, TileTypeRegistry, TILE_TYPES, FLAG_SOLID
+from common.level.chunk import Chunk, CHUNK_SIZE, EMPTY_TILE
+from common.level.collision import CollisionGrids
+from common.level.collision_rects import CollisionRects
+from common.level.special_tiles import SpecialTileIndex, SPECIAL_FLAGS
 
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, cast
+
+import heapq
+
+import numpy as np
+
+# Called as listener(position, old_type_id, new_type_id) after every edit
+EditListener = Callable[[tuple[int, int], int, int], None]
 
 
 class Level:
-    def __init__(self, tiles: list[Tile]):
-        self.tiles = tiles if tiles is not None else []
+    def __init__(
+        self,
+        tiles: Optional[list[Tile]] = None,
+        chunk_size: int = CHUNK_SIZE,
+        registry: Optional[TileTypeRegistry] = None,
+    ):
+        tiles = tiles if tiles is not None else []
+
+        self.chunk_size = chunk_size
+
+        # Chunk grids store type ids from this registry
+        self.registry = registry if registry is not None else TILE_TYPES
+
+        # Chunks are only allocated where tiles exist
+        self.chunks: dict[tuple[int, int], Chunk] = {}
+
+        # Derived collision data, built on first use
+        self._collision: Optional[CollisionGrids] = None
+        self._solid_rects: Optional[CollisionRects] = None
+        self._special_tiles: Optional[SpecialTileIndex] = None
+
+        self._listeners: list[EditListener] = []
+        self._reset_bounds()
+
+        # The first tile placed at a position wins, matching the previous
+        # linear scan behaviour
+        for tile in tiles:
+            x, y = tile.position
+            if self.get_type_id_at((x, y)) == EMPTY_TILE:
+                self._set_type_id(x, y, self.registry.intern_type(tile.type).type_id)
+
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: dict[tuple[int, int], Chunk],
+        chunk_size: int = CHUNK_SIZE,
+        registry: Optional[TileTypeRegistry] = None,
+    ) -> "Level":
+        # Builds a level straight from chunk grids without creating Tile objects
+        level = cls(None, chunk_size, registry)
+
+        for chunk_key, chunk in chunks.items():
+            local_ys, local_xs = np.nonzero(chunk.tiles)
+            if len(local_xs) == 0:
+                continue
+            level.chunks[chunk_key] = chunk
+
+            origin_x, origin_y = chunk.get_origin()
+            xs, x_counts = np.unique(local_xs + origin_x, return_counts=True)
+            ys, y_counts = np.unique(local_ys + origin_y, return_counts=True)
+            for x, count in zip(xs.tolist(), x_counts.tolist()):
+                level._add_bound(level._column_counts, level._column_heap, x, count)
+            for y, count in zip(ys.tolist(), y_counts.tolist()):
+                level._add_bound(level._row_counts, level._row_heap, y, count)
+
+        level._update_size()
+        return level
+
+    @classmethod
+    def from_type_grid(
+        cls,
+        grid: np.ndarray,
+        chunk_size: int = CHUNK_SIZE,
+        registry: Optional[TileTypeRegistry] = None,
+    ) -> "Level":
+        # Builds a level from a dense [y, x] grid of registry type ids
+        chunks = {}
+        height, width = grid.shape
+        for origin_y in range(0, height, chunk_size):
+            for origin_x in range(0, width, chunk_size):
+                region = grid[
+                    origin_y : origin_y + chunk_size, origin_x : origin_x + chunk_size
+                ]
+                count = int(np.count_nonzero(region))
+                if count == 0:
+                    continue
+
+                chunk = Chunk(
+                    origin_x // chunk_size, origin_y // chunk_size, chunk_size
+                )
+                chunk.tiles[: region.shape[0], : region.shape[1]] = region
+                chunk.count = count
+                chunks[(chunk.chunk_x, chunk.chunk_y)] = chunk
+
+        return cls.from_chunks(chunks, chunk_size, registry)
+
+    @property
+    def tiles(self) -> list[Tile]:
+        # Tile objects are built on demand as views over the chunk grids
+        return list(self.iter_tiles())
+
+    @property
+    def collision(self) -> CollisionGrids:
+        if self._collision is None:
+            self._collision = CollisionGrids(self.get_type_grid(), self.registry)
+        return self._collision
+
+    @property
+    def solid_rects(self) -> CollisionRects:
+        # Solid tiles merged into a small set of rects for broad-phase collision
+        if self._solid_rects is None:
+            self._solid_rects = CollisionRects.from_grid(
+                self.collision.get_grid(FLAG_SOLID)
+            )
+        return self._solid_rects
+
+    def _update_solid_rects(self, y0: int, y1: int):
+        # Only the edited rows are merged again. Merged rects that have not
+        # been built yet stay lazy.
+        if self._solid_rects is not None:
+            self._solid_rects.update_rows(self.collision.get_grid(FLAG_SOLID), y0, y1)
+
+    @property
+    def special_tiles(self) -> SpecialTileIndex:
+        # Spawns, checkpoints, finishes and entity spawns, indexed by kind
+        if self._special_tiles is None:
+            self._special_tiles = SpecialTileIndex.from_tiles(
+                self._iter_special_tiles()
+            )
+        return self._special_tiles
+
+    def _iter_special_tiles(self):
+        flags_table = self.registry.get_flags_table()
+        for chunk in self.chunks.values():
+            origin_x, origin_y = chunk.get_origin()
+            local_ys, local_xs = np.nonzero(flags_table[chunk.tiles] & SPECIAL_FLAGS)
+            for local_x, local_y in zip(local_xs.tolist(), local_ys.tolist()):
+                yield (
+                    (origin_x + local_x, origin_y + local_y),
+                    self.registry.types[int(chunk.tiles[local_y, local_x])],
+                )
+
+    @property
+    def tile_count(self) -> int:
+        return sum(chunk.count for chunk in self.chunks.values())
+
+    def _reset_bounds(self):
+        # Tile counts per column and row, plus lazy max-heaps of the occupied
+        # coordinates, so the level size can follow edits without rescanning
+        self._column_counts: dict[int, int] = {}
+        self._row_counts: dict[int, int] = {}
+        self._column_heap: list[int] = []
+        self._row_heap: list[int] = []
+        self.width = 0
+        self.height = 0
+
+    def _add_bound(self, counts: dict[int, int], heap: list[int], value: int, count=1):
+        previous = counts.get(value, 0)
+        counts[value] = previous + count
+        if previous == 0:
+            heapq.heappush(heap, -value)
+
+    def _remove_bound(
+        self, counts: dict[int, int], heap: list[int], value: int, count=1
+    ):
+        count = counts[value] - count
+        if count > 0:
+            counts[value] = count
+            return
+        del counts[value]
+
+        # Only drop stale entries from the top, the rest are skipped when they
+        # surface later
+        while heap and -heap[0] not in counts:
+            heapq.heappop(heap)
+
+        # Values removed and re-added below the top leave duplicates behind
+        if len(heap) > 2 * len(counts) + 64:
+            heap[:] = [-value for value in counts]
+            heapq.heapify(heap)
+
+    def _update_size(self):
+        # Width and height cover (0, 0) up to the furthest occupied tile
+        # Levels with only negative coordinates are empty to the grids, not
+        # negative in size
+        self.width = max(0, -self._column_heap[0] + 1) if self._column_heap else 0
+        self.height = max(0, -self._row_heap[0] + 1) if self._row_heap else 0
+
+    def add_listener(self, listener: EditListener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: EditListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def set_tile(self, tile: Tile) -> Optional[Tile]:
+        # Places a tile, replacing and returning whatever was there before
+        x, y = tile.position
+        old_type_id = self.set_type_id_at(
+            (x, y), self.registry.intern_type(tile.type).type_id
+        )
+        if old_type_id == EMPTY_TILE:
+            return None
+        return self._make_tile(old_type_id, (x, y))
+
+    def remove_tile(self, position: tuple[int, int]) -> Optional[Tile]:
+        old_type_id = self.set_type_id_at(position, EMPTY_TILE)
+        if old_type_id == EMPTY_TILE:
+            return None
+        return self._make_tile(old_type_id, (position[0], position[1]))
+
+    def bulk_set(self, tiles: Iterable[Tile]):
+        # Later tiles overwrite earlier ones at the same position
+        for tile in tiles:
+            x, y = tile.position
+            self.set_type_id_at((x, y), self.registry.intern_type(tile.type).type_id)
+
+    def set_type_id_at(self, position: tuple[int, int], type_id: int) -> int:
+        # Sets a single cell and keeps every derived index in sync with it.
+        # Returns the type id that was replaced.
+        x, y = position
+        if type_id != EMPTY_TILE and self.registry.get(type_id) is None:
+            raise ValueError(f"Unknown tile type id {type_id}.")
+
+        old_type_id = self._set_type_id(x, y, type_id)
+        if old_type_id == type_id:
+            return old_type_id
+
+        if self._collision is not None:
+            if (self.width, self.height) != (
+                self._collision.width,
+                self._collision.height,
+            ):
+                self._collision.resize(self.width, self.height)
+            self._collision.set_cell(x, y, type_id)
+
+        flags_table = self.registry.get_flags_table()
+        if (flags_table[old_type_id] ^ flags_table[type_id]) & FLAG_SOLID:
+            self._update_solid_rects(y, y)
+
+        if self._special_tiles is not None:
+            if old_type_id != EMPTY_TILE:
+                old_type = cast(TileType, self.registry.types[old_type_id])
+                self._special_tiles.remove((x, y), old_type)
+            if type_id != EMPTY_TILE:
+                new_type = cast(TileType, self.registry.types[type_id])
+                self._special_tiles.add((x, y), new_type)
+
+        for listener in list(self._listeners):
+            listener((x, y), old_type_id, type_id)
+
+        return old_type_id
+
+    def set_region(self, x0: int, y0: int, grid: np.ndarray) -> int:
+        # Writes a dense [y, x] grid of type ids with its top-left corner at
+        # (x0, y0), chunk by chunk. Empty cells in the grid clear the level.
+        # Returns the number of cells that changed.
+        grid = np.asarray(grid, dtype=np.uint16)
+        height, width = grid.shape
+        if height == 0 or width == 0:
+            return 0
+        if int(grid.max()) >= len(self.registry.types):
+            raise ValueError(f"Unknown tile type id {int(grid.max())}.")
+
+        size = self.chunk_size
+        changed_xs, changed_ys, old_ids, new_ids = [], [], [], []
+
+        for chunk_y in range(y0 // size, (y0 + height - 1) // size + 1):
+            for chunk_x in range(x0 // size, (x0 + width - 1) // size + 1):
+                origin_x, origin_y = chunk_x * size, chunk_y * size
+                left = max(x0, origin_x)
+                top = max(y0, origin_y)
+                right = min(x0 + width, origin_x + size)
+                bottom = min(y0 + height, origin_y + size)
+                region = grid[top - y0 : bottom - y0, left - x0 : right - x0]
 
-        # Calculate width and height based on tiles positions
-        max_x = max(tile.position[0] for tile in self.tiles)
-        max_y = max(tile.position[1] for tile in self.tiles)
-        self.width = max_x + 1
-        self.height = max_y + 1
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is None:
+                    if not region.any():
+                        continue
+                    chunk = Chunk(chunk_x, chunk_y, size)
+                    self.chunks[(chunk_x, chunk_y)] = chunk
+
+                cells = chunk.tiles[
+                    top - origin_y : bottom - origin_y,
+                    left - origin_x : right - origin_x,
+                ]
+                local_ys, local_xs = np.nonzero(cells != region)
+                if len(local_xs) == 0:
+                    continue
+
+                old = cells[local_ys, local_xs]
+                new = region[local_ys, local_xs]
+                cells[local_ys, local_xs] = new
+                chunk.count += int(np.count_nonzero(new)) - int(np.count_nonzero(old))
+                if chunk.is_empty():
+                    del self.chunks[(chunk_x, chunk_y)]
+
+                changed_xs.append(local_xs + left)
+                changed_ys.append(local_ys + top)
+                old_ids.append(old)
+                new_ids.append(new)
+
+        if not changed_xs:
+            return 0
+
+        return self._commit_changes(
+            np.concatenate(changed_xs),
+            np.concatenate(changed_ys),
+            np.concatenate(old_ids),
+            np.concatenate(new_ids),
+        )
+
+    def get_cells(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        # Type ids at many scattered positions at once
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        type_ids = np.zeros(len(xs), dtype=np.uint16)
+
+        size = self.chunk_size
+        for (chunk_x, chunk_y), indices in self._group_by_chunk(xs, ys):
+            chunk = self.chunks.get((chunk_x, chunk_y))
+            if chunk is not None:
+                type_ids[indices] = chunk.tiles[
+                    ys[indices] - chunk_y * size, xs[indices] - chunk_x * size
+                ]
+        return type_ids
+
+    def set_cells(self, xs: np.ndarray, ys: np.ndarray, type_ids: np.ndarray) -> int:
+        # Sets many scattered cells at once; positions must be unique.
+        # Returns the number of cells that changed.
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        type_ids = np.asarray(type_ids, dtype=np.uint16)
+        if len(xs) == 0:
+            return 0
+        if int(type_ids.max()) >= len(self.registry.types):
+            raise ValueError(f"Unknown tile type id {int(type_ids.max())}.")
+
+        size = self.chunk_size
+        changed = []
+        for (chunk_x, chunk_y), indices in self._group_by_chunk(xs, ys):
+            new = type_ids[indices]
+            chunk = self.chunks.get((chunk_x, chunk_y))
+            if chunk is None:
+                if not new.any():
+                    continue
+                chunk = Chunk(chunk_x, chunk_y, size)
+                self.chunks[(chunk_x, chunk_y)] = chunk
+
+            local_xs = xs[indices] - chunk_x * size
+            local_ys = ys[indices] - chunk_y * size
+            old = chunk.tiles[local_ys, local_xs]
+            different = old != new
+            if not different.any():
+                continue
+
+            indices = indices[different]
+            old = old[different]
+            new = new[different]
+            chunk.tiles[local_ys[different], local_xs[different]] = new
+            chunk.count += int(np.count_nonzero(new)) - int(np.count_nonzero(old))
+            if chunk.is_empty():
+                del self.chunks[(chunk_x, chunk_y)]
+            changed.append((indices, old))
+
+        if not changed:
+            return 0
+
+        indices = np.concatenate([indices for indices, _ in changed])
+        return self._commit_changes(
+            xs[indices],
+            ys[indices],
+            np.concatenate([old for _, old in changed]),
+            type_ids[indices],
+        )
+
+    def _group_by_chunk(self, xs: np.ndarray, ys: np.ndarray):
+        # Yields (chunk key, indices into xs/ys) for every chunk touched
+        chunk_xs = xs // self.chunk_size
+        chunk_ys = ys // self.chunk_size
+        order = np.lexsort((chunk_xs, chunk_ys))
+        keys = np.stack((chunk_xs[order], chunk_ys[order]), axis=1)
+        breaks = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+        for indices in np.split(order, breaks):
+            if len(indices):
+                yield (int(chunk_xs[indices[0]]), int(chunk_ys[indices[0]])), indices
+
+    def _commit_changes(
+        self, xs: np.ndarray, ys: np.ndarray, old: np.ndarray, new: np.ndarray
+    ) -> int:
+        # Brings bounds and derived data in line with cells already written to
+        # the chunks, then notifies listeners
+
+        # Bounds only change where cells went from empty to filled or back
+        for mask, update in (
+            ((old == EMPTY_TILE) & (new != EMPTY_TILE), self._add_bound),
+            ((old != EMPTY_TILE) & (new == EMPTY_TILE), self._remove_bound),
+        ):
+            if not mask.any():
+                continue
+            for values, counts, heap in (
+                (xs[mask], self._column_counts, self._column_heap),
+                (ys[mask], self._row_counts, self._row_heap),
+            ):
+                unique, unique_counts = np.unique(values, return_counts=True)
+                for value, count in zip(unique.tolist(), unique_counts.tolist()):
+                    update(counts, heap, value, count)
+        self._update_size()
+
+        if self._collision is not None:
+            if (self.width, self.height) != (
+                self._collision.width,
+                self._collision.height,
+            ):
+                self._collision.resize(self.width, self.height)
+            self._collision.set_cells(xs, ys, new)
+
+        flags_table = self.registry.get_flags_table()
+        old_flags = flags_table[old]
+        new_flags = flags_table[new]
+        solid_changed = ((old_flags ^ new_flags) & FLAG_SOLID) != 0
+        if solid_changed.any():
+            changed_ys = ys[solid_changed]
+            self._update_solid_rects(int(changed_ys.min()), int(changed_ys.max()))
+
+        if self._special_tiles is not None:
+            special = np.flatnonzero((old_flags | new_flags) & SPECIAL_FLAGS)
+            for index in special.tolist():
+                position = (int(xs[index]), int(ys[index]))
+                if old[index] != EMPTY_TILE:
+                    old_type = cast(TileType, self.registry.types[int(old[index])])
+                    self._special_tiles.remove(position, old_type)
+                if new[index] != EMPTY_TILE:
+                    new_type = cast(TileType, self.registry.types[int(new[index])])
+                    self._special_tiles.add(position, new_type)
+
+        if self._listeners:
+            for x, y, old_type_id, type_id in zip(
+                xs.tolist(), ys.tolist(), old.tolist(), new.tolist()
+            ):
+                for listener in list(self._listeners):
+                    listener((x, y), old_type_id, type_id)
+
+        return len(xs)
+
+    def _set_type_id(self, x: int, y: int, type_id: int) -> int:
+        # Updates the chunk grid and the level bounds only
+        chunk = self._get_chunk(x, y, create=type_id != EMPTY_TILE)
+        if chunk is None:
+            return EMPTY_TILE
+
+        origin_x, origin_y = chunk.get_origin()
+        old_type_id = chunk.set(x - origin_x, y - origin_y, type_id)
+        if old_type_id == type_id:
+            return old_type_id
+
+        if old_type_id == EMPTY_TILE:
+            self._add_bound(self._column_counts, self._column_heap, x)
+            self._add_bound(self._row_counts, self._row_heap, y)
+            self._update_size()
+        elif type_id == EMPTY_TILE:
+            self._remove_bound(self._column_counts, self._column_heap, x)
+            self._remove_bound(self._row_counts, self._row_heap, y)
+            self._update_size()
+
+            # Empty chunks are dropped so memory follows the tile count
+            if chunk.is_empty():
+                del self.chunks[(chunk.chunk_x, chunk.chunk_y)]
+
+        return old_type_id
+
+    def _make_tile(self, type_id: int, position: tuple[int, int]) -> Tile:
+        return Tile.from_type(self.registry.types[type_id], position)  # type: ignore
+
+    def _get_chunk(self, x: int, y: int, create: bool = False) -> Optional[Chunk]:
+        chunk_key = (x // self.chunk_size, y // self.chunk_size)
+        chunk = self.chunks.get(chunk_key)
+        if chunk is None and create:
+            chunk = Chunk(chunk_key[0], chunk_key[1], self.chunk_size)
+            self.chunks[chunk_key] = chunk
+        return chunk
+
+    def get_type_id_at(self, position: tuple[int, int]) -> int:
+        x, y = position
+        chunk = self._get_chunk(x, y)
+        if chunk is None:
+            return EMPTY_TILE
+        origin_x, origin_y = chunk.get_origin()
+        return chunk.get(x - origin_x, y - origin_y)
+
+    def get_region(self, x0: int, y0: int, width: int, height: int) -> np.ndarray:
+        # Dense [y, x] grid of type ids for the rect with its top-left at (x0, y0)
+        grid = np.zeros((max(height, 0), max(width, 0)), dtype=np.uint16)
+        if width <= 0 or height <= 0:
+            return grid
+
+        for chunk in self._get_chunks_in_rect(x0, y0, x0 + width - 1, y0 + height - 1):
+            origin_x, origin_y = chunk.get_origin()
+            left = max(origin_x, x0)
+            top = max(origin_y, y0)
+            right = min(origin_x + chunk.size, x0 + width)
+            bottom = min(origin_y + chunk.size, y0 + height)
+            grid[top - y0 : bottom - y0, left - x0 : right - x0] = chunk.tiles[
+                top - origin_y : bottom - origin_y, left - origin_x : right - origin_x
+            ]
+        return grid
+
+    def get_type_grid(self) -> np.ndarray:
+        # Dense [y, x] grid of type ids covering (0, 0) to (width, height)
+        grid = np.zeros((max(self.height, 0), max(self.width, 0)), dtype=np.uint16)
+        for chunk in self.chunks.values():
+            origin_x, origin_y = chunk.get_origin()
+            left = max(origin_x, 0)
+            top = max(origin_y, 0)
+            right = min(origin_x + chunk.size, self.width)
+            bottom = min(origin_y + chunk.size, self.height)
+            if left >= right or top >= bottom:
+                continue
+            grid[top:bottom, left:right] = chunk.tiles[
+                top - origin_y : bottom - origin_y, left - origin_x : right - origin_x
+            ]
+        return grid
+
+    def get_used_tile_ids(self) -> list[str]:
+        # Ids of every tile type placed in the level, e.g. to load its textures
+        used = set()
+        for chunk in self.chunks.values():
+            used.update(np.unique(chunk.tiles).tolist())
+        used.discard(EMPTY_TILE)
+        return sorted({self.registry.get(type_id).id for type_id in used})
+
+    def get_flags_at(self, position: tuple[int, int]) -> int:
+        return int(self.registry.get_flags_table()[self.get_type_id_at(position)])
+
+    def has_flag_at(self, position: tuple[int, int], flag: int) -> bool:
+        return (self.get_flags_at(position) & flag) != 0
 
     def get_tile_at(self, position: tuple[int, int]) -> Optional[Tile]:
-        for tile in self.tiles:
-            if tile.position == position:
-                return tile
-        return None
+        type_id = self.get_type_id_at(position)
+        if type_id == EMPTY_TILE:
+            return None
+        return self._make_tile(type_id, (position[0], position[1]))
+
+    def iter_tiles(self) -> Iterator[Tile]:
+        for chunk in self.chunks.values():
+            origin_x, origin_y = chunk.get_origin()
+            local_ys, local_xs = np.nonzero(chunk.tiles)
+            for local_x, local_y in zip(local_xs.tolist(), local_ys.tolist()):
+                yield self._make_tile(
+                    int(chunk.tiles[local_y, local_x]),
+                    (origin_x + local_x, origin_y + local_y),
+                )
+
+    def get_tiles_in_rect(self, x0: int, y0: int, x1: int, y1: int) -> list[Tile]:
+        # Bounds are inclusive on both ends and may be given in any order
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+
+        size = self.chunk_size
+        tiles = []
+
+        for chunk in self._get_chunks_in_rect(x0, y0, x1, y1):
+            # Slice out the part of the chunk grid that overlaps the rect
+            origin_x, origin_y = chunk.get_origin()
+            left = max(x0 - origin_x, 0)
+            top = max(y0 - origin_y, 0)
+            right = min(x1 - origin_x, size - 1) + 1
+            bottom = min(y1 - origin_y, size - 1) + 1
+
+            region = chunk.tiles[top:bottom, left:right]
+            local_ys, local_xs = np.nonzero(region)
+            for local_x, local_y in zip(local_xs.tolist(), local_ys.tolist()):
+                tiles.append(
+                    self._make_tile(
+                        int(region[local_y, local_x]),
+                        (origin_x + left + local_x, origin_y + top + local_y),
+                    )
+                )
+
+        return tiles
+
+    def _get_chunks_in_rect(self, x0: int, y0: int, x1: int, y1: int) -> list[Chunk]:
+        size = self.chunk_size
+        chunk_x0, chunk_y0 = x0 // size, y0 // size
+        chunk_x1, chunk_y1 = x1 // size, y1 // size
+
+        # For huge query rects it is cheaper to walk the allocated chunks
+        chunk_area = (chunk_x1 - chunk_x0 + 1) * (chunk_y1 - chunk_y0 + 1)
+        if chunk_area > len(self.chunks):
+            return [
+                chunk
+                for (chunk_x, chunk_y), chunk in self.chunks.items()
+                if chunk_x0 <= chunk_x <= chunk_x1 and chunk_y0 <= chunk_y <= chunk_y1
+            ]
+
+        chunks = []
+        for chunk_y in range(chunk_y0, chunk_y1 + 1):
+            for chunk_x in range(chunk_x0, chunk_x1 + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is not None:
+                    chunks.append(chunk)
+        return chunks
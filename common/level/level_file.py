@@ -0,0 +1,312 @@
+import mmap
+import os
+import struct
+import zlib
+from typing import Optional, Union
+
+import numpy as np
+
+from common.level.chunk import Chunk, EMPTY_TILE
+from common.level.level import Level
+from common.level.tile_type import (
+    TileType,
+    TileTypeRegistry,
+    TILE_TYPES,
+    FLAG_SOLID,
+    FLAG_KILL,
+    FLAG_FINISH,
+    FLAG_CHECKPOINT,
+    FLAG_SPAWN,
+)
+
+
+# Binary level layout (all values little-endian):
+#   header       magic, version, flags, chunk size, width, height, counts
+#   palette      one entry per tile type used by the level (local id 1..n)
+#   chunk table  chunk x/y, absolute data offset and data length per chunk
+#   chunk data   chunk_size * chunk_size local palette ids per chunk
+LEVEL_MAGIC = b"DASHRLVL"
+LEVEL_VERSION = 1
+LEVEL_FILE_EXTENSION = ".dlvl"
+
+# Header flags
+LEVEL_FLAG_COMPRESSED = 1 << 0
+LEVEL_FLAG_WIDE_IDS = 1 << 1  # chunk grids use uint16 instead of uint8
+
+_HEADER = struct.Struct("<8sHHHHiiII")
+_PALETTE_ENTRY = struct.Struct("<Bd")
+_STRING_LENGTH = struct.Struct("<H")
+_CHUNK_ENTRY = struct.Struct("<iiQI")
+
+# String length marker for a missing spawn entity
+_NO_STRING = 0xFFFF
+
+
+def _check_size(buffer, offset: int, size: int, name: str = "Level data"):
+    # Raises the format's own error instead of a struct.error on short data
+    if offset + size > len(buffer):
+        raise ValueError(f"{name} is truncated.")
+
+
+def _pack_string(value: Optional[str]) -> bytes:
+    if value is None:
+        return _STRING_LENGTH.pack(_NO_STRING)
+    data = value.encode("utf-8")
+    if len(data) >= _NO_STRING:
+        raise ValueError(f"String too long for level file: {value[:32]}...")
+    return _STRING_LENGTH.pack(len(data)) + data
+
+
+def _unpack_string(buffer, offset: int) -> tuple[Optional[str], int]:
+    _check_size(buffer, offset, _STRING_LENGTH.size, "Palette data")
+    (length,) = _STRING_LENGTH.unpack_from(buffer, offset)
+    offset += _STRING_LENGTH.size
+    if length == _NO_STRING:
+        return None, offset
+    _check_size(buffer, offset, length, "Palette data")
+    value = bytes(buffer[offset : offset + length]).decode("utf-8")
+    return value, offset + length
+
+
+def pack_palette(palette: list[TileType]) -> bytes:
+    # Tile types are stored by value so files do not depend on registry ids.
+    # Shared by level files and patches.
+    parts = []
+    for tile_type in palette:
+        parts.append(_PALETTE_ENTRY.pack(tile_type.flags, tile_type.boost))
+        parts.append(_pack_string(tile_type.id))
+        parts.append(_pack_string(tile_type.spawn_entity))
+    return b"".join(parts)
+
+
+def unpack_palette(
+    buffer, offset: int, count: int, registry: TileTypeRegistry
+) -> tuple[list[int], int]:
+    # Interns count palette entries into the registry. Returns the registry
+    # type id of every local id, starting with the empty tile at local id 0,
+    # and the offset just past the palette.
+    to_registry = [EMPTY_TILE]
+    for _ in range(count):
+        _check_size(buffer, offset, _PALETTE_ENTRY.size, "Palette data")
+        type_flags, boost = _PALETTE_ENTRY.unpack_from(buffer, offset)
+        offset += _PALETTE_ENTRY.size
+        tile_id, offset = _unpack_string(buffer, offset)
+        spawn_entity, offset = _unpack_string(buffer, offset)
+        if tile_id is None:
+            raise ValueError("Palette entry has no tile id.")
+
+        tile_type = registry.intern(
+            tile_id,
+            is_solid=bool(type_flags & FLAG_SOLID),
+            is_kill=bool(type_flags & FLAG_KILL),
+            boost=boost,
+            is_finish=bool(type_flags & FLAG_FINISH),
+            is_checkpoint=bool(type_flags & FLAG_CHECKPOINT),
+            is_spawn=bool(type_flags & FLAG_SPAWN),
+            spawn_entity=spawn_entity,
+        )
+        to_registry.append(tile_type.type_id)
+    return to_registry, offset
+
+
+def encode_level(level: Level, compress: bool = True) -> bytes:
+    chunks = [chunk for chunk in level.chunks.values() if not chunk.is_empty()]
+
+    # Build a level-local palette so the file does not depend on registry ids
+    used_type_ids = set()
+    for chunk in chunks:
+        used_type_ids.update(np.unique(chunk.tiles).tolist())
+    used_type_ids.discard(EMPTY_TILE)
+    palette: list[TileType] = [
+        level.registry.types[type_id] for type_id in sorted(used_type_ids)  # type: ignore
+    ]
+
+    to_local = np.zeros(len(level.registry.types), dtype=np.uint16)
+    for local_id, tile_type in enumerate(palette, start=1):
+        to_local[tile_type.type_id] = local_id
+
+    wide_ids = len(palette) > np.iinfo(np.uint8).max
+    grid_dtype = np.dtype("<u2") if wide_ids else np.dtype("u1")
+
+    flags = 0
+    if compress:
+        flags |= LEVEL_FLAG_COMPRESSED
+    if wide_ids:
+        flags |= LEVEL_FLAG_WIDE_IDS
+
+    header = _HEADER.pack(
+        LEVEL_MAGIC,
+        LEVEL_VERSION,
+        flags,
+        level.chunk_size,
+        0,
+        level.width,
+        level.height,
+        len(palette),
+        len(chunks),
+    )
+
+    palette_data = pack_palette(palette)
+
+    # Chunk data starts right after the chunk table
+    offset = len(header) + len(palette_data) + _CHUNK_ENTRY.size * len(chunks)
+
+    table_parts = []
+    data_parts = []
+    for chunk in chunks:
+        data = to_local[chunk.tiles].astype(grid_dtype).tobytes()
+        if compress:
+            data = zlib.compress(data)
+        table_parts.append(
+            _CHUNK_ENTRY.pack(chunk.chunk_x, chunk.chunk_y, offset, len(data))
+        )
+        data_parts.append(data)
+        offset += len(data)
+
+    return b"".join([header, palette_data, *table_parts, *data_parts])
+
+
+def save_level(level: Level, path: str, compress: bool = True):
+    data = encode_level(level, compress)
+
+    # Write to a temporary file first so a crash never leaves a truncated level
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+class LevelReader:
+    def __init__(
+        self,
+        buffer: Union[bytes, bytearray, memoryview, mmap.mmap],
+        registry: Optional[TileTypeRegistry] = None,
+    ):
+        self.buffer = buffer
+        self.registry = registry if registry is not None else TILE_TYPES
+        self._file = None
+
+        if len(buffer) < _HEADER.size:
+            raise ValueError("Level data is too short to contain a header.")
+
+        (
+            magic,
+            version,
+            flags,
+            chunk_size,
+            _,
+            width,
+            height,
+            palette_count,
+            chunk_count,
+        ) = _HEADER.unpack_from(buffer, 0)
+
+        if magic != LEVEL_MAGIC:
+            raise ValueError("Level data does not start with the level file magic.")
+        if version > LEVEL_VERSION:
+            raise ValueError(f"Unsupported level file version: {version}")
+        if chunk_size == 0:
+            raise ValueError("Level chunk size must not be zero.")
+
+        self.version = version
+        self.compressed = bool(flags & LEVEL_FLAG_COMPRESSED)
+        self.chunk_size = chunk_size
+        self.width = width
+        self.height = height
+        self._grid_dtype = (
+            np.dtype("<u2") if flags & LEVEL_FLAG_WIDE_IDS else np.dtype("u1")
+        )
+
+        # Map the level-local palette onto registry type ids
+        to_registry, offset = unpack_palette(
+            buffer, _HEADER.size, palette_count, self.registry
+        )
+        self._to_registry = np.array(to_registry, dtype=np.uint16)
+
+        # Only the chunk table is parsed up front, chunk grids are decoded on demand
+        self.chunk_table: dict[tuple[int, int], tuple[int, int]] = {}
+        _check_size(buffer, offset, _CHUNK_ENTRY.size * chunk_count)
+        for _ in range(chunk_count):
+            chunk_x, chunk_y, data_offset, data_length = _CHUNK_ENTRY.unpack_from(
+                buffer, offset
+            )
+            offset += _CHUNK_ENTRY.size
+            if data_offset + data_length > len(buffer):
+                raise ValueError("Level data is truncated.")
+            self.chunk_table[(chunk_x, chunk_y)] = (data_offset, data_length)
+
+    @classmethod
+    def open(
+        cls, path: str, registry: Optional[TileTypeRegistry] = None
+    ) -> "LevelReader":
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Level file not found: {path}")
+
+        f = open(path, "rb")
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            reader = cls(buffer, registry)
+        except Exception:
+            f.close()
+            raise
+        reader._file = f
+        return reader
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "LevelReader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_chunk_keys(self) -> list[tuple[int, int]]:
+        return list(self.chunk_table.keys())
+
+    def has_chunk(self, chunk_x: int, chunk_y: int) -> bool:
+        return (chunk_x, chunk_y) in self.chunk_table
+
+    def read_chunk(self, chunk_x: int, chunk_y: int) -> Optional[Chunk]:
+        entry = self.chunk_table.get((chunk_x, chunk_y))
+        if entry is None:
+            return None
+
+        # Damaged chunk data is reported like any other malformed level, so
+        # callers only need to handle ValueError. load_level reads through here.
+        data_offset, data_length = entry
+        data = memoryview(self.buffer)[data_offset : data_offset + data_length]
+        if self.compressed:
+            try:
+                data = zlib.decompress(data)
+            except zlib.error as e:
+                raise ValueError("Chunk data is corrupt.") from e
+
+        size = self.chunk_size
+        if len(data) < size * size * self._grid_dtype.itemsize:
+            raise ValueError("Chunk data is corrupt.")
+        local_ids = np.frombuffer(data, dtype=self._grid_dtype, count=size * size)
+        if len(local_ids) and int(local_ids.max()) >= len(self._to_registry):
+            raise ValueError("Chunk data is corrupt.")
+
+        chunk = Chunk(chunk_x, chunk_y, size)
+        chunk.tiles = self._to_registry[local_ids].reshape((size, size))
+        chunk.count = int(np.count_nonzero(chunk.tiles))
+        return chunk
+
+    def load_level(self) -> Level:
+        chunks = {}
+        for chunk_x, chunk_y in self.chunk_table:
+            chunk = self.read_chunk(chunk_x, chunk_y)
+            if chunk is not None and not chunk.is_empty():
+                chunks[(chunk_x, chunk_y)] = chunk
+        return Level.from_chunks(chunks, self.chunk_size, self.registry)
+
+
+def load_level(path: str, registry: Optional[TileTypeRegistry] = None) -> Level:
+    with LevelReader.open(path, registry) as reader:
+        return reader.load_level()
@@ -0,0 +1,315 @@
+import struct
+import zlib
+from typing import Iterable, Optional
+
+import numpy as np
+
+from common.level.chunk import EMPTY_TILE
+from common.level.collision_rects import merge_cells
+from common.level.level import Level
+from common.level.level_file import pack_palette, unpack_palette
+from common.level.tile_type import TileType, TileTypeRegistry, TILE_TYPES
+
+# Binary patch layout (all values little-endian):
+#   header   magic, version, flags, palette count, run count
+#   palette  tile types referenced by the runs (local id 1..n, 0 is empty)
+#   runs     x, y, width, height, old local id, new local id per run
+PATCH_MAGIC = b"DASHRPCH"
+PATCH_VERSION = 1
+
+# Header flags
+PATCH_FLAG_COMPRESSED = 1 << 0
+
+# Runs are run-length encoded, so a few bytes can describe any number of
+# cells. Patches read from bytes may cover at most this many cells.
+PATCH_MAX_CELLS = 1 << 22
+
+_HEADER = struct.Struct("<8sHHII")
+_RUN_DTYPE = np.dtype(
+    [
+        ("x", "<i4"),
+        ("y", "<i4"),
+        ("width", "<u4"),
+        ("height", "<u4"),
+        ("old", "<u2"),
+        ("new", "<u2"),
+    ]
+)
+
+# Runs are (x, y, width, height, old type id, new type id): every cell of the
+# rect went from the old type to the new type
+PatchRun = tuple[int, int, int, int, int, int]
+
+# A single cell change as (x, y, old type id, new type id)
+CellChange = tuple[int, int, int, int]
+
+
+class LevelPatch:
+    def __init__(
+        self, runs: list[PatchRun], registry: Optional[TileTypeRegistry] = None
+    ):
+        self.runs = runs
+        self.registry = registry if registry is not None else TILE_TYPES
+
+    @classmethod
+    def from_changes(
+        cls,
+        changes: Iterable[CellChange],
+        registry: Optional[TileTypeRegistry] = None,
+    ) -> "LevelPatch":
+        # Cells with the same old and new type are merged into rects
+        changes = np.array(
+            [change for change in changes if change[2] != change[3]], dtype=np.int64
+        ).reshape(-1, 4)
+        return cls._from_arrays(
+            changes[:, 0], changes[:, 1], changes[:, 2], changes[:, 3], registry
+        )
+
+    @classmethod
+    def _from_arrays(
+        cls,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        old: np.ndarray,
+        new: np.ndarray,
+        registry: Optional[TileTypeRegistry] = None,
+    ) -> "LevelPatch":
+        runs: list[PatchRun] = []
+        if len(xs) == 0:
+            return cls(runs, registry)
+
+        pairs, inverse = np.unique(
+            np.stack((old, new), axis=1), axis=0, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        for pair_index, (old_type_id, new_type_id) in enumerate(pairs.tolist()):
+            mask = inverse == pair_index
+            for x, y, w, h in merge_cells(xs[mask], ys[mask]):
+                runs.append((x, y, w, h, old_type_id, new_type_id))
+
+        # Runs are stored top to bottom, which keeps the output deterministic
+        runs.sort(key=lambda run: (run[1], run[0]))
+        return cls(runs, registry)
+
+    @classmethod
+    def from_levels(cls, before: Level, after: Level) -> "LevelPatch":
+        # Diffs two levels chunk by chunk; both must use the same registry
+        if before.registry is not after.registry:
+            raise ValueError("Cannot diff levels that use different registries.")
+        if before.chunk_size != after.chunk_size:
+            raise ValueError("Cannot diff levels with different chunk sizes.")
+
+        changed = []
+        for chunk_key in set(before.chunks) | set(after.chunks):
+            old_chunk = before.chunks.get(chunk_key)
+            new_chunk = after.chunks.get(chunk_key)
+            size = before.chunk_size
+            old_tiles = (
+                old_chunk.tiles
+                if old_chunk is not None
+                else np.zeros((size, size), dtype=np.uint16)
+            )
+            new_tiles = (
+                new_chunk.tiles
+                if new_chunk is not None
+                else np.zeros((size, size), dtype=np.uint16)
+            )
+
+            local_ys, local_xs = np.nonzero(old_tiles != new_tiles)
+            if len(local_xs) == 0:
+                continue
+            changed.append(
+                (
+                    local_xs + chunk_key[0] * size,
+                    local_ys + chunk_key[1] * size,
+                    old_tiles[local_ys, local_xs],
+                    new_tiles[local_ys, local_xs],
+                )
+            )
+
+        if not changed:
+            return cls([], before.registry)
+
+        xs, ys, old, new = (np.concatenate(parts) for parts in zip(*changed))
+        return cls._from_arrays(
+            xs.astype(np.int64),
+            ys.astype(np.int64),
+            old.astype(np.int64),
+            new.astype(np.int64),
+            before.registry,
+        )
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    def is_empty(self) -> bool:
+        return not self.runs
+
+    def get_cell_count(self) -> int:
+        return sum(w * h for _, _, w, h, _, _ in self.runs)
+
+    def invert(self) -> "LevelPatch":
+        # Undoing a patch swaps the old and new type of every run
+        return LevelPatch(
+            [(x, y, w, h, new, old) for x, y, w, h, old, new in reversed(self.runs)],
+            self.registry,
+        )
+
+    def _expand(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Per-cell x, y, old and new arrays for every cell covered by the runs
+        if not self.runs:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty, empty
+
+        runs = np.array(self.runs, dtype=np.int64)
+        run_xs, run_ys, widths, heights, old, new = runs.T
+        counts = widths * heights
+        starts = np.cumsum(counts) - counts
+
+        # Index of every cell within its own run
+        run_indices = np.repeat(np.arange(len(runs)), counts)
+        local = np.arange(int(counts.sum())) - starts[run_indices]
+        return (
+            run_xs[run_indices] + local % widths[run_indices],
+            run_ys[run_indices] + local // widths[run_indices],
+            old[run_indices],
+            new[run_indices],
+        )
+
+    def conflicts(self, level: Level) -> list[tuple[int, int]]:
+        # Cells that no longer hold the type the patch expects
+        xs, ys, old, _ = self._expand()
+        mismatched = np.flatnonzero(level.get_cells(xs, ys) != old)
+        return list(zip(xs[mismatched].tolist(), ys[mismatched].tolist()))
+
+    def apply(self, level: Level, check: bool = True) -> int:
+        # Returns the number of cells that changed. With check enabled nothing
+        # is written if the level does not match the patch's old types.
+        if level.registry is not self.registry:
+            raise ValueError("Cannot apply a patch built for a different registry.")
+
+        xs, ys, old, new = self._expand()
+        if check:
+            mismatched = np.flatnonzero(level.get_cells(xs, ys) != old)
+            if len(mismatched):
+                raise ValueError(
+                    f"Patch does not match the level: {len(mismatched)} conflicting "
+                    f"cells, first at ({xs[mismatched[0]]}, {ys[mismatched[0]]})."
+                )
+
+        return level.set_cells(xs, ys, new)
+
+    def to_bytes(self, compress: bool = True) -> bytes:
+        # Types are written to a patch-local palette so the patch can be applied
+        # in another process with a different registry
+        used_type_ids = sorted(
+            {run[4] for run in self.runs} | {run[5] for run in self.runs}
+        )
+        palette: list[TileType] = [
+            self.registry.types[type_id]  # type: ignore
+            for type_id in used_type_ids
+            if type_id != EMPTY_TILE
+        ]
+        to_local = {EMPTY_TILE: 0}
+        for local_id, tile_type in enumerate(palette, start=1):
+            to_local[tile_type.type_id] = local_id
+
+        runs = np.zeros(len(self.runs), dtype=_RUN_DTYPE)
+        for index, (x, y, w, h, old, new) in enumerate(self.runs):
+            runs[index] = (x, y, w, h, to_local[old], to_local[new])
+
+        body = pack_palette(palette) + runs.tobytes()
+        flags = 0
+        if compress:
+            body = zlib.compress(body)
+            flags |= PATCH_FLAG_COMPRESSED
+
+        header = _HEADER.pack(
+            PATCH_MAGIC, PATCH_VERSION, flags, len(palette), len(self.runs)
+        )
+        return header + body
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, registry: Optional[TileTypeRegistry] = None
+    ) -> "LevelPatch":
+        registry = registry if registry is not None else TILE_TYPES
+        if len(data) < _HEADER.size:
+            raise ValueError("Patch data is too short to contain a header.")
+
+        magic, version, flags, palette_count, run_count = _HEADER.unpack_from(data, 0)
+        if magic != PATCH_MAGIC:
+            raise ValueError("Patch data does not start with the patch magic.")
+        if version > PATCH_VERSION:
+            raise ValueError(f"Unsupported patch version: {version}")
+
+        body = data[_HEADER.size :]
+        if flags & PATCH_FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+
+        to_registry, offset = unpack_palette(body, 0, palette_count, registry)
+
+        if len(body) - offset != run_count * _RUN_DTYPE.itemsize:
+            raise ValueError("Patch data is truncated.")
+        runs = np.frombuffer(body, dtype=_RUN_DTYPE, count=run_count, offset=offset)
+        if run_count and (
+            int(runs["old"].max()) > palette_count
+            or int(runs["new"].max()) > palette_count
+        ):
+            raise ValueError("Patch run references a missing palette entry.")
+
+        # Checked before anything is expanded into per-cell arrays
+        if run_count and not (runs["width"].all() and runs["height"].all()):
+            raise ValueError("Patch run has no cells.")
+        cell_count = (runs["width"].astype(np.float64) * runs["height"]).sum()
+        if cell_count > PATCH_MAX_CELLS:
+            raise ValueError(
+                f"Patch covers {int(cell_count)} cells, more than the "
+                f"{PATCH_MAX_CELLS} allowed."
+            )
+
+        return cls(
+            [
+                (x, y, w, h, to_registry[old], to_registry[new])
+                for x, y, w, h, old, new in runs.tolist()
+            ],
+            registry,
+        )
+
+
+class PatchRecorder:
+    def __init__(self, level: Level):
+        self.level = level
+
+        # Position -> [type before recording, latest type]
+        self._changes: dict[tuple[int, int], list[int]] = {}
+
+        level.add_listener(self._on_edit)
+
+    def _on_edit(self, position: tuple[int, int], old_type_id: int, new_type_id: int):
+        change = self._changes.get(position)
+        if change is None:
+            self._changes[position] = [old_type_id, new_type_id]
+        else:
+            change[1] = new_type_id
+
+    def has_changes(self) -> bool:
+        return any(old != new for old, new in self._changes.values())
+
+    def take(self) -> LevelPatch:
+        # Returns everything recorded since the last take, e.g. one undo step
+        patch = LevelPatch.from_changes(
+            ((x, y, old, new) for (x, y), (old, new) in self._changes.items()),
+            self.level.registry,
+        )
+        self._changes = {}
+        return patch
+
+    def close(self):
+        self.level.remove_listener(self._on_edit)
+
+    def __enter__(self) -> "PatchRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,163 @@
+import bisect
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+
+from common.level.collision_rects import Rect, merge_cells
+from common.level.tile_type import (
+    TileType,
+    FLAG_FINISH,
+    FLAG_CHECKPOINT,
+    FLAG_SPAWN,
+    FLAG_ENTITY,
+)
+
+# Tile flags tracked by the special tile index
+SPECIAL_FLAGS = FLAG_FINISH | FLAG_CHECKPOINT | FLAG_SPAWN | FLAG_ENTITY
+
+Position = tuple[int, int]
+
+
+class SpecialTileIndex:
+    def __init__(self):
+        # Spawns and checkpoints are kept sorted by (x, y)
+        self.spawns: list[Position] = []
+        self.checkpoints: list[Position] = []
+        self._checkpoint_set: set[Position] = set()
+
+        self.finishes: set[Position] = set()
+        self._finish_regions: Optional[list[Rect]] = None
+
+        # Entity name -> sorted spawn positions, plus the reverse lookup
+        self.entity_spawns: dict[str, list[Position]] = {}
+        self._entity_at: dict[Position, str] = {}
+
+    @classmethod
+    def from_tiles(
+        cls, tiles: Iterable[tuple[Position, TileType]]
+    ) -> "SpecialTileIndex":
+        index = cls()
+        for position, tile_type in tiles:
+            index.add(position, tile_type)
+        return index
+
+    def add(self, position: Position, tile_type: TileType):
+        flags = tile_type.flags
+        if not flags & SPECIAL_FLAGS:
+            return
+
+        if flags & FLAG_SPAWN:
+            self._insert_sorted(self.spawns, position)
+        if flags & FLAG_CHECKPOINT and position not in self._checkpoint_set:
+            self._checkpoint_set.add(position)
+            bisect.insort(self.checkpoints, position)
+        if flags & FLAG_FINISH and position not in self.finishes:
+            self.finishes.add(position)
+            self._finish_regions = None
+        if flags & FLAG_ENTITY and tile_type.spawn_entity is not None:
+            self._entity_at[position] = tile_type.spawn_entity
+            self._insert_sorted(
+                self.entity_spawns.setdefault(tile_type.spawn_entity, []), position
+            )
+
+    def remove(self, position: Position, tile_type: TileType):
+        flags = tile_type.flags
+        if not flags & SPECIAL_FLAGS:
+            return
+
+        if flags & FLAG_SPAWN:
+            self._remove_sorted(self.spawns, position)
+        if flags & FLAG_CHECKPOINT and position in self._checkpoint_set:
+            self._checkpoint_set.discard(position)
+            self._remove_sorted(self.checkpoints, position)
+        if flags & FLAG_FINISH and position in self.finishes:
+            self.finishes.discard(position)
+            self._finish_regions = None
+        if flags & FLAG_ENTITY:
+            entity = self._entity_at.pop(position, None)
+            if entity is not None:
+                spawns = self.entity_spawns.get(entity, [])
+                self._remove_sorted(spawns, position)
+                if not spawns:
+                    del self.entity_spawns[entity]
+
+    def _insert_sorted(self, positions: list[Position], position: Position):
+        index = bisect.bisect_left(positions, position)
+        if index == len(positions) or positions[index] != position:
+            positions.insert(index, position)
+
+    def _remove_sorted(self, positions: list[Position], position: Position):
+        index = bisect.bisect_left(positions, position)
+        if index < len(positions) and positions[index] == position:
+            del positions[index]
+
+    def get_spawn(self) -> Optional[Position]:
+        # The left-most spawn is the level's main spawn point
+        return self.spawns[0] if self.spawns else None
+
+    def is_checkpoint(self, position: Position) -> bool:
+        return position in self._checkpoint_set
+
+    def is_finish(self, position: Position) -> bool:
+        return position in self.finishes
+
+    def get_entity_at(self, position: Position) -> Optional[str]:
+        return self._entity_at.get(position)
+
+    def get_entity_spawns(self, entity: str) -> list[Position]:
+        return self.entity_spawns.get(entity, [])
+
+    def get_checkpoint_before(self, x: float) -> Optional[Position]:
+        # Right-most checkpoint at or behind x, i.e. the one a player passed last
+        index = bisect.bisect_right(self.checkpoints, (math.floor(x), math.inf))
+        return self.checkpoints[index - 1] if index > 0 else None
+
+    def get_nearest_checkpoint(
+        self, position: tuple[float, float]
+    ) -> Optional[Position]:
+        if not self.checkpoints:
+            return None
+
+        # Walk outwards from the x position; stop once the horizontal distance
+        # alone is larger than the best distance found so far
+        x, y = position
+        start = bisect.bisect_left(self.checkpoints, (math.floor(x), -math.inf))
+        best = None
+        best_distance = math.inf
+
+        left = start - 1
+        right = start
+        while left >= 0 or right < len(self.checkpoints):
+            left_dx = x - self.checkpoints[left][0] if left >= 0 else math.inf
+            right_dx = (
+                self.checkpoints[right][0] - x
+                if right < len(self.checkpoints)
+                else math.inf
+            )
+            if min(abs(left_dx), abs(right_dx)) ** 2 > best_distance:
+                break
+
+            if abs(left_dx) <= abs(right_dx):
+                candidate = self.checkpoints[left]
+                left -= 1
+            else:
+                candidate = self.checkpoints[right]
+                right += 1
+
+            distance = (candidate[0] - x) ** 2 + (candidate[1] - y) ** 2
+            if distance < best_distance:
+                best = candidate
+                best_distance = distance
+
+        return best
+
+    def get_finish_regions(self) -> list[Rect]:
+        # Adjacent finish tiles merged into (x, y, width, height) rects
+        if self._finish_regions is None:
+            if not self.finishes:
+                self._finish_regions = []
+            else:
+                cells = np.array(list(self.finishes), dtype=np.int64)
+                self._finish_regions = merge_cells(cells[:, 0], cells[:, 1])
+        return self._finish_regions
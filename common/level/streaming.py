@@ -0,0 +1,267 @@
+import math
+import queue
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from common.level.chunk import Chunk, EMPTY_TILE
+from common.level.level_file import LevelReader
+from common.level.tile import Tile
+
+
+class StreamingStats:
+    def __init__(self):
+        self.hits = 0  # chunk requests served from memory
+        self.misses = 0  # chunk requests that had to load synchronously
+        self.evictions = 0  # chunks dropped by the LRU policy
+        self.prefetched = 0  # chunks paged in ahead of use around the focus
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefetched = 0
+
+    def get_hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "prefetched": self.prefetched,
+        }
+
+
+class StreamingLevel:
+    def __init__(
+        self,
+        reader: LevelReader,
+        radius: int = 2,
+        max_resident_chunks: Optional[int] = None,
+        background: bool = True,
+    ):
+        self.reader = reader
+        self.registry = reader.registry
+        self.chunk_size = reader.chunk_size
+        self.width = reader.width
+        self.height = reader.height
+
+        # Radius is measured in chunks around the focus chunk
+        self.radius = radius
+        window = 2 * radius + 1
+        self.max_resident_chunks = (
+            max_resident_chunks if max_resident_chunks is not None else window * window
+        )
+
+        self.stats = StreamingStats()
+        self.focus_chunk: Optional[tuple[int, int]] = None
+
+        # Resident chunks in least-recently-used order (oldest first)
+        self._resident: OrderedDict[tuple[int, int], Chunk] = OrderedDict()
+        self._pending: set[tuple[int, int]] = set()
+        self._lock = threading.Condition()
+
+        # Background loader
+        self._queue: queue.Queue[Optional[tuple[int, int]]] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(target=self._load_worker, daemon=True)
+            self._thread.start()
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def __enter__(self) -> "StreamingLevel":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _load_worker(self):
+        while True:
+            chunk_key = self._queue.get()
+            if chunk_key is None:
+                break
+
+            # A chunk that fails to load (corrupt data, closed file) is left
+            # out and requested again the next time it is needed, without
+            # taking the loader down with it
+            chunk = None
+            try:
+                chunk = self.reader.read_chunk(*chunk_key)
+            except Exception as e:
+                print(f"Failed to load chunk {chunk_key}: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(chunk_key)
+                    if chunk is not None and chunk_key not in self._resident:
+                        self._resident[chunk_key] = chunk
+                        self.stats.prefetched += 1
+                        self._evict_far_chunks()
+                    self._lock.notify_all()
+
+    def _is_in_radius(self, chunk_key: tuple[int, int]) -> bool:
+        if self.focus_chunk is None:
+            return False
+        return (
+            abs(chunk_key[0] - self.focus_chunk[0]) <= self.radius
+            and abs(chunk_key[1] - self.focus_chunk[1]) <= self.radius
+        )
+
+    def _evict_far_chunks(self):
+        # Called with the lock held. Drops the least recently used chunks that
+        # are outside the focus radius until the level fits its budget again.
+        if len(self._resident) <= self.max_resident_chunks:
+            return
+
+        for chunk_key in list(self._resident.keys()):
+            if len(self._resident) <= self.max_resident_chunks:
+                break
+            if not self._is_in_radius(chunk_key):
+                del self._resident[chunk_key]
+                self.stats.evictions += 1
+
+    def set_focus(self, position: tuple[float, float]):
+        focus_chunk = (
+            math.floor(position[0]) // self.chunk_size,
+            math.floor(position[1]) // self.chunk_size,
+        )
+        if focus_chunk == self.focus_chunk:
+            return
+
+        to_load = []
+        with self._lock:
+            self.focus_chunk = focus_chunk
+            for chunk_y in range(
+                focus_chunk[1] - self.radius, focus_chunk[1] + self.radius + 1
+            ):
+                for chunk_x in range(
+                    focus_chunk[0] - self.radius, focus_chunk[0] + self.radius + 1
+                ):
+                    chunk_key = (chunk_x, chunk_y)
+                    if (
+                        chunk_key in self._resident
+                        or chunk_key in self._pending
+                        or not self.reader.has_chunk(chunk_x, chunk_y)
+                    ):
+                        continue
+                    self._pending.add(chunk_key)
+                    to_load.append(chunk_key)
+
+            self._evict_far_chunks()
+
+        if self._thread is None:
+            # Without a background thread, page chunks in right away
+            for chunk_key in to_load:
+                try:
+                    self._load_now(chunk_key, prefetch=True)
+                except Exception as e:
+                    print(f"Failed to load chunk {chunk_key}: {e}")
+        else:
+            for chunk_key in to_load:
+                self._queue.put(chunk_key)
+
+    def _load_now(self, chunk_key: tuple[int, int], prefetch: bool) -> Optional[Chunk]:
+        try:
+            chunk = self.reader.read_chunk(*chunk_key)
+        finally:
+            with self._lock:
+                self._pending.discard(chunk_key)
+                self._lock.notify_all()
+
+        with self._lock:
+            if chunk is None:
+                return None
+
+            # The background thread may have won the race
+            resident = self._resident.get(chunk_key)
+            if resident is not None:
+                return resident
+
+            self._resident[chunk_key] = chunk
+            if prefetch:
+                self.stats.prefetched += 1
+            self._evict_far_chunks()
+        return chunk
+
+    def wait_for_pending(self, timeout: float = 5.0) -> bool:
+        # Blocks until the background loader has drained its queue
+        with self._lock:
+            return self._lock.wait_for(lambda: not self._pending, timeout)
+
+    def get_chunk(self, chunk_x: int, chunk_y: int) -> Optional[Chunk]:
+        chunk_key = (chunk_x, chunk_y)
+        with self._lock:
+            chunk = self._resident.get(chunk_key)
+            if chunk is not None:
+                self._resident.move_to_end(chunk_key)
+                self.stats.hits += 1
+                return chunk
+
+        # Empty space is not a miss, there is nothing to load
+        if not self.reader.has_chunk(chunk_x, chunk_y):
+            return None
+
+        with self._lock:
+            self.stats.misses += 1
+        return self._load_now(chunk_key, prefetch=False)
+
+    def get_resident_chunk_keys(self) -> list[tuple[int, int]]:
+        with self._lock:
+            return list(self._resident.keys())
+
+    def get_type_id_at(self, position: tuple[int, int]) -> int:
+        x, y = position
+        chunk = self.get_chunk(x // self.chunk_size, y // self.chunk_size)
+        if chunk is None:
+            return EMPTY_TILE
+        origin_x, origin_y = chunk.get_origin()
+        return chunk.get(x - origin_x, y - origin_y)
+
+    def get_tile_at(self, position: tuple[int, int]) -> Optional[Tile]:
+        type_id = self.get_type_id_at(position)
+        if type_id == EMPTY_TILE:
+            return None
+        return Tile.from_type(
+            self.registry.types[type_id], (position[0], position[1])  # type: ignore
+        )
+
+    def get_tiles_in_rect(self, x0: int, y0: int, x1: int, y1: int) -> list[Tile]:
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+
+        size = self.chunk_size
+        tiles = []
+        for chunk_y in range(y0 // size, y1 // size + 1):
+            for chunk_x in range(x0 // size, x1 // size + 1):
+                chunk = self.get_chunk(chunk_x, chunk_y)
+                if chunk is None:
+                    continue
+
+                origin_x, origin_y = chunk.get_origin()
+                left = max(x0 - origin_x, 0)
+                top = max(y0 - origin_y, 0)
+                right = min(x1 - origin_x, size - 1) + 1
+                bottom = min(y1 - origin_y, size - 1) + 1
+
+                region = chunk.tiles[top:bottom, left:right]
+                local_ys, local_xs = np.nonzero(region)
+                for local_x, local_y in zip(local_xs.tolist(), local_ys.tolist()):
+                    tiles.append(
+                        Tile.from_type(
+                            self.registry.types[int(region[local_y, local_x])],  # type: ignore
+                            (origin_x + left + local_x, origin_y + top + local_y),
+                        )
+                    )
+
+        return tiles
@@ -1,7 +1,12 @@
 from typing import Optional
 
+from common.level.tile_type import TileType, TILE_TYPES
+
 
 class Tile:
+    # A tile is only a reference to its shared type plus a position
+    __slots__ = ("type", "position")
+
     def __init__(
         self,
         id: str,
@@ -14,12 +19,65 @@ class Tile:
         is_spawn: bool = False,
         spawn_entity: Optional[str] = None,
     ):
-        self.id = id
+        self.type = TILE_TYPES.intern(
+            id,
+            is_solid=is_solid,
+            is_kill=is_kill,
+            boost=boost,
+            is_finish=is_finish,
+            is_checkpoint=is_checkpoint,
+            is_spawn=is_spawn,
+            spawn_entity=spawn_entity,
+        )
         self.position = position
-        self.is_solid = is_solid
-        self.is_kill = is_kill
-        self.boost = boost
-        self.is_finish = is_finish
-        self.is_checkpoint = is_checkpoint
-        self.is_spawn = is_spawn
-        self.spawn_entity = spawn_entity
+
+    @classmethod
+    def from_type(cls, tile_type: TileType, position: tuple[int, int]) -> "Tile":
+        # Skips interning for callers that already hold a TileType
+        tile = cls.__new__(cls)
+        tile.type = tile_type
+        tile.position = position
+        return tile
+
+    @property
+    def id(self) -> str:
+        return self.type.id
+
+    @property
+    def type_id(self) -> int:
+        return self.type.type_id
+
+    @property
+    def flags(self) -> int:
+        return self.type.flags
+
+    @property
+    def is_solid(self) -> bool:
+        return self.type.is_solid
+
+    @property
+    def is_kill(self) -> bool:
+        return self.type.is_kill
+
+    @property
+    def boost(self) -> float:
+        return self.type.boost
+
+    @property
+    def is_finish(self) -> bool:
+        return self.type.is_finish
+
+    @property
+    def is_checkpoint(self) -> bool:
+        return self.type.is_checkpoint
+
+    @property
+    def is_spawn(self) -> bool:
+        return self.type.is_spawn
+
+    @property
+    def spawn_entity(self) -> Optional[str]:
+        return self.type.spawn_entity
+
+    def has_flag(self, flag: int) -> bool:
+        return (self.type.flags & flag) != 0
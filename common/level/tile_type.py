@@ -0,0 +1,201 @@
+import json
+import os
+from typing import Any, Optional
+
+import numpy as np
+
+
+# Bit flags describing tile behaviour, packed into TileType.flags
+FLAG_SOLID = 1 << 0
+FLAG_KILL = 1 << 1
+FLAG_BOOST = 1 << 2
+FLAG_FINISH = 1 << 3
+FLAG_CHECKPOINT = 1 << 4
+FLAG_SPAWN = 1 << 5
+FLAG_ENTITY = 1 << 6
+
+# Tile attributes that make up a tile type (everything except the position)
+TileTypeKey = tuple[str, bool, bool, float, bool, bool, bool, Optional[str]]
+
+
+class TileType:
+    __slots__ = (
+        "type_id",
+        "id",
+        "is_solid",
+        "is_kill",
+        "boost",
+        "is_finish",
+        "is_checkpoint",
+        "is_spawn",
+        "spawn_entity",
+        "flags",
+    )
+
+    def __init__(
+        self,
+        type_id: int,
+        id: str,
+        is_solid: bool = True,
+        is_kill: bool = False,
+        boost: float = 0,
+        is_finish: bool = False,
+        is_checkpoint: bool = False,
+        is_spawn: bool = False,
+        spawn_entity: Optional[str] = None,
+    ):
+        self.type_id = type_id
+        self.id = id
+        self.is_solid = is_solid
+        self.is_kill = is_kill
+        self.boost = boost
+        self.is_finish = is_finish
+        self.is_checkpoint = is_checkpoint
+        self.is_spawn = is_spawn
+        self.spawn_entity = spawn_entity
+
+        # Precompute the bitmask so gameplay checks are a single AND
+        flags = 0
+        if is_solid:
+            flags |= FLAG_SOLID
+        if is_kill:
+            flags |= FLAG_KILL
+        if boost:
+            flags |= FLAG_BOOST
+        if is_finish:
+            flags |= FLAG_FINISH
+        if is_checkpoint:
+            flags |= FLAG_CHECKPOINT
+        if is_spawn:
+            flags |= FLAG_SPAWN
+        if spawn_entity is not None:
+            flags |= FLAG_ENTITY
+        self.flags = flags
+
+    def get_key(self) -> TileTypeKey:
+        return (
+            self.id,
+            self.is_solid,
+            self.is_kill,
+            self.boost,
+            self.is_finish,
+            self.is_checkpoint,
+            self.is_spawn,
+            self.spawn_entity,
+        )
+
+    def has_flag(self, flag: int) -> bool:
+        return (self.flags & flag) != 0
+
+
+class TileTypeRegistry:
+    def __init__(self):
+        # Type id 0 is reserved for the empty tile
+        self.types: list[Optional[TileType]] = [None]
+        self._types_by_key: dict[TileTypeKey, TileType] = {}
+
+        # The first type registered under a name (usually from tileset.json)
+        self._types_by_name: dict[str, TileType] = {}
+
+        # Lookup tables indexed by type id, rebuilt lazily after new types appear
+        self._flags_table: Optional[np.ndarray] = None
+        self._boost_table: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.types) - 1
+
+    def intern(
+        self,
+        id: str,
+        is_solid: bool = True,
+        is_kill: bool = False,
+        boost: float = 0,
+        is_finish: bool = False,
+        is_checkpoint: bool = False,
+        is_spawn: bool = False,
+        spawn_entity: Optional[str] = None,
+    ) -> TileType:
+        key: TileTypeKey = (
+            id,
+            bool(is_solid),
+            bool(is_kill),
+            float(boost),
+            bool(is_finish),
+            bool(is_checkpoint),
+            bool(is_spawn),
+            spawn_entity,
+        )
+        tile_type = self._types_by_key.get(key)
+        if tile_type is not None:
+            return tile_type
+
+        type_id = len(self.types)
+        if type_id > np.iinfo(np.uint16).max:
+            raise ValueError("Too many distinct tile types registered.")
+
+        tile_type = TileType(type_id, *key)
+        self.types.append(tile_type)
+        self._types_by_key[key] = tile_type
+        self._types_by_name.setdefault(id, tile_type)
+
+        self._flags_table = None
+        self._boost_table = None
+
+        return tile_type
+
+    def intern_type(self, tile_type: TileType) -> TileType:
+        # Map a type from any registry onto the equivalent type in this one
+        if self.get(tile_type.type_id) is tile_type:
+            return tile_type
+        return self.intern(*tile_type.get_key())
+
+    def get(self, type_id: int) -> Optional[TileType]:
+        if 0 <= type_id < len(self.types):
+            return self.types[type_id]
+        return None
+
+    def get_by_name(self, id: str) -> Optional[TileType]:
+        return self._types_by_name.get(id)
+
+    def get_flags_table(self) -> np.ndarray:
+        if self._flags_table is None:
+            self._flags_table = np.array(
+                [t.flags if t is not None else 0 for t in self.types], dtype=np.uint8
+            )
+        return self._flags_table
+
+    def get_boost_table(self) -> np.ndarray:
+        if self._boost_table is None:
+            self._boost_table = np.array(
+                [t.boost if t is not None else 0.0 for t in self.types],
+                dtype=np.float32,
+            )
+        return self._boost_table
+
+    def load_tileset_data(self, tileset_data: dict[str, Any]):
+        tiles = tileset_data.get("tiles")
+        if not isinstance(tiles, dict):
+            raise ValueError("tileset.json must contain a 'tiles' object.")
+
+        for tile_id, properties in tiles.items():
+            self.intern(
+                tile_id,
+                is_solid=properties.get("solid", True),
+                is_kill=properties.get("kill", False),
+                boost=properties.get("boost", 0),
+                is_finish=properties.get("finish", False),
+                is_checkpoint=properties.get("checkpoint", False),
+                is_spawn=properties.get("spawn", False),
+                spawn_entity=properties.get("entity"),
+            )
+
+    def load_tileset_file(self, tileset_json_path: str):
+        if not os.path.isfile(tileset_json_path):
+            raise FileNotFoundError(f"tileset.json not found: {tileset_json_path}")
+
+        with open(tileset_json_path, "r", encoding="utf-8") as f:
+            self.load_tileset_data(json.load(f))
+
+
+# Shared registry used by Tile objects that are built from plain attributes
+TILE_TYPES = TileTypeRegistry()
@@ -0,0 +1,18 @@
+# Simulation timing
+TICK_RATE = 120  # simulation ticks per second
+TICK_DURATION = 1.0 / TICK_RATE
+
+# Player config (all distances are in tiles)
+PLAYER_WIDTH = 0.8
+PLAYER_HEIGHT = 0.8
+PLAYER_RUN_SPEED = 8.0  # tiles per second
+PLAYER_ACCELERATION = 60.0  # tiles per second squared
+PLAYER_JUMP_SPEED = 14.0
+GRAVITY = 40.0
+MAX_FALL_SPEED = 30.0
+
+# Boost tiles launch the player upwards by this much per boost level
+BOOST_SPEED_PER_LEVEL = 4.0
+
+# Gap kept between the player and solid geometry after a collision
+COLLISION_EPSILON = 1e-6
@@ -0,0 +1,58 @@
+from common.simulation.constants import PLAYER_WIDTH, PLAYER_HEIGHT
+
+
+class PlayerInput:
+    def __init__(self, left: bool = False, right: bool = False, jump: bool = False):
+        self.left = left
+        self.right = right
+        self.jump = jump
+
+    def get_direction(self) -> int:
+        return int(self.right) - int(self.left)
+
+
+class Player:
+    def __init__(
+        self,
+        id: str,
+        position: tuple[float, float],
+        width: float = PLAYER_WIDTH,
+        height: float = PLAYER_HEIGHT,
+    ):
+        self.id = id
+
+        # Position is the top-left corner of the player's box, in tiles
+        self.x, self.y = float(position[0]), float(position[1])
+        self.width = width
+        self.height = height
+        self.velocity_x = 0.0
+        self.velocity_y = 0.0
+
+        # Position at the start of the last tick, used for render interpolation
+        self.previous_x = self.x
+        self.previous_y = self.y
+
+        self.input = PlayerInput()
+        self.on_ground = False
+        self.respawn_position = (self.x, self.y)
+        self.deaths = 0
+        self.finished = False
+        self.finish_tick = None
+
+    def get_position(self) -> tuple[float, float]:
+        return (self.x, self.y)
+
+    def get_interpolated_position(self, alpha: float) -> tuple[float, float]:
+        # alpha is how far the renderer is between the previous and current tick
+        return (
+            self.previous_x + (self.x - self.previous_x) * alpha,
+            self.previous_y + (self.y - self.previous_y) * alpha,
+        )
+
+    def teleport(self, position: tuple[float, float]):
+        # Moves without interpolating across the jump (respawns, level start)
+        self.x, self.y = float(position[0]), float(position[1])
+        self.previous_x, self.previous_y = self.x, self.y
+        self.velocity_x = 0.0
+        self.velocity_y = 0.0
+        self.on_ground = False
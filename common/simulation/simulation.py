@@ -0,0 +1,200 @@
+from typing import Optional
+
+import numpy as np
+
+from common.level.level import Level
+from common.level.tile_type import FLAG_KILL, FLAG_FINISH, FLAG_CHECKPOINT
+from common.simulation.constants import (
+    TICK_RATE,
+    PLAYER_RUN_SPEED,
+    PLAYER_ACCELERATION,
+    PLAYER_JUMP_SPEED,
+    GRAVITY,
+    MAX_FALL_SPEED,
+    BOOST_SPEED_PER_LEVEL,
+    COLLISION_EPSILON,
+)
+from common.simulation.player import Player, PlayerInput
+
+
+class Simulation:
+    def __init__(self, level: Level, tick_rate: int = TICK_RATE):
+        self.level = level
+        self.tick_rate = tick_rate
+        self.tick_duration = 1.0 / tick_rate
+        self.tick_count = 0
+
+        self.players: dict[str, Player] = {}
+
+    def get_spawn_position(self, width: float, height: float) -> tuple[float, float]:
+        spawn = self.level.special_tiles.get_spawn()
+        if spawn is None:
+            return (0.0, 0.0)
+        return self._stand_on_tile(spawn, width, height)
+
+    def _stand_on_tile(
+        self, tile_position: tuple[int, int], width: float, height: float
+    ) -> tuple[float, float]:
+        # Centers a box horizontally in a tile, resting on the tile's bottom edge
+        return (
+            tile_position[0] + (1.0 - width) / 2,
+            tile_position[1] + 1.0 - height,
+        )
+
+    def add_player(
+        self, player_id: str, position: Optional[tuple[float, float]] = None
+    ) -> Player:
+        player = Player(player_id, (0.0, 0.0))
+        if position is None:
+            position = self.get_spawn_position(player.width, player.height)
+        player.teleport(position)
+        player.respawn_position = position
+        self.players[player_id] = player
+        return player
+
+    def remove_player(self, player_id: str):
+        self.players.pop(player_id, None)
+
+    def set_input(self, player_id: str, player_input: PlayerInput):
+        player = self.players.get(player_id)
+        if player is not None:
+            player.input = player_input
+
+    def step(self):
+        # Players are always updated in the same order so runs are reproducible
+        for player_id in sorted(self.players):
+            self._step_player(self.players[player_id])
+        self.tick_count += 1
+
+    def _step_player(self, player: Player):
+        dt = self.tick_duration
+        player.previous_x = player.x
+        player.previous_y = player.y
+
+        if player.finished:
+            return
+
+        # Horizontal movement accelerates towards the target run speed
+        target_speed = player.input.get_direction() * PLAYER_RUN_SPEED
+        max_change = PLAYER_ACCELERATION * dt
+        speed_change = target_speed - player.velocity_x
+        player.velocity_x += max(-max_change, min(max_change, speed_change))
+
+        if player.input.jump and player.on_ground:
+            player.velocity_y = -PLAYER_JUMP_SPEED
+
+        player.velocity_y = min(player.velocity_y + GRAVITY * dt, MAX_FALL_SPEED)
+
+        # Resolve each axis separately so the player slides along walls and floors
+        self._move_x(player, player.velocity_x * dt)
+        self._move_y(player, player.velocity_y * dt)
+
+        self._apply_tile_triggers(player)
+
+    def _move_x(self, player: Player, dx: float):
+        if dx == 0:
+            return
+
+        # Only the rects overlapping the swept box can stop the player
+        left = min(player.x, player.x + dx)
+        rects = self.level.solid_rects.get_rects_in_box(
+            left, player.y, player.width + abs(dx), player.height
+        )
+
+        hit = False
+        right_edge = player.x + player.width
+        for rect_x, _, rect_w, _ in rects:
+            if dx > 0 and rect_x >= right_edge - COLLISION_EPSILON:
+                if rect_x - right_edge < dx:
+                    dx = rect_x - right_edge
+                    hit = True
+            elif dx < 0 and rect_x + rect_w <= player.x + COLLISION_EPSILON:
+                if rect_x + rect_w - player.x > dx:
+                    dx = rect_x + rect_w - player.x
+                    hit = True
+
+        player.x += dx
+        if hit:
+            player.velocity_x = 0.0
+
+    def _move_y(self, player: Player, dy: float):
+        player.on_ground = False
+        if dy == 0:
+            return
+
+        top = min(player.y, player.y + dy)
+        rects = self.level.solid_rects.get_rects_in_box(
+            player.x, top, player.width, player.height + abs(dy)
+        )
+
+        hit = False
+        bottom_edge = player.y + player.height
+        for _, rect_y, _, rect_h in rects:
+            if dy > 0 and rect_y >= bottom_edge - COLLISION_EPSILON:
+                if rect_y - bottom_edge < dy:
+                    dy = rect_y - bottom_edge
+                    hit = True
+            elif dy < 0 and rect_y + rect_h <= player.y + COLLISION_EPSILON:
+                if rect_y + rect_h - player.y > dy:
+                    dy = rect_y + rect_h - player.y
+                    hit = True
+
+        player.y += dy
+        if hit:
+            if player.velocity_y > 0:
+                player.on_ground = True
+            player.velocity_y = 0.0
+
+    def _get_overlapped_cells(
+        self, player: Player
+    ) -> Optional[tuple[int, int, int, int]]:
+        # Half-open tile bounds of the player's box, clipped to the level grids
+        collision = self.level.collision
+        x0 = max(int(np.floor(player.x)), 0)
+        y0 = max(int(np.floor(player.y)), 0)
+        x1 = min(int(np.ceil(player.x + player.width)), collision.width)
+        y1 = min(int(np.ceil(player.y + player.height)), collision.height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (x0, y0, x1, y1)
+
+    def _find_tile_in_box(self, player: Player, flag: int) -> Optional[tuple[int, int]]:
+        cells = self._get_overlapped_cells(player)
+        if cells is None:
+            return None
+
+        x0, y0, x1, y1 = cells
+        found = np.argwhere(self.level.collision.get_grid(flag)[y0:y1, x0:x1])
+        if len(found) == 0:
+            return None
+        local_y, local_x = found[0].tolist()
+        return (x0 + local_x, y0 + local_y)
+
+    def _apply_tile_triggers(self, player: Player):
+        collision = self.level.collision
+        box = (player.x, player.y, player.width, player.height)
+
+        # Falling out of the level counts as a death
+        if collision.any_in_box(FLAG_KILL, *box) or player.y > self.level.height + 1:
+            player.deaths += 1
+            player.teleport(player.respawn_position)
+            return
+
+        checkpoint = self._find_tile_in_box(player, FLAG_CHECKPOINT)
+        if checkpoint is not None:
+            player.respawn_position = self._stand_on_tile(
+                checkpoint, player.width, player.height
+            )
+
+        if collision.any_in_box(FLAG_FINISH, *box):
+            player.finished = True
+            player.finish_tick = self.tick_count
+            return
+
+        cells = self._get_overlapped_cells(player)
+        if cells is not None:
+            x0, y0, x1, y1 = cells
+            boost = float(collision.boost[y0:y1, x0:x1].max())
+            if boost > 0:
+                player.velocity_y = -boost * BOOST_SPEED_PER_LEVEL
+                player.on_ground = False